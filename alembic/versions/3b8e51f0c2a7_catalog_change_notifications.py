@@ -0,0 +1,76 @@
+"""catalog change notifications
+
+Revision ID: 3b8e51f0c2a7
+Revises: 601c81d00882
+Create Date: 2025-11-12 10:14:03.512980
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8e51f0c2a7"
+down_revision: Union[str, Sequence[str], None] = "601c81d00882"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        sa.text(
+            """
+            CREATE FUNCTION notify_catalog_change() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            DECLARE
+                new_version bigint;
+            BEGIN
+                INSERT INTO catalog_versions (name, version, updated_at)
+                VALUES (TG_TABLE_NAME, 1, now())
+                ON CONFLICT (name) DO UPDATE
+                    SET version = catalog_versions.version + 1,
+                        updated_at = now()
+                RETURNING version INTO new_version;
+                PERFORM pg_notify('catalog_changes', TG_TABLE_NAME || ':' || new_version);
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            "INSERT INTO catalog_versions (name, version) VALUES ('activities', 1)"
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            CREATE TRIGGER activities_catalog_change
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON activities
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change()
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DROP TRIGGER IF EXISTS activities_catalog_change ON activities"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS notify_catalog_change()"))
+    op.drop_table("catalog_versions")
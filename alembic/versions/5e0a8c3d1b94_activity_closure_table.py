@@ -0,0 +1,144 @@
+"""activity closure table
+
+Revision ID: 5e0a8c3d1b94
+Revises: c41f7b9a2d58
+Create Date: 2025-11-19 09:27:55.381442
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0a8c3d1b94"
+down_revision: Union[str, Sequence[str], None] = "c41f7b9a2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "activity_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["activities.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["activities.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_activity_closure_descendant_id",
+        "activity_closure",
+        ["descendant_id"],
+        unique=False,
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+            WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM activities
+                UNION ALL
+                SELECT paths.ancestor_id, activities.id, paths.depth + 1
+                FROM paths
+                JOIN activities ON activities.parent_id = paths.descendant_id
+            )
+            SELECT ancestor_id, descendant_id, depth FROM paths
+            """
+        )
+    )
+    # Statement level, so parents and children inserted together are linked
+    # regardless of row order. Paths are built inside the inserted forest
+    # first, then every forest root is attached to its existing ancestors.
+    op.execute(
+        sa.text(
+            """
+            CREATE FUNCTION activity_closure_insert() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+                WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+                    SELECT id, id, 0 FROM inserted
+                    UNION ALL
+                    SELECT paths.ancestor_id, inserted.id, paths.depth + 1
+                    FROM paths
+                    JOIN inserted ON inserted.parent_id = paths.descendant_id
+                )
+                SELECT ancestor_id, descendant_id, depth FROM paths
+                UNION ALL
+                SELECT above.ancestor_id, paths.descendant_id, above.depth + paths.depth + 1
+                FROM paths
+                JOIN inserted AS root ON root.id = paths.ancestor_id
+                JOIN activity_closure AS above ON above.descendant_id = root.parent_id
+                WHERE root.parent_id NOT IN (SELECT id FROM inserted);
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            CREATE TRIGGER activities_closure_insert
+            AFTER INSERT ON activities
+            REFERENCING NEW TABLE AS inserted
+            FOR EACH STATEMENT EXECUTE FUNCTION activity_closure_insert()
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            CREATE FUNCTION activity_closure_move() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM activity_closure
+                    WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+                ) THEN
+                    RAISE EXCEPTION 'Activity % cannot be moved under its descendant %',
+                        NEW.id, NEW.parent_id;
+                END IF;
+                DELETE FROM activity_closure AS link
+                USING activity_closure AS subtree
+                WHERE subtree.ancestor_id = NEW.id
+                  AND link.descendant_id = subtree.descendant_id
+                  AND link.ancestor_id NOT IN (
+                      SELECT descendant_id FROM activity_closure WHERE ancestor_id = NEW.id
+                  );
+                INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+                SELECT above.ancestor_id, subtree.descendant_id, above.depth + subtree.depth + 1
+                FROM activity_closure AS above
+                JOIN activity_closure AS subtree ON subtree.ancestor_id = NEW.id
+                WHERE above.descendant_id = NEW.parent_id;
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            CREATE TRIGGER activities_closure_move
+            AFTER UPDATE OF parent_id ON activities
+            FOR EACH ROW
+            WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+            EXECUTE FUNCTION activity_closure_move()
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DROP TRIGGER IF EXISTS activities_closure_move ON activities"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS activities_closure_insert ON activities"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS activity_closure_move()"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS activity_closure_insert()"))
+    op.drop_index("ix_activity_closure_descendant_id", table_name="activity_closure")
+    op.drop_table("activity_closure")
@@ -0,0 +1,43 @@
+"""foreign key indexes
+
+Revision ID: 7a6f2e91c0d3
+Revises: 5e0a8c3d1b94
+Create Date: 2025-11-20 14:41:12.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a6f2e91c0d3"
+down_revision: Union[str, Sequence[str], None] = "5e0a8c3d1b94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # organization_phones.organization_id is already the leading column of
+    # uq_organization_phone_number, and organization_activities.organization_id
+    # of its primary key, so neither needs a separate index.
+    op.create_index(op.f("ix_activities_parent_id"), "activities", ["parent_id"], unique=False)
+    op.create_index(
+        op.f("ix_organizations_building_id"), "organizations", ["building_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_organization_activities_activity_id"),
+        "organization_activities",
+        ["activity_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_organization_activities_activity_id"), table_name="organization_activities"
+    )
+    op.drop_index(op.f("ix_organizations_building_id"), table_name="organizations")
+    op.drop_index(op.f("ix_activities_parent_id"), table_name="activities")
@@ -0,0 +1,36 @@
+"""buildings location index
+
+Revision ID: 9d2c4a7e6f13
+Revises: 3b8e51f0c2a7
+Create Date: 2025-11-14 16:02:47.118305
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2c4a7e6f13"
+down_revision: Union[str, Sequence[str], None] = "3b8e51f0c2a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built-in point type: serves box containment and KNN (<->) ordering
+    # without requiring the cube/earthdistance extensions.
+    op.create_index(
+        "ix_buildings_location",
+        "buildings",
+        [sa.text("point(longitude, latitude)")],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_buildings_location", table_name="buildings")
@@ -0,0 +1,85 @@
+"""catalog change triggers
+
+Revision ID: b2d7e4c19a60
+Revises: 7a6f2e91c0d3
+Create Date: 2025-11-21 11:05:47.218334
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d7e4c19a60"
+down_revision: Union[str, Sequence[str], None] = "7a6f2e91c0d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    "buildings",
+    "organizations",
+    "organization_phones",
+    "organization_activities",
+)
+
+
+def _notify_function(payload: str) -> sa.TextClause:
+    return sa.text(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_version bigint;
+            changed_at timestamptz;
+        BEGIN
+            INSERT INTO catalog_versions (name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (name) DO UPDATE
+                SET version = catalog_versions.version + 1,
+                    updated_at = now()
+            RETURNING version, updated_at INTO new_version, changed_at;
+            PERFORM pg_notify('catalog_changes', {payload});
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notifications also carry the change time, so listeners can serve
+    # Last-Modified without reading catalog_versions.
+    op.execute(
+        _notify_function(
+            "TG_TABLE_NAME || ':' || new_version || ':' || extract(epoch FROM changed_at)"
+        )
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            sa.text(
+                "INSERT INTO catalog_versions (name, version) VALUES (:name, 1) "
+                "ON CONFLICT (name) DO NOTHING"
+            ).bindparams(name=table)
+        )
+        op.execute(
+            sa.text(
+                f"""
+                CREATE TRIGGER {table}_catalog_change
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change()
+                """
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TRACKED_TABLES):
+        op.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_catalog_change ON {table}"))
+        op.execute(
+            sa.text("DELETE FROM catalog_versions WHERE name = :name").bindparams(name=table)
+        )
+    op.execute(_notify_function("TG_TABLE_NAME || ':' || new_version"))
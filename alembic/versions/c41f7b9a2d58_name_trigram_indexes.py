@@ -0,0 +1,57 @@
+"""name trigram indexes
+
+Revision ID: c41f7b9a2d58
+Revises: 9d2c4a7e6f13
+Create Date: 2025-11-17 11:48:09.640271
+
+"""
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f7b9a2d58"
+down_revision: Union[str, Sequence[str], None] = "9d2c4a7e6f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    available = op.get_bind().scalar(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if not available:
+        # Search keeps working through sequential scans; rerun the migration
+        # after installing postgresql-contrib to get the indexes.
+        logger.warning("pg_trgm extension is not available, skipping trigram indexes.")
+        return
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    op.create_index(
+        "ix_organizations_name_trgm",
+        "organizations",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_activities_name_trgm",
+        "activities",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension itself is left installed, other objects may depend on it.
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_activities_name_trgm"))
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_organizations_name_trgm"))
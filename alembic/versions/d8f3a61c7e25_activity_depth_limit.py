@@ -0,0 +1,36 @@
+"""activity depth limit
+
+Revision ID: d8f3a61c7e25
+Revises: b2d7e4c19a60
+Create Date: 2026-10-17 10:12:31.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f3a61c7e25"
+down_revision: Union[str, Sequence[str], None] = "b2d7e4c19a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Levels of activities, roots included. Closure depth counts the edges to an
+# ancestor, so it stays below the number of levels. Inserts and moves that
+# would nest deeper fail inside the closure triggers.
+MAX_ACTIVITY_DEPTH = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_check_constraint(
+        "ck_activity_closure_depth",
+        "activity_closure",
+        f"depth < {MAX_ACTIVITY_DEPTH}",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ck_activity_closure_depth", "activity_closure", type_="check")
@@ -0,0 +1,166 @@
+"""Measure per-organization CPU cost of serializing organization responses.
+
+The benchmark builds detached ORM organizations with a building, phones and
+activities and serves them through an in-process FastAPI app, so only
+conversion and serialization are measured. It compares three paths:
+
+* ``response_model``: the route returns schemas and FastAPI validates them
+  against ``response_model`` before serializing, as routes used to;
+* ``serialized``: ORM objects are validated once, converting shared buildings
+  and activities a single time, and dumped to bytes with
+  ``TypeAdapter.dump_json``, as :class:`CachedOrganizationService` does on a
+  cache miss;
+* ``cached``: the stored bytes are sent unchanged, as on a cache hit.
+
+Usage::
+
+    uv run python -m benchmarks.serialization --sizes 1000 5000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any
+
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+
+from org_catalog.api.responses import serialized_json
+from org_catalog.models.activity import Activity
+from org_catalog.models.building import Building
+from org_catalog.models.organization import Organization, OrganizationPhone
+from org_catalog.schemas.common import Page
+from org_catalog.schemas.organization import OrganizationDetailed
+from org_catalog.services.conversion import OrganizationConverter
+
+PAGE = TypeAdapter(Page[OrganizationDetailed])
+
+
+def build_organizations(count: int, phones: int, activities: int) -> list[Organization]:
+    """Return detached organizations with populated relations."""
+
+    buildings = [
+        Building(id=i, name=f"Building {i}", address=f"Street {i}", latitude=55.7, longitude=37.6)
+        for i in range(max(1, count // 10))
+    ]
+    catalog = [Activity(id=i, name=f"Activity {i}", parent_id=None) for i in range(activities * 4)]
+    return [
+        Organization(
+            id=i,
+            name=f"Organization {i}",
+            description=None,
+            building_id=buildings[i % len(buildings)].id,
+            building=buildings[i % len(buildings)],
+            phones=[
+                OrganizationPhone(id=i * phones + n, number=f"+7-900-{i:05d}-{n}", label=None)
+                for n in range(phones)
+            ],
+            activities=[catalog[(i + n) % len(catalog)] for n in range(activities)],
+        )
+        for i in range(count)
+    ]
+
+
+def convert(organizations: list[Organization]) -> Page[OrganizationDetailed]:
+    """Validate ORM organizations into the response envelope, as routes used to."""
+
+    return Page[OrganizationDetailed](
+        items=[OrganizationDetailed.model_validate(org) for org in organizations],
+        next_cursor=None,
+    )
+
+
+def convert_shared(organizations: list[Organization]) -> Page[OrganizationDetailed]:
+    """Validate ORM organizations, converting shared relations once."""
+
+    converter = OrganizationConverter()
+    return Page[OrganizationDetailed](
+        items=[converter.detailed(org) for org in organizations],
+        next_cursor=None,
+    )
+
+
+def create_app(organizations: list[Organization], cached: bytes) -> FastAPI:
+    """Return app serving the organizations through every measured path."""
+
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=Page[OrganizationDetailed])
+    async def response_model() -> Page[OrganizationDetailed]:
+        return convert(organizations)
+
+    @app.get("/serialized", response_model=Page[OrganizationDetailed])
+    async def serialized(response: Response) -> Response:
+        return serialized_json(PAGE.dump_json(convert_shared(organizations)), response)
+
+    @app.get("/cached", response_model=Page[OrganizationDetailed])
+    async def from_cache(response: Response) -> Response:
+        return serialized_json(cached, response)
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, repeat: int) -> list[float]:
+    """Return process CPU milliseconds of repeated requests."""
+
+    await client.get(path)
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        response = await client.get(path)
+        samples.append((time.process_time() - started) * 1000)
+        response.raise_for_status()
+    return samples
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure every path for every list size."""
+
+    report: dict[str, Any] = {
+        "phones_per_organization": args.phones,
+        "activities_per_organization": args.activities,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        organizations = build_organizations(size, args.phones, args.activities)
+        app = create_app(organizations, PAGE.dump_json(convert(organizations)))
+        transport = ASGITransport(app=app)
+        results: dict[str, Any] = {}
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            bodies = {
+                (await client.get(path)).content
+                for path in ("/response-model", "/serialized", "/cached")
+            }
+            assert len({json.dumps(json.loads(body)) for body in bodies}) == 1
+            for name, path in (
+                ("response_model", "/response-model"),
+                ("serialized", "/serialized"),
+                ("cached", "/cached"),
+            ):
+                samples = await measure(client, path, args.repeat)
+                median = statistics.median(samples)
+                results[name] = {
+                    "p50_ms": round(median, 2),
+                    "per_org_us": round(median * 1000 / size, 2),
+                }
+        report["sizes"][size] = results
+    return report
+
+
+def main() -> None:
+    """Parse CLI arguments and print the JSON report."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--phones", type=int, default=2)
+    parser.add_argument("--activities", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
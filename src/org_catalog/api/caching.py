@@ -0,0 +1,106 @@
+"""Conditional GET support driven by catalog change counters."""
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.api.deps import get_db_session
+from org_catalog.api.responses import NDJSON_MEDIA_TYPE, accepts_ndjson
+from org_catalog.core.config import Settings, get_settings
+from org_catalog.core.security import API_KEY_HEADER_NAME
+from org_catalog.db.changes import CatalogSnapshot, change_tracker
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+
+
+def entity_tag(snapshot: CatalogSnapshot, media_type: str | None = None) -> str:
+    """Return the weak entity tag identifying the catalog state.
+
+    A representation negotiated by ``Accept`` gets its own tag, so a JSON
+    validator never matches the NDJSON body of the same URL.
+    """
+
+    if media_type is None:
+        return f'W/"{snapshot.version}"'
+    return f'W/"{snapshot.version}+{media_type.rpartition("/")[2]}"'
+
+
+def validator_headers(
+    snapshot: CatalogSnapshot,
+    max_age: int,
+    media_type: str | None = None,
+) -> dict[str, str]:
+    """Return validator and caching headers describing the catalog state."""
+
+    headers = {
+        "ETag": entity_tag(snapshot, media_type),
+        "Cache-Control": f"max-age={max_age}, must-revalidate",
+        "Vary": f"{API_KEY_HEADER_NAME}, Accept",
+    }
+    if snapshot.changed_at is not None:
+        headers["Last-Modified"] = format_datetime(snapshot.changed_at.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request,
+    snapshot: CatalogSnapshot,
+    media_type: str | None = None,
+) -> bool:
+    """Return whether the client already holds the current representation.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted without it, as required by RFC 9110.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = _opaque_tag(entity_tag(snapshot, media_type))
+        return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or snapshot.changed_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return snapshot.changed_at.replace(microsecond=0) <= since
+
+
+def conditional_get(*tables: str) -> Callable[..., Awaitable[None]]:
+    """Return a dependency validating GET requests against the tables' counters.
+
+    A matching ``If-None-Match`` or ``If-Modified-Since`` request is answered
+    with ``304 Not Modified`` before any route dependency loads data. Other
+    responses carry the validators so clients and CDNs can revalidate.
+    """
+
+    async def validate_freshness(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db_session),
+        settings: Settings = Depends(get_settings),
+    ) -> None:
+        """Answer conditional requests for an unchanged catalog with 304."""
+
+        if request.method not in CACHEABLE_METHODS:
+            return
+        snapshot = await change_tracker.snapshot(db, tables)
+        media_type = NDJSON_MEDIA_TYPE if accepts_ndjson(request) else None
+        headers = validator_headers(snapshot, settings.http_cache_max_age, media_type)
+        if is_not_modified(request, snapshot, media_type):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return validate_freshness
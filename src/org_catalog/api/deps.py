@@ -1,28 +1,161 @@
 """Common dependencies for FastAPI routes."""
 
-from collections.abc import AsyncGenerator
+import math
+from collections.abc import AsyncGenerator, Callable
+from functools import lru_cache
+from typing import Any, TypeVar
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from org_catalog.db.session import SessionLocal
+from org_catalog.core.config import get_settings
+from org_catalog.db.session import ReadOnlySessionLocal, SessionLocal, replica_router
 from org_catalog.services.activity import ActivityService
+from org_catalog.services.building_index import BuildingIndex, create_building_index
+from org_catalog.services.bulk_import import ImportService
+from org_catalog.services.cached import (
+    CachedBuildingService,
+    CachedClusterService,
+    CachedOrganizationService,
+)
+from org_catalog.services.clustering import ClusterService
+from org_catalog.services.export import ExportService
+from org_catalog.services.loading import (
+    ORGANIZATION_FIELDS,
+    OrganizationLoading,
+    OrganizationView,
+    organization_fields,
+)
 from org_catalog.services.organization import BuildingService, OrganizationService
+from org_catalog.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    PageRequest,
+    decode_cursor,
+)
+from org_catalog.services.result_cache import ResultCache, create_result_cache
 
+READ_METHODS = frozenset({"GET", "HEAD"})
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+#: Cookie keeping a client's reads on the primary for a while after its writes.
+PRIMARY_COOKIE = "org_catalog_primary"
+#: Endpoints that only read data although their method is not GET or HEAD.
+READ_ONLY_ENDPOINTS: set[Callable[..., Any]] = set()
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Provide a transactional database session."""
+EndpointT = TypeVar("EndpointT", bound=Callable[..., Any])
 
-    async with SessionLocal() as session:
+
+def read_only(endpoint: EndpointT) -> EndpointT:
+    """Mark the endpoint as only reading data, whatever its HTTP method.
+
+    Suits lookups taking their input in a request body: their sessions are
+    chosen as for GET requests.
+    """
+
+    READ_ONLY_ENDPOINTS.add(endpoint)
+    return endpoint
+
+
+def is_read_request(request: Request) -> bool:
+    """Return whether the request only reads data."""
+
+    return (
+        request.method in READ_METHODS
+        or request.scope.get("endpoint") in READ_ONLY_ENDPOINTS
+    )
+
+
+async def get_db_session(
+    request: Request,
+    response: Response,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a transactional database session.
+
+    Reads, i.e. GET and HEAD requests and endpoints marked with
+    :func:`read_only`, get read-only sessions on a replica when one is
+    usable, or on the primary with ``X-Read-Consistency: strong``. Other
+    requests write to the primary and set a cookie expiring after the
+    replica lag threshold, so that client alone keeps reading its own writes
+    from the primary; other clients' reads are unaffected.
+    """
+
+    if not is_read_request(request):
+        if replica_router.replicas:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=math.ceil(replica_router.max_lag),
+                httponly=True,
+                samesite="lax",
+            )
+        async with SessionLocal() as session:
+            yield session
+        return
+
+    factory = None
+    strong = request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "strong"
+    if not strong and PRIMARY_COOKIE not in request.cookies:
+        factory = replica_router.choose()
+    async with (factory or ReadOnlySessionLocal)() as session:
         yield session
 
 
+@lru_cache
+def get_building_index() -> BuildingIndex | None:
+    """Return the process-wide building index, or ``None`` when disabled."""
+
+    return create_building_index(get_settings())
+
+
+def get_organization_fields(
+    view: OrganizationView = Query(
+        OrganizationView.DETAILED,
+        description="`summary` returns id, name, description and building_id only.",
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Comma-separated organization fields to return instead of the view: "
+            f"{', '.join(ORGANIZATION_FIELDS)}."
+        ),
+    ),
+) -> frozenset[str] | None:
+    """Return organization fields requested by the client, or ``None`` for all of them."""
+
+    requested = None if fields is None else [name.strip() for name in fields.split(",")]
+    try:
+        return organization_fields(view, requested)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        ) from exc
+
+
 def get_organization_service(
     db: AsyncSession = Depends(get_db_session),
+    building_index: BuildingIndex | None = Depends(get_building_index),
+    fields: frozenset[str] | None = Depends(get_organization_fields),
 ) -> OrganizationService:
     """Return configured organization service instance."""
 
-    return OrganizationService(db)
+    return OrganizationService(db, building_index=building_index, fields=fields)
+
+
+def get_joined_organization_service(
+    db: AsyncSession = Depends(get_db_session),
+    building_index: BuildingIndex | None = Depends(get_building_index),
+    fields: frozenset[str] | None = Depends(get_organization_fields),
+) -> OrganizationService:
+    """Return organization service loading relations in a single joined query.
+
+    Suits single-organization lookups, where the phones x activities fan-out is
+    bounded and one round trip beats one query per collection.
+    """
+
+    return OrganizationService(
+        db, loading=OrganizationLoading.JOINED, building_index=building_index, fields=fields
+    )
 
 
 def get_building_service(
@@ -39,3 +172,79 @@ def get_activity_service(
     """Return configured activity service instance."""
 
     return ActivityService(db)
+
+
+def get_cluster_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> ClusterService:
+    """Return service aggregating buildings into map clusters."""
+
+    return ClusterService(db)
+
+
+def get_export_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> ExportService:
+    """Return service streaming whole catalog tables."""
+
+    return ExportService(db)
+
+
+def get_import_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> ImportService:
+    """Return service loading bulk catalog data."""
+
+    return ImportService(db)
+
+
+@lru_cache
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache."""
+
+    return create_result_cache(get_settings())
+
+
+def get_cached_organization_service(
+    db: AsyncSession = Depends(get_db_session),
+    cache: ResultCache = Depends(get_result_cache),
+    service: OrganizationService = Depends(get_organization_service),
+    joined_service: OrganizationService = Depends(get_joined_organization_service),
+    activity_service: ActivityService = Depends(get_activity_service),
+    fields: frozenset[str] | None = Depends(get_organization_fields),
+) -> CachedOrganizationService:
+    """Return organization service answering from the result cache."""
+
+    return CachedOrganizationService(
+        db, cache, service, joined_service, activity_service, fields
+    )
+
+
+def get_cached_building_service(
+    db: AsyncSession = Depends(get_db_session),
+    cache: ResultCache = Depends(get_result_cache),
+    service: BuildingService = Depends(get_building_service),
+) -> CachedBuildingService:
+    """Return building service answering from the result cache."""
+
+    return CachedBuildingService(db, cache, service)
+
+
+def get_cached_cluster_service(
+    db: AsyncSession = Depends(get_db_session),
+    cache: ResultCache = Depends(get_result_cache),
+    service: ClusterService = Depends(get_cluster_service),
+) -> CachedClusterService:
+    """Return map cluster service answering from the result cache."""
+
+    return CachedClusterService(db, cache, service)
+
+
+def get_page_request(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size."),
+    cursor: str | None = Query(None, description="Cursor returned as `next_cursor`."),
+) -> PageRequest:
+    """Return keyset page request parsed from query parameters."""
+
+    after = decode_cursor(cursor) if cursor else None
+    return PageRequest(limit=limit, after=after)
@@ -0,0 +1,104 @@
+"""ASGI middleware of the API application."""
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from org_catalog.core.metrics import registry
+from org_catalog.db.instrumentation import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Reports the SQL statements of every request in response headers.
+
+    Statement count, total database time and the slowest statement's time are
+    sent as ``X-DB-Statements``, ``X-DB-Time-Ms`` and ``X-DB-Slowest-Ms``; the
+    slowest statement itself is logged. Statements issued while a streamed
+    body is sent come after the headers and are not included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add the statement statistics of the request to its response headers."""
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Statements"] = str(stats.statements)
+                    headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+                    slowest = stats.slowest
+                    if slowest is not None:
+                        headers["X-DB-Slowest-Ms"] = f"{slowest[1] * 1000:.2f}"
+                        logger.debug(
+                            "%s %s: %d statements in %.2f ms, slowest %.2f ms: %s",
+                            scope["method"],
+                            scope["path"],
+                            stats.statements,
+                            stats.duration * 1000,
+                            slowest[1] * 1000,
+                            slowest[0],
+                        )
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+http_requests = registry.counter(
+    "org_catalog_http_requests_total",
+    "HTTP requests by method, route and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "org_catalog_http_request_duration_seconds",
+    "Time to handle HTTP requests until the body is sent, by method and route.",
+    ("method", "route"),
+)
+
+
+class MetricsMiddleware:
+    """Counts requests and records their latency per route.
+
+    Routes are labelled by their endpoint name, such as ``get_building``, so
+    ``/buildings/1`` and ``/buildings/2`` share a series; requests matching no
+    route are labelled ``unmatched``. Requests failing before a response is
+    started are counted with status 500.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Record the request duration and status, labelled by route."""
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "name", "unmatched")
+            method = scope["method"]
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method, route)
@@ -0,0 +1,59 @@
+"""Response helpers shared by API routes."""
+
+from collections.abc import AsyncIterator
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class SerializedJSONResponse(Response):
+    """JSON response whose body has already been serialized."""
+
+    media_type = "application/json"
+
+
+def serialized_json(payload: bytes, response: Response) -> SerializedJSONResponse:
+    """Return the payload as a response carrying headers set by dependencies.
+
+    FastAPI skips ``response_model`` validation for returned responses, so
+    routes declaring a model for documentation send the bytes untouched.
+    """
+
+    return SerializedJSONResponse(payload, headers=response.headers)
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Return whether the client asked for newline-delimited JSON."""
+
+    accept = request.headers.get("accept", "")
+    return any(
+        part.split(";")[0].strip() == NDJSON_MEDIA_TYPE for part in accept.split(",")
+    )
+
+
+def ndjson_stream(chunks: AsyncIterator[bytes], response: Response) -> StreamingResponse:
+    """Return a streamed NDJSON response carrying headers set by dependencies.
+
+    The chunks may read through the request session: since FastAPI 0.118,
+    dependencies with ``yield`` are closed only after the body is sent.
+    """
+
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=response.headers)
+
+
+def attachment_stream(
+    chunks: AsyncIterator[bytes],
+    media_type: str,
+    filename: str,
+    response: Response,
+) -> StreamingResponse:
+    """Return a streamed file download carrying headers set by dependencies.
+
+    Exports copy from the request session while the body is sent, which
+    relies on the same FastAPI 0.118 dependency lifetime as NDJSON streams.
+    """
+
+    headers = {**response.headers, "Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
@@ -1,9 +1,12 @@
 """Route modules available for import."""
 
-from . import activities, buildings, organizations
+from . import activities, buildings, export, geo, imports, organizations
 
 __all__ = (
     "activities",
     "buildings",
+    "export",
+    "geo",
+    "imports",
     "organizations",
 )
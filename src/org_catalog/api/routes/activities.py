@@ -2,11 +2,18 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from org_catalog.api.deps import get_activity_service
-from org_catalog.schemas.activity import ActivityTree
+from org_catalog.api.caching import conditional_get
+from org_catalog.api.deps import get_activity_service, read_only
+from org_catalog.schemas.activity import ActivityBase, ActivityTree
+from org_catalog.schemas.common import Batch, BatchRequest
 from org_catalog.services.activity import ActivityService, MAX_ACTIVITY_DEPTH
+from org_catalog.services.cached import ACTIVITY_TABLES
 
-router = APIRouter(prefix="/activities", tags=["activities"])
+router = APIRouter(
+    prefix="/activities",
+    tags=["activities"],
+    dependencies=[Depends(conditional_get(*ACTIVITY_TABLES))],
+)
 
 
 @router.get(
@@ -24,6 +31,31 @@ async def list_activity_tree(
     return await service.build_tree(max_depth=max_depth)
 
 
+@router.post(
+    "/batch",
+    response_model=Batch[ActivityBase],
+    summary="Get activities by ids",
+    description=(
+        "Возвращает виды деятельности по списку идентификаторов одним запросом к базе. "
+        "Найденные виды деятельности передаются в `items` по `id`, отсутствующие "
+        "идентификаторы — в `missing`."
+    ),
+)
+@read_only
+async def get_activities(
+    batch: BatchRequest,
+    service: ActivityService = Depends(get_activity_service),
+) -> Batch[ActivityBase]:
+    """Return activities by ids with the ids that were not found."""
+
+    ids = list(dict.fromkeys(batch.ids))
+    found = await service.get_many(ids)
+    return Batch[ActivityBase].collect(
+        ids,
+        {activity_id: ActivityBase.model_validate(a) for activity_id, a in found.items()},
+    )
+
+
 @router.get(
     "/{activity_id}/tree",
     response_model=list[ActivityTree],
@@ -38,7 +70,7 @@ async def single_activity_tree(
 ) -> list[ActivityTree]:
     """Return activity subtree for provided activity id."""
 
-    if await service.get(activity_id) is None:
+    if not await service.exists(activity_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Activity #{activity_id} not found.",
@@ -1,12 +1,19 @@
 """Building related API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from org_catalog.api.deps import get_building_service
+from org_catalog.api.caching import conditional_get
+from org_catalog.api.deps import get_cached_building_service, read_only
+from org_catalog.api.responses import serialized_json
 from org_catalog.schemas.building import Building
-from org_catalog.services.organization import BuildingService
+from org_catalog.schemas.common import Batch, BatchRequest
+from org_catalog.services.cached import BUILDING_TABLES, CachedBuildingService
 
-router = APIRouter(prefix="/buildings", tags=["buildings"])
+router = APIRouter(
+    prefix="/buildings",
+    tags=["buildings"],
+    dependencies=[Depends(conditional_get(*BUILDING_TABLES))],
+)
 
 
 @router.get(
@@ -16,11 +23,33 @@ router = APIRouter(prefix="/buildings", tags=["buildings"])
     description="Возвращает все здания, доступные в справочнике.",
 )
 async def list_buildings(
-    service: BuildingService = Depends(get_building_service),
-) -> list[Building]:
+    response: Response,
+    service: CachedBuildingService = Depends(get_cached_building_service),
+) -> Response:
     """Return catalog buildings."""
 
-    return await service.list()
+    return serialized_json(await service.list(), response)
+
+
+@router.post(
+    "/batch",
+    response_model=Batch[Building],
+    summary="Get buildings by ids",
+    description=(
+        "Возвращает здания по списку идентификаторов одним запросом к базе. "
+        "Найденные здания передаются в `items` по `id`, отсутствующие "
+        "идентификаторы — в `missing`."
+    ),
+)
+@read_only
+async def get_buildings(
+    batch: BatchRequest,
+    response: Response,
+    service: CachedBuildingService = Depends(get_cached_building_service),
+) -> Response:
+    """Return buildings by ids with the ids that were not found."""
+
+    return serialized_json(await service.get_many(batch.ids), response)
 
 
 @router.get(
@@ -32,8 +61,9 @@ async def list_buildings(
 )
 async def get_building(
     building_id: int,
-    service: BuildingService = Depends(get_building_service),
-) -> Building:
+    response: Response,
+    service: CachedBuildingService = Depends(get_cached_building_service),
+) -> Response:
     """Return single building by identifier."""
 
     building = await service.get(building_id)
@@ -42,4 +72,4 @@ async def get_building(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Building #{building_id} not found.",
         )
-    return building
+    return serialized_json(building, response)
@@ -0,0 +1,64 @@
+"""Bulk catalog export API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from org_catalog.api.caching import conditional_get
+from org_catalog.api.deps import get_export_service
+from org_catalog.api.responses import attachment_stream
+from org_catalog.services.cached import ORGANIZATION_TABLES
+from org_catalog.services.export import (
+    MEDIA_TYPES,
+    ExportDataset,
+    ExportFormat,
+    ExportService,
+    parquet_available,
+)
+
+# Every export is validated against the whole catalog: the organization
+# export embeds all other tables.
+router = APIRouter(
+    prefix="/export",
+    tags=["export"],
+    dependencies=[Depends(conditional_get(*ORGANIZATION_TABLES))],
+)
+
+
+@router.get(
+    "/{dataset}",
+    summary="Export a catalog table",
+    description=(
+        "Выгружает таблицу справочника целиком потоком из `COPY ... TO STDOUT`, "
+        "минуя ORM. Для организаций телефоны и виды деятельности собраны в колонки "
+        "`phones`, `activity_ids` и `activity_names`: в CSV — массивы JSON, в Parquet — списки."
+    ),
+    response_class=Response,
+    responses={
+        200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}},
+        501: {"description": "Parquet support is not installed"},
+    },
+)
+async def export_dataset(
+    dataset: ExportDataset,
+    response: Response,
+    export_format: ExportFormat = Query(
+        ExportFormat.CSV, alias="format", description="File format."
+    ),
+    service: ExportService = Depends(get_export_service),
+) -> Response:
+    """Stream the whole table in the requested format."""
+
+    if export_format is ExportFormat.PARQUET:
+        if not parquet_available():
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Parquet export requires the pyarrow package.",
+            )
+        chunks = service.parquet(dataset)
+    else:
+        chunks = service.csv(dataset)
+    return attachment_stream(
+        chunks,
+        MEDIA_TYPES[export_format],
+        f"{dataset}.{export_format}",
+        response,
+    )
@@ -0,0 +1,51 @@
+"""Aggregated map data API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from org_catalog.api.caching import conditional_get
+from org_catalog.api.deps import get_cached_cluster_service
+from org_catalog.api.responses import serialized_json
+from org_catalog.schemas.geo import GeoClusters
+from org_catalog.services.cached import GEO_TABLES, CachedClusterService
+from org_catalog.services.clustering import MAX_CELLS, MAX_ZOOM, cell_count
+
+router = APIRouter(
+    prefix="/geo",
+    tags=["geo"],
+    dependencies=[Depends(conditional_get(*GEO_TABLES))],
+)
+
+
+@router.get(
+    "/clusters",
+    response_model=GeoClusters,
+    summary="Map clusters",
+    description=(
+        "Группирует здания в прямоугольной области по ячейкам сетки, размер которых "
+        "зависит от `zoom` (четыре ячейки на сторону тайла карты). Для каждой непустой "
+        "ячейки возвращаются центр её зданий, число зданий и число организаций в них."
+    ),
+)
+async def map_clusters(
+    response: Response,
+    min_latitude: float = Query(..., ge=-90.0, le=90.0),
+    max_latitude: float = Query(..., ge=-90.0, le=90.0),
+    min_longitude: float = Query(..., ge=-180.0, le=180.0),
+    max_longitude: float = Query(..., ge=-180.0, le=180.0),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM, description="Web map zoom level."),
+    service: CachedClusterService = Depends(get_cached_cluster_service),
+) -> Response:
+    """Return building clusters within the bounding box at the zoom level."""
+
+    if min_latitude > max_latitude or min_longitude > max_longitude:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Minimum coordinates must be less than maximum coordinates.",
+        )
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if cell_count(*bounds, zoom) > MAX_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Bounding box spans more than {MAX_CELLS} cells; zoom out or narrow it.",
+        )
+    return serialized_json(await service.clusters(*bounds, zoom), response)
@@ -0,0 +1,65 @@
+"""Bulk catalog import API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from org_catalog.api.deps import get_import_service
+from org_catalog.api.responses import NDJSON_MEDIA_TYPE
+from org_catalog.schemas.bulk_import import ImportReport
+from org_catalog.services.bulk_import import (
+    ImportDataset,
+    ImportFormat,
+    ImportService,
+    InvalidImportError,
+)
+
+IMPORT_MEDIA_TYPES = {
+    "text/csv": ImportFormat.CSV,
+    NDJSON_MEDIA_TYPE: ImportFormat.NDJSON,
+}
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post(
+    "/{dataset}",
+    response_model=ImportReport,
+    summary="Bulk import catalog data",
+    description=(
+        "Загружает здания, организации, телефоны или связи организаций с видами "
+        "деятельности из тела запроса в формате CSV (`Content-Type: text/csv`, первая "
+        "строка — заголовок) или NDJSON (`application/x-ndjson`). Записи с существующим "
+        "ключом обновляются. Импорт выполняется в одной транзакции."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {} for media_type in IMPORT_MEDIA_TYPES},
+        }
+    },
+    responses={
+        415: {"description": "Unsupported content type"},
+        422: {"description": "Invalid records"},
+    },
+)
+async def import_dataset(
+    dataset: ImportDataset,
+    request: Request,
+    service: ImportService = Depends(get_import_service),
+) -> ImportReport:
+    """Load the request body into the catalog."""
+
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    import_format = IMPORT_MEDIA_TYPES.get(media_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of: {', '.join(IMPORT_MEDIA_TYPES)}.",
+        )
+    try:
+        progress = await service.load(dataset, import_format, request.stream())
+    except InvalidImportError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        ) from exc
+    return ImportReport.model_validate(progress)
@@ -1,61 +1,53 @@
 """Organization related API routes."""
 
-import asyncio
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from org_catalog.api.caching import conditional_get
 from org_catalog.api.deps import (
     get_activity_service,
-    get_building_service,
-    get_organization_service,
+    get_cached_building_service,
+    get_cached_organization_service,
+    get_page_request,
+    read_only,
+)
+from org_catalog.api.responses import (
+    NDJSON_MEDIA_TYPE,
+    accepts_ndjson,
+    ndjson_stream,
+    serialized_json,
 )
-from org_catalog.schemas.organization import OrganizationDetailed
+from org_catalog.schemas.common import Batch, BatchRequest, Page
+from org_catalog.schemas.organization import OrganizationDetailed, OrganizationWithDistance
 from org_catalog.services.activity import ActivityService
-from org_catalog.services.organization import BuildingService, OrganizationService
-
-router = APIRouter(prefix="/organizations", tags=["organizations"])
-
-
-def _convert(organization):
-    """Convert ORM organization to schema."""
-
-    return OrganizationDetailed.model_validate(organization)
-
-
-@router.get(
-    "/{organization_id}",
-    response_model=OrganizationDetailed,
-    summary="Get organization by id",
-    description="Возвращает подробную информацию об организации.",
-    responses={404: {"description": "Organization not found"}},
+from org_catalog.services.cached import (
+    ORGANIZATION_TABLES,
+    CachedBuildingService,
+    CachedOrganizationService,
 )
-async def get_organization(
-    organization_id: int,
-    service: OrganizationService = Depends(get_organization_service),
-) -> OrganizationDetailed:
-    """Return organization by id."""
+from org_catalog.services.organization import GeoOrdering, OrganizationFilters
+from org_catalog.services.pagination import PageRequest
 
-    organization = await service.get(organization_id)
-    if organization is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Organization #{organization_id} not found.",
-        )
-    return _convert(organization)
+router = APIRouter(
+    prefix="/organizations",
+    tags=["organizations"],
+    dependencies=[Depends(conditional_get(*ORGANIZATION_TABLES))],
+)
 
 
 @router.get(
     "/by-building/{building_id}",
-    response_model=list[OrganizationDetailed],
+    response_model=Page[OrganizationDetailed],
     summary="Organizations in building",
     description="Возвращает все организации, расположенные в указанном здании.",
     responses={404: {"description": "Building not found"}},
 )
 async def organizations_by_building(
     building_id: int,
-    organization_service: OrganizationService = Depends(get_organization_service),
-    building_service: BuildingService = Depends(get_building_service),
-) -> list[OrganizationDetailed]:
+    response: Response,
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+    building_service: CachedBuildingService = Depends(get_cached_building_service),
+) -> Response:
     """Return organizations for the provided building."""
 
     if await building_service.get(building_id) is None:
@@ -63,13 +55,13 @@ async def organizations_by_building(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Building #{building_id} not found.",
         )
-    organizations = await organization_service.by_building(building_id)
-    return [_convert(org) for org in organizations]
+    payload = await organization_service.by_building(building_id, page)
+    return serialized_json(payload, response)
 
 
 @router.get(
     "/by-activity/{activity_id}",
-    response_model=list[OrganizationDetailed],
+    response_model=Page[OrganizationDetailed],
     summary="Organizations by activity id",
     description=(
         "Возвращает организации, связанные с видом деятельности и его потомками."
@@ -78,71 +70,144 @@ async def organizations_by_building(
 )
 async def organizations_by_activity(
     activity_id: int,
-    organization_service: OrganizationService = Depends(get_organization_service),
+    response: Response,
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
     activity_service: ActivityService = Depends(get_activity_service),
-) -> list[OrganizationDetailed]:
+) -> Response:
     """Return organizations for the activity including descendants."""
 
-    activity = await activity_service.get(activity_id)
-    if activity is None:
+    if not await activity_service.exists(activity_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Activity #{activity_id} not found.",
         )
-    descendant_ids = await activity_service.descendant_ids(activity_id)
-    organizations = await organization_service.by_activity_ids(descendant_ids)
-    return [_convert(org) for org in organizations]
+    payload = await organization_service.by_activity(activity_id, page)
+    return serialized_json(payload, response)
 
 
 @router.get(
     "/search/by-activity",
-    response_model=list[OrganizationDetailed],
+    response_model=Page[OrganizationDetailed],
     summary="Search organizations by activity name",
     description=(
         "Ищет организации по названию вида деятельности, учитывая вложенные уровни."
     ),
 )
 async def organizations_by_activity_name(
-    name: str = Query(..., description="Activity name to search for. Partial matches allowed."),
-    organization_service: OrganizationService = Depends(get_organization_service),
-    activity_service: ActivityService = Depends(get_activity_service),
-) -> list[OrganizationDetailed]:
+    response: Response,
+    name: str = Query(
+        ...,
+        min_length=2,
+        description="Activity name to search for. Partial matches allowed.",
+    ),
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
     """Return organizations that match the activity name tree search."""
 
-    activities = await activity_service.find_by_name(name)
-    activity_ids: set[int] = set()
-    for activity in activities:
-        descendants = await activity_service.descendant_ids(activity.id)
-        activity_ids.update(descendants)
-    organizations = await organization_service.by_activity_ids(sorted(activity_ids))
-    return [_convert(org) for org in organizations]
+    payload = await organization_service.by_activity_name(name, page)
+    return serialized_json(payload, response)
 
 
 @router.get(
     "/search/by-name",
-    response_model=list[OrganizationDetailed],
+    response_model=Page[OrganizationDetailed],
     summary="Search organizations by name",
     description="Ищет организации по названию (регистр игнорируется).",
 )
 async def organizations_by_name(
+    response: Response,
     query: str = Query(..., min_length=2, description="Organization search query."),
-    organization_service: OrganizationService = Depends(get_organization_service),
-) -> list[OrganizationDetailed]:
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
     """Return organizations filtered by name."""
 
-    organizations = await organization_service.search_by_name(query)
-    return [_convert(org) for org in organizations]
+    payload = await organization_service.search_by_name(query, page)
+    return serialized_json(payload, response)
+
+
+@router.get(
+    "/search",
+    response_model=Page[OrganizationDetailed],
+    summary="Search organizations by combined filters",
+    description=(
+        "Ищет организации, удовлетворяющие всем переданным условиям одновременно: "
+        "здание, вид деятельности с потомками, часть названия, радиус и прямоугольная "
+        "область. Пересечение выполняется одним запросом к базе. С радиусом результаты "
+        "идут по возрастанию расстояния, с названием — по релевантности, иначе по `id`."
+    ),
+)
+async def search_organizations(
+    response: Response,
+    building_id: int | None = Query(None, description="Building the organization is in."),
+    activity_id: int | None = Query(
+        None, description="Activity the organization is linked to, including descendants."
+    ),
+    name: str | None = Query(None, min_length=2, description="Part of the organization name."),
+    latitude: float | None = Query(None, ge=-90.0, le=90.0, description="Center latitude."),
+    longitude: float | None = Query(None, ge=-180.0, le=180.0, description="Center longitude."),
+    radius_km: float | None = Query(None, gt=0, description="Radius around the center in km."),
+    min_latitude: float | None = Query(None, ge=-90.0, le=90.0),
+    max_latitude: float | None = Query(None, ge=-90.0, le=90.0),
+    min_longitude: float | None = Query(None, ge=-180.0, le=180.0),
+    max_longitude: float | None = Query(None, ge=-180.0, le=180.0),
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
+    """Return organizations matching every provided filter."""
+
+    filters = OrganizationFilters(
+        building_id=building_id,
+        activity_ids=None if activity_id is None else [activity_id],
+        name=name,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        min_latitude=min_latitude,
+        max_latitude=max_latitude,
+        min_longitude=min_longitude,
+        max_longitude=max_longitude,
+    )
+    if radius_km is not None and (latitude is None or longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="radius_km requires latitude and longitude.",
+        )
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if not filters.has_box and any(bound is not None for bound in bounds):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Provide all bounding box parameters or none.",
+        )
+    if filters.has_box and (min_latitude > max_latitude or min_longitude > max_longitude):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Minimum coordinates must be less than maximum coordinates.",
+        )
+    payload = await organization_service.search(filters, page)
+    return serialized_json(payload, response)
 
 
 @router.get(
     "/geo",
-    response_model=list[OrganizationDetailed],
+    response_model=Page[OrganizationWithDistance],
     summary="Search organizations by geo",
     description=(
-        "Возвращает организации по координатам: в радиусе или прямоугольной области."
+        "Возвращает организации по координатам: в радиусе или прямоугольной области, "
+        "с расстоянием `distance_km` от точки `latitude`/`longitude`. "
+        "Поиск в радиусе по умолчанию упорядочен по расстоянию, в прямоугольнике — по `id`; "
+        "порядок задаёт параметр `order_by`. "
+        "Для прямоугольной области с заголовком `Accept: application/x-ndjson` "
+        "все найденные организации передаются потоком в порядке `id`, по одной на строку, "
+        "без ограничения `limit`."
     ),
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
 )
 async def organizations_by_geo(
+    request: Request,
+    response: Response,
     latitude: float = Query(..., ge=-90.0, le=90.0, description="Center latitude."),
     longitude: float = Query(..., ge=-180.0, le=180.0, description="Center longitude."),
     radius_km: float | None = Query(
@@ -154,13 +219,20 @@ async def organizations_by_geo(
     max_latitude: float | None = Query(None, ge=-90.0, le=90.0),
     min_longitude: float | None = Query(None, ge=-180.0, le=180.0),
     max_longitude: float | None = Query(None, ge=-180.0, le=180.0),
-    organization_service: OrganizationService = Depends(get_organization_service),
-) -> list[OrganizationDetailed]:
-    """Return organizations by geographic filters."""
+    order_by: GeoOrdering | None = Query(
+        None,
+        description="Result order: `distance` from the center or organization `id`.",
+    ),
+    page: PageRequest = Depends(get_page_request),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
+    """Return organizations by geographic filters with distances from the center."""
 
     if radius_km is not None:
-        organizations = await organization_service.in_radius(latitude, longitude, radius_km)
-        return [_convert(org) for org in organizations]
+        payload = await organization_service.in_radius(
+            latitude, longitude, radius_km, page, order_by or GeoOrdering.DISTANCE
+        )
+        return serialized_json(payload, response)
 
     if None in {min_latitude, max_latitude, min_longitude, max_longitude}:
         raise HTTPException(
@@ -172,10 +244,81 @@ async def organizations_by_geo(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Minimum coordinates must be less than maximum coordinates.",
         )
-    organizations = await organization_service.in_rectangle(
-        min_latitude,
-        max_latitude,
-        min_longitude,
-        max_longitude,
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if accepts_ndjson(request):
+        if order_by is GeoOrdering.DISTANCE:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Streamed results are ordered by id.",
+            )
+        chunks = organization_service.stream_in_rectangle(*bounds, latitude, longitude, page.after)
+        return ndjson_stream(chunks, response)
+    payload = await organization_service.in_rectangle(
+        *bounds, latitude, longitude, page, order_by or GeoOrdering.ID
     )
-    return [_convert(org) for org in organizations]
+    return serialized_json(payload, response)
+
+
+@router.get(
+    "/nearest",
+    response_model=list[OrganizationWithDistance],
+    summary="Nearest organizations",
+    description="Возвращает k ближайших к точке организаций, отсортированных по расстоянию.",
+)
+async def nearest_organizations(
+    response: Response,
+    latitude: float = Query(..., ge=-90.0, le=90.0, description="Point latitude."),
+    longitude: float = Query(..., ge=-180.0, le=180.0, description="Point longitude."),
+    k: int = Query(10, ge=1, le=100, description="Number of organizations to return."),
+    organization_service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
+    """Return the k organizations closest to the point."""
+
+    payload = await organization_service.nearest(latitude, longitude, k)
+    return serialized_json(payload, response)
+
+
+@router.post(
+    "/batch",
+    response_model=Batch[OrganizationDetailed],
+    summary="Get organizations by ids",
+    description=(
+        "Возвращает организации по списку идентификаторов; число запросов к базе "
+        "не зависит от длины списка. "
+        "Найденные организации передаются в `items` по `id`, отсутствующие "
+        "идентификаторы — в `missing`."
+    ),
+)
+@read_only
+async def get_organizations(
+    batch: BatchRequest,
+    response: Response,
+    service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
+    """Return organizations by ids with the ids that were not found."""
+
+    return serialized_json(await service.get_many(batch.ids), response)
+
+
+# Declared last so the catch-all path does not shadow the static routes above.
+@router.get(
+    "/{organization_id}",
+    response_model=OrganizationDetailed,
+    summary="Get organization by id",
+    description="Возвращает подробную информацию об организации.",
+    responses={404: {"description": "Organization not found"}},
+)
+async def get_organization(
+    organization_id: int,
+    response: Response,
+    service: CachedOrganizationService = Depends(get_cached_organization_service),
+) -> Response:
+    """Return organization by id."""
+
+    organization = await service.get(organization_id)
+    if organization is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Organization #{organization_id} not found.",
+        )
+    return serialized_json(organization, response)
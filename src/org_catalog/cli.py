@@ -0,0 +1,95 @@
+"""Command line tools for catalog maintenance.
+
+Usage::
+
+    uv run org-catalog import buildings buildings.csv
+    uv run org-catalog import organizations organizations.ndjson --batch-size 50000
+    cat phones.csv | uv run org-catalog import phones - --format csv
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from org_catalog.db.session import SessionLocal, engine
+from org_catalog.services.bulk_import import (
+    DEFAULT_BATCH_SIZE,
+    ImportDataset,
+    ImportFormat,
+    ImportProgress,
+    ImportService,
+    InvalidImportError,
+)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+SUFFIX_FORMATS = {
+    ".csv": ImportFormat.CSV,
+    ".ndjson": ImportFormat.NDJSON,
+    ".jsonl": ImportFormat.NDJSON,
+}
+
+
+async def read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    """Yield the stream in chunks read off the event loop."""
+
+    while chunk := await asyncio.to_thread(stream.read, READ_CHUNK_SIZE):
+        yield chunk
+
+
+def report(progress: ImportProgress) -> None:
+    """Print running import totals."""
+
+    print(
+        f"{progress.dataset}: batch {progress.batches}, {progress.rows} rows, "
+        f"{progress.inserted} inserted, {progress.updated} updated",
+        file=sys.stderr,
+    )
+
+
+async def import_file(args: argparse.Namespace) -> ImportProgress:
+    """Import the file named in the arguments."""
+
+    stream = sys.stdin.buffer if args.path == "-" else Path(args.path).open("rb")
+    try:
+        async with SessionLocal() as session:
+            service = ImportService(session, batch_size=args.batch_size)
+            return await service.load(args.dataset, args.format, read_chunks(stream), report)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        await engine.dispose()
+
+
+def main() -> None:
+    """Parse CLI arguments and run the command."""
+
+    parser = argparse.ArgumentParser(prog="org-catalog", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Bulk import catalog data.")
+    importer.add_argument("dataset", type=ImportDataset, choices=list(ImportDataset))
+    importer.add_argument("path", help="CSV or NDJSON file, or - for standard input.")
+    importer.add_argument("--format", type=ImportFormat, choices=list(ImportFormat))
+    importer.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.format is None:
+        args.format = SUFFIX_FORMATS.get(Path(args.path).suffix.lower())
+        if args.format is None:
+            parser.error("cannot infer the input format, pass --format")
+    try:
+        progress = asyncio.run(import_file(args))
+    except InvalidImportError as exc:
+        sys.exit(f"Import failed: {exc}")
+    print(
+        f"{progress.dataset}: {progress.rows} rows in {progress.batches} batches, "
+        f"{progress.inserted} inserted, {progress.updated} updated, "
+        f"{progress.unchanged} unchanged"
+    )
+
+
+if __name__ == "__main__":
+    main()
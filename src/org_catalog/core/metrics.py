@@ -0,0 +1,308 @@
+"""Process-local metrics rendered in the Prometheus text exposition format.
+
+Metrics are plain dictionaries updated from the event loop thread, so
+recording a sample takes no locks. Collection work happens on scrape: samples
+of every worker are merged and formatted only when ``/metrics`` is read.
+
+With several worker processes each worker periodically writes its samples to
+a shared directory and the scraped worker merges all files. Counters and
+histograms of exited workers are kept, so totals never go backwards; gauges
+are only taken from running workers.
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+#: Samples of one process: metric name to a list of ``[labels, value]`` pairs,
+#: where histogram values are ``[bucket counts, sum]``.
+Snapshot = dict[str, list[list[Any]]]
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: defaultdict[Labels, float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add the amount to the counter of the label values."""
+
+        self.values[labels] += amount
+
+    def samples(self) -> list[list[Any]]:
+        """Return the current samples."""
+
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.counts: dict[Labels, list[int]] = {}
+        self.sums: defaultdict[Labels, float] = defaultdict(float)
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the label values."""
+
+        counts = self.counts.get(labels)
+        if counts is None:
+            # One slot per bucket plus one for values above the largest bound.
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def samples(self) -> list[list[Any]]:
+        """Return the current samples."""
+
+        return [
+            [list(labels), [list(counts), self.sums[labels]]]
+            for labels, counts in self.counts.items()
+        ]
+
+
+class Gauge:
+    """Value read from a callback when metrics are collected."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels,
+        collect: Callable[[], dict[Labels, float]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def samples(self) -> list[list[Any]]:
+        """Return the current samples."""
+
+        return [[list(labels), value] for labels, value in self.collect().items()]
+
+
+Metric = Counter | Histogram | Gauge
+
+
+class MetricsRegistry:
+    """Metrics of the application, merged across workers on scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._ratios: list[tuple[str, str, str, str]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Labels = ()) -> Counter:
+        """Register and return a counter."""
+
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register and return a histogram."""
+
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels,
+        collect: Callable[[], dict[Labels, float]],
+    ) -> Gauge:
+        """Register and return a gauge read from ``collect`` on scrape."""
+
+        return self._register(Gauge(name, documentation, labelnames, collect))
+
+    def hit_ratio(self, name: str, documentation: str, counter: Counter, hit: str) -> None:
+        """Publish the share of ``counter`` samples whose last label equals ``hit``.
+
+        The ratio is computed from merged samples, so it covers all workers.
+        """
+
+        self._ratios.append((name, documentation, counter.name, hit))
+
+    def snapshot(self) -> Snapshot:
+        """Return the samples of this process."""
+
+        return {name: metric.samples() for name, metric in self._metrics.items()}
+
+    def render(self, current: Snapshot, others: Iterable[tuple[Snapshot, bool]] = ()) -> str:
+        """Return merged samples in the Prometheus text format.
+
+        ``others`` holds snapshots of other workers with whether each is alive.
+        """
+
+        merged: dict[str, dict[Labels, Any]] = {name: {} for name in self._metrics}
+        for snapshot, alive in [(current, True), *others]:
+            for name, samples in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                for labels, value in samples:
+                    _merge_sample(metric, merged[name], tuple(labels), value)
+
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in sorted(merged[name].items()):
+                lines.extend(_format(metric, labels, value))
+        for name, documentation, counter_name, hit in self._ratios:
+            totals: defaultdict[Labels, list[float]] = defaultdict(lambda: [0.0, 0.0])
+            for labels, value in merged[counter_name].items():
+                total = totals[labels[:-1]]
+                total[0] += value if labels[-1] == hit else 0.0
+                total[1] += value
+            counter = self._metrics[counter_name]
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, (hits, total) in sorted(totals.items()):
+                names = counter.labelnames[:-1]
+                lines.append(f"{name}{_labels(names, labels)} {_number(hits / total)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _merge_sample(metric: Metric, merged: dict[Labels, Any], labels: Labels, value: Any) -> None:
+    if isinstance(metric, Histogram):
+        counts, total = value
+        current = merged.get(labels)
+        if current is None:
+            merged[labels] = [list(counts), total]
+        else:
+            current[0] = [a + b for a, b in zip(current[0], counts, strict=True)]
+            current[1] += total
+    else:
+        merged[labels] = merged.get(labels, 0.0) + value
+
+
+def _format(metric: Metric, labels: Labels, value: Any) -> list[str]:
+    if not isinstance(metric, Histogram):
+        return [f"{metric.name}{_labels(metric.labelnames, labels)} {_number(value)}"]
+    counts, total = value
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*metric.buckets, math.inf), counts, strict=True):
+        cumulative += count
+        names = (*metric.labelnames, "le")
+        values = (*labels, "+Inf" if bound == math.inf else _number(bound))
+        lines.append(f"{metric.name}_bucket{_labels(names, values)} {cumulative}")
+    lines.append(f"{metric.name}_sum{_labels(metric.labelnames, labels)} {_number(total)}")
+    lines.append(f"{metric.name}_count{_labels(metric.labelnames, labels)} {cumulative}")
+    return lines
+
+
+def _labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ""
+    escaped = (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in values
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped, strict=True)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class WorkerMetricsStore:
+    """Directory where every worker process publishes its metric samples."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        self._path = self.directory / f"{pid}.json"
+        if self._path.exists():
+            # A previous worker with the same process id has exited; keep its totals.
+            self._path.rename(self.directory / f"retired-{pid}-{time.time_ns()}.json")
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Atomically replace this worker's samples."""
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "w") as file:
+            json.dump(snapshot, file)
+        os.replace(temporary, self._path)
+
+    def others(self) -> list[tuple[Snapshot, bool]]:
+        """Return samples of the other workers and whether each is still running."""
+
+        collected = []
+        for path in self.directory.glob("*.json"):
+            retired = path.stem.startswith("retired-")
+            if path == self._path or not (retired or path.stem.isdigit()):
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            collected.append((snapshot, not retired and _running(int(path.stem))))
+        return collected
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry()
+
+cache_requests = registry.counter(
+    "org_catalog_cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+registry.hit_ratio(
+    "org_catalog_cache_hit_ratio",
+    "Share of cache lookups answered from the cache.",
+    cache_requests,
+    "hit",
+)
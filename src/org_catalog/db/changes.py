@@ -0,0 +1,192 @@
+"""Catalog change tracking backed by Postgres LISTEN/NOTIFY."""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.core.metrics import cache_requests
+from org_catalog.db.replicas import is_replica_session
+from org_catalog.models.catalog import CatalogVersion
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANGES_CHANNEL = "catalog_changes"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Combined change counter and last change time of a set of tables."""
+
+    version: int
+    changed_at: datetime | None
+
+
+class ChangeTracker:
+    """Keeps the last known change counter of every catalog table.
+
+    While a listener is attached, counters are updated from notifications and
+    lookups are answered from memory. Otherwise every lookup reads the counter
+    from ``catalog_versions``, which keeps callers correct at the cost of a
+    single primary key query.
+    """
+
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        self._changed_at: dict[str, datetime] = {}
+        self.listening = False
+
+    async def version(self, session: AsyncSession, table: str) -> int:
+        """Return the current change counter for the table."""
+
+        if self.listening and table in self._versions:
+            cache_requests.inc("catalog_versions", "hit")
+            return self._versions[table]
+        cache_requests.inc("catalog_versions", "miss")
+        statement = select(CatalogVersion.version).where(CatalogVersion.name == table)
+        current = await session.scalar(statement) or 0
+        self.apply(table, current)
+        return current
+
+    async def snapshot(self, session: AsyncSession, tables: Sequence[str]) -> CatalogSnapshot:
+        """Return the combined change counter and last change time of the tables.
+
+        Counters only grow, so their sum changes whenever any of the tables
+        does and never returns to an earlier value.
+        """
+
+        if self.listening and all(table in self._versions for table in tables):
+            cache_requests.inc("catalog_versions", "hit")
+            entries = [(self._versions[table], self._changed_at.get(table)) for table in tables]
+        else:
+            cache_requests.inc("catalog_versions", "miss")
+            statement = select(
+                CatalogVersion.name, CatalogVersion.version, CatalogVersion.updated_at
+            ).where(CatalogVersion.name.in_(tables))
+            rows = (await session.execute(statement)).all()
+            for table, version, changed_at in rows:
+                self.apply(table, version, changed_at)
+            entries = [(version, changed_at) for _, version, changed_at in rows]
+        moments = [changed_at for _, changed_at in entries if changed_at is not None]
+        return CatalogSnapshot(
+            version=sum(version for version, _ in entries),
+            changed_at=max(moments, default=None),
+        )
+
+    async def replayed(
+        self,
+        session: AsyncSession,
+        tables: Sequence[str],
+        version: int,
+    ) -> bool:
+        """Return whether the session reads data including changes up to ``version``.
+
+        Primary sessions always do. A replica may lag behind the counters
+        known here; since counters are bumped in the same transaction as the
+        data, it has replayed the changes once its own counters add up to
+        ``version``. Results read before that must not be cached under it.
+        """
+
+        if not is_replica_session(session):
+            return True
+        statement = select(func.coalesce(func.sum(CatalogVersion.version), 0)).where(
+            CatalogVersion.name.in_(tables)
+        )
+        return await session.scalar(statement) >= version
+
+    def apply(self, table: str, version: int, changed_at: datetime | None = None) -> None:
+        """Record a counter value, ignoring out-of-order notifications."""
+
+        if version > self._versions.get(table, -1):
+            self._versions[table] = version
+            if changed_at is None:
+                self._changed_at.pop(table, None)
+            else:
+                self._changed_at[table] = changed_at
+
+    def reset(self) -> None:
+        """Forget all known counters so they are re-read on next access."""
+
+        self._versions.clear()
+        self._changed_at.clear()
+
+
+class ChangeListener:
+    """Background connection feeding catalog notifications into a tracker."""
+
+    def __init__(
+        self,
+        tracker: ChangeTracker,
+        database_url: URL,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self._tracker = tracker
+        self._dsn = database_url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._retry_interval = retry_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start listening in a background task."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        table, _, rest = payload.partition(":")
+        version, _, changed = rest.partition(":")
+        if not table or not version.isdigit():
+            return
+        changed_at = None
+        if changed:
+            with contextlib.suppress(ValueError, OverflowError):
+                changed_at = datetime.fromtimestamp(float(changed), UTC)
+        self._tracker.apply(table, int(version), changed_at)
+
+    async def _run(self) -> None:
+        warned = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self._dsn, timeout=self._retry_interval)
+            except (OSError, TimeoutError, asyncpg.PostgresError) as exc:
+                log = logger.debug if warned else logger.warning
+                log("Catalog change listener is unavailable: %s", exc)
+                warned = True
+                await asyncio.sleep(self._retry_interval)
+                continue
+
+            terminated = asyncio.Event()
+            connection.add_termination_listener(lambda _, event=terminated: event.set())
+            try:
+                await connection.add_listener(CATALOG_CHANGES_CHANNEL, self._on_notification)
+                # Notifications may have been missed while disconnected.
+                self._tracker.reset()
+                self._tracker.listening = True
+                warned = False
+                await terminated.wait()
+                logger.warning("Catalog change listener connection lost, reconnecting.")
+            finally:
+                self._tracker.listening = False
+                with contextlib.suppress(Exception):
+                    await connection.close(timeout=self._retry_interval)
+
+
+change_tracker = ChangeTracker()
@@ -0,0 +1,132 @@
+"""Per-request SQL statement statistics and connection pool metrics."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+from org_catalog.core.metrics import Labels, registry
+
+_STARTED_KEY = "query_stats_started"
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while tracking was active, with their durations."""
+
+    executed: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def statements(self) -> int:
+        """Return the number of executed statements."""
+
+        return len(self.executed)
+
+    @property
+    def duration(self) -> float:
+        """Return total seconds spent executing statements."""
+
+        return sum(elapsed for _, elapsed in self.executed)
+
+    @property
+    def slowest(self) -> tuple[str, float] | None:
+        """Return the slowest statement and its duration in seconds."""
+
+        return max(self.executed, key=lambda executed: executed[1], default=None)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in the current context, including awaited tasks."""
+
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is not None and started:
+        stats.executed.append((statement, time.perf_counter() - started.pop()))
+
+
+def _handle_error(context) -> None:
+    started = context.connection.info.get(_STARTED_KEY) if context.connection else None
+    if _current.get() is not None and started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """Record statements of the engine into the active :func:`track_queries` block.
+
+    Outside such a block the hooks only perform a context variable lookup.
+    """
+
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+pool_wait = registry.histogram(
+    "org_catalog_db_pool_wait_seconds",
+    "Seconds spent acquiring a pooled connection, including opening new ones.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool recording how long every checkout waits."""
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection, observing the wait in ``pool_wait``."""
+
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_wait.observe(time.perf_counter() - started)
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """Publish size, checked out, idle and overflow connections of the engine's pool."""
+
+    def collect(state: str) -> dict[Labels, float]:
+        pool = engine.sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            return {}
+        values = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # The counter starts at minus the pool size and only turns positive on overflow.
+            "overflow": max(pool.overflow(), 0),
+        }
+        return {(): values[state]}
+
+    for state in ("size", "checked_out", "checked_in", "overflow"):
+        registry.gauge(
+            f"org_catalog_db_pool_{state}",
+            f"Connections of the database pool: {state.replace('_', ' ')}.",
+            (),
+            lambda state=state: collect(state),
+        )
@@ -0,0 +1,127 @@
+"""Routing of read-only sessions to streaming replicas."""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections.abc import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+#: Seconds the replica is behind the primary, or 0 when it has replayed all
+#: received WAL; a server that is not in recovery is never behind.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+#: ``Session.info`` key marking sessions that read from a replica.
+REPLICA_SESSION_INFO = "replica"
+
+
+def is_replica_session(session: AsyncSession | None) -> bool:
+    """Return whether the session reads from a replica."""
+
+    return session is not None and bool(session.info.get(REPLICA_SESSION_INFO))
+
+
+class Replica:
+    """Read-only session factory of one replica with its last known state."""
+
+    def __init__(self, engine: AsyncEngine, sessions: async_sessionmaker[AsyncSession]) -> None:
+        self.engine = engine
+        self.sessions = sessions
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.healthy = False
+        self.lag: float | None = None
+
+    async def check(self, timeout: float) -> None:
+        """Measure replication lag, marking the replica unhealthy on failure."""
+
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as connection:
+                    lag = float(await connection.scalar(REPLICA_LAG_SQL) or 0)
+        except (OSError, TimeoutError, SQLAlchemyError) as exc:
+            if self.healthy:
+                logger.warning("Replica %s is unavailable: %s", self.name, exc)
+            self.healthy = False
+            self.lag = None
+            return
+        if not self.healthy:
+            logger.info("Replica %s is available, lag %.2f s", self.name, lag)
+        self.healthy = True
+        self.lag = lag
+
+
+class ReplicaRouter:
+    """Spreads reads over healthy, sufficiently fresh replicas in turn.
+
+    Replicas are checked periodically in the background; one that fails the
+    check or lags more than ``max_lag`` seconds gets no reads until a later
+    check passes, so a client that wrote reads its changes from the primary
+    for ``max_lag`` seconds; see :func:`org_catalog.api.deps.get_db_session`.
+    Lag may grow between checks, so version-keyed caches do not
+    trust replica reads blindly; see :meth:`ChangeTracker.replayed
+    <org_catalog.db.changes.ChangeTracker.replayed>`.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+    ) -> None:
+        self.replicas = tuple(replicas)
+        self.max_lag = max_lag
+        self._check_interval = check_interval
+        self._turns = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._task: asyncio.Task[None] | None = None
+
+    def choose(self) -> async_sessionmaker[AsyncSession] | None:
+        """Return the next usable replica's session factory, or ``None`` for the primary."""
+
+        if self._turns is None:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turns)]
+            if replica.healthy and replica.lag is not None and replica.lag <= self.max_lag:
+                return replica.sessions
+        return None
+
+    async def check(self) -> None:
+        """Check every replica once."""
+
+        await asyncio.gather(*(replica.check(self._check_interval) for replica in self.replicas))
+
+    def start(self) -> None:
+        """Start periodic health checks in a background task."""
+
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop health checks and close replica connections."""
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._check_interval)
@@ -1,6 +1,7 @@
 """Database session management utilities."""
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,19 +10,92 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from org_catalog.core.config import get_settings
+from org_catalog.core.config import Settings, get_settings
+from org_catalog.db.instrumentation import (
+    InstrumentedPool,
+    instrument_engine,
+    register_pool_metrics,
+)
+from org_catalog.db.replicas import REPLICA_SESSION_INFO, Replica, ReplicaRouter
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    """Return pool and connection arguments for ``create_async_engine``.
+
+    Disconnects are detected when a statement fails, which invalidates the
+    pool, so pre-ping is off by default and ``db_pool_recycle`` retires
+    connections before servers or proxies drop them as idle.
+    """
+
+    server_settings = {}
+    if settings.db_statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+            "server_settings": server_settings,
+        },
+    }
+
+
+def read_only_sessionmaker(
+    engine: AsyncEngine,
+    replica: bool = False,
+) -> async_sessionmaker[AsyncSession]:
+    """Return a factory of sessions running ``READ ONLY`` transactions without autoflush.
+
+    asyncpg opens these transactions with ``BEGIN READ ONLY``, so the mode
+    costs no extra round trip. Sessions of a ``replica`` are marked as such
+    in ``Session.info``.
+    """
+
+    return async_sessionmaker(
+        bind=engine.execution_options(postgresql_readonly=True),
+        autoflush=False,
+        expire_on_commit=False,
+        info={REPLICA_SESSION_INFO: True} if replica else None,
+    )
+
+
+def create_replica_router(settings: Settings) -> ReplicaRouter:
+    """Return a router over the configured replicas, with engines sized like the primary."""
+
+    replicas = []
+    for url in settings.database_replica_urls:
+        replica_engine = create_async_engine(url, **engine_options(settings))
+        instrument_engine(replica_engine)
+        replicas.append(
+            Replica(replica_engine, read_only_sessionmaker(replica_engine, replica=True))
+        )
+    return ReplicaRouter(
+        replicas,
+        max_lag=settings.replica_max_lag_seconds,
+        check_interval=settings.replica_check_interval,
+    )
+
 
 settings = get_settings()
 
 engine: AsyncEngine = create_async_engine(
     settings.database_url,
-    pool_pre_ping=True,
+    poolclass=InstrumentedPool,
+    **engine_options(settings),
 )
+instrument_engine(engine)
+register_pool_metrics(engine)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
+ReadOnlySessionLocal = read_only_sessionmaker(engine)
+
+replica_router = create_replica_router(settings)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
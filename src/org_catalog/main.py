@@ -1,24 +1,128 @@
 """FastAPI application entrypoint."""
 
-from fastapi import APIRouter, Depends, FastAPI
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from org_catalog.api.routes import activities, buildings, organizations
+from fastapi import APIRouter, Depends, FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from org_catalog.api.deps import get_building_index, get_result_cache
+from org_catalog.api.middleware import MetricsMiddleware, QueryStatsMiddleware
+from org_catalog.api.routes import activities, buildings, export, geo, imports, organizations
 from org_catalog.core.config import get_settings
+from org_catalog.core.metrics import CONTENT_TYPE, WorkerMetricsStore, registry
 from org_catalog.core.security import validate_api_key
+from org_catalog.db.changes import ChangeListener, change_tracker
+from org_catalog.db.session import ReadOnlySessionLocal, engine, replica_router
 from org_catalog.schemas import HealthStatus
+from org_catalog.services.pagination import InvalidCursorError
+
+logger = logging.getLogger(__name__)
+
+QUERY_CANCELED = "57014"
+DATABASE_RETRY_AFTER = "1"
 
 
 def create_app() -> FastAPI:
     """Application factory for FastAPI."""
 
     settings = get_settings()
+    metrics_store = (
+        WorkerMetricsStore(settings.metrics_dir)
+        if settings.metrics_enabled and settings.metrics_dir
+        else None
+    )
+
+    async def publish_metrics(store: WorkerMetricsStore) -> None:
+        """Periodically share this worker's metrics with the other workers."""
+
+        while True:
+            await asyncio.sleep(settings.metrics_publish_interval)
+            store.publish(registry.snapshot())
+
+    async def warm_building_index() -> None:
+        """Load the building index before serving, leaving it to the first lookup on failure."""
+
+        building_index = get_building_index()
+        if building_index is None:
+            return
+        try:
+            async with ReadOnlySessionLocal() as session:
+                await building_index.get(session)
+        except (OSError, SQLAlchemyError) as exc:
+            logger.warning("Building index was not preloaded: %s", exc)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        listener = ChangeListener(change_tracker, engine.url)
+        if settings.listen_for_changes:
+            listener.start()
+        replica_router.start()
+        await warm_building_index()
+        publisher = None
+        if metrics_store is not None:
+            publisher = asyncio.create_task(publish_metrics(metrics_store))
+        try:
+            yield
+        finally:
+            if publisher is not None:
+                publisher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await publisher
+                metrics_store.publish(registry.snapshot())
+            await listener.stop()
+            await replica_router.stop()
+            await get_result_cache().close()
+
     app = FastAPI(
         title=settings.project_name,
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
+    if settings.debug:
+        app.add_middleware(QueryStatsMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+        """Report malformed pagination cursors as validation errors."""
+
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"detail": str(exc)},
+        )
+
+    @app.exception_handler(PoolTimeoutError)
+    async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+        """Shed load when no pooled connection frees up within the pool timeout."""
+
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database connection pool is exhausted."},
+            headers={"Retry-After": DATABASE_RETRY_AFTER},
+        )
+
+    @app.exception_handler(DBAPIError)
+    async def statement_timeout_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+        """Report statements cancelled by ``statement_timeout`` as temporary failures."""
+
+        if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+            raise exc
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database statement timed out."},
+            headers={"Retry-After": DATABASE_RETRY_AFTER},
+        )
+
     api_router = APIRouter(
         prefix="/api/v1",
         dependencies=[Depends(validate_api_key)],
@@ -26,6 +130,9 @@ def create_app() -> FastAPI:
     api_router.include_router(buildings.router)
     api_router.include_router(activities.router)
     api_router.include_router(organizations.router)
+    api_router.include_router(geo.router)
+    api_router.include_router(export.router)
+    api_router.include_router(imports.router)
 
     @app.get(
         "/health",
@@ -38,6 +145,21 @@ def create_app() -> FastAPI:
 
         return HealthStatus(status="ok")
 
+    if settings.metrics_enabled:
+
+        @app.get(
+            "/metrics",
+            response_class=Response,
+            summary="Prometheus metrics",
+            tags=["health"],
+        )
+        async def metrics() -> Response:
+            """Return metrics of all workers in the Prometheus text format."""
+
+            others = await asyncio.to_thread(metrics_store.others) if metrics_store else ()
+            content = registry.render(registry.snapshot(), others)
+            return Response(content=content, media_type=CONTENT_TYPE)
+
     app.include_router(api_router)
     return app
 
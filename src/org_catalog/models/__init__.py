@@ -2,11 +2,13 @@
 
 from org_catalog.models.activity import Activity
 from org_catalog.models.building import Building
+from org_catalog.models.catalog import CatalogVersion
 from org_catalog.models.organization import Organization, OrganizationPhone
 
 __all__ = (
     "Activity",
     "Building",
+    "CatalogVersion",
     "Organization",
     "OrganizationPhone",
 )
@@ -3,7 +3,7 @@
 
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer, String, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from org_catalog.db.base import Base
@@ -11,6 +11,28 @@ from org_catalog.db.base import Base
 if TYPE_CHECKING:
     from org_catalog.models.organization import Organization
 
+#: Number of levels in the activity hierarchy, roots included.
+MAX_ACTIVITY_DEPTH = 3
+
+activity_closure = Table(
+    "activity_closure",
+    Base.metadata,
+    Column(
+        "ancestor_id",
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "descendant_id",
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+    Column("depth", Integer, nullable=False),
+    # Enforced on every insert and move through the closure triggers.
+    CheckConstraint(f"depth < {MAX_ACTIVITY_DEPTH}", name="ck_activity_closure_depth"),
+)
+
 
 class Activity(Base):
     """Represents a hierarchical activity classification."""
@@ -23,6 +45,7 @@ class Activity(Base):
         Integer,
         ForeignKey("activities.id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
     )
 
     parent: Mapped[Optional["Activity"]] = relationship(
@@ -4,7 +4,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Float, Integer, String, func
+from sqlalchemy import DateTime, Float, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from org_catalog.db.base import Base
@@ -39,3 +39,10 @@ class Building(Base):
         back_populates="building",
         cascade="all, delete-orphan",
     )
+
+
+Index(
+    "ix_buildings_location",
+    func.point(Building.longitude, Building.latitude),
+    postgresql_using="gist",
+)
@@ -0,0 +1,23 @@
+"""Database model for catalog change counters."""
+
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from org_catalog.db.base import Base
+
+
+class CatalogVersion(Base):
+    """Change counter of a catalog table maintained by database triggers."""
+
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
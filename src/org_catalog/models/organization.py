@@ -26,6 +26,7 @@ organization_activities = Table(
         "activity_id",
         ForeignKey("activities.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     ),
 )
 
@@ -41,6 +42,7 @@ class Organization(Base):
     building_id: Mapped[int] = mapped_column(
         ForeignKey("buildings.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -2,21 +2,31 @@
 
 from org_catalog.schemas.activity import ActivityBase, ActivityTree
 from org_catalog.schemas.building import Building
+from org_catalog.schemas.bulk_import import ImportReport
+from org_catalog.schemas.geo import GeoCluster, GeoClusters
 from org_catalog.schemas.organization import (
     OrganizationBase,
     OrganizationDetailed,
     OrganizationPhone,
     OrganizationSummary,
+    OrganizationWithDistance,
 )
-from org_catalog.schemas.common import HealthStatus
+from org_catalog.schemas.common import Batch, BatchRequest, HealthStatus, Page
 
 __all__ = (
     "ActivityBase",
     "ActivityTree",
+    "Batch",
+    "BatchRequest",
     "Building",
+    "GeoCluster",
+    "GeoClusters",
+    "ImportReport",
     "OrganizationBase",
     "OrganizationDetailed",
     "OrganizationPhone",
     "OrganizationSummary",
+    "OrganizationWithDistance",
     "HealthStatus",
+    "Page",
 )
@@ -0,0 +1,16 @@
+"""Pydantic schemas for bulk import results."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ImportReport(BaseModel):
+    """Totals of a completed bulk import."""
+
+    dataset: str
+    batches: int = Field(description="Number of batches merged into the catalog.")
+    rows: int = Field(description="Number of records read from the input.")
+    inserted: int = Field(description="Rows added to the catalog.")
+    updated: int = Field(description="Existing rows whose values changed.")
+    unchanged: int = Field(description="Rows equal to stored data or repeated within a batch.")
+
+    model_config = ConfigDict(from_attributes=True)
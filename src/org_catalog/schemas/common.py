@@ -1,9 +1,14 @@
 """Shared Pydantic schemas used across the API."""
 
-from typing import Literal
+from collections.abc import Mapping, Sequence
+from typing import Generic, Literal, Self, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
+ItemT = TypeVar("ItemT")
+
+MAX_BATCH_SIZE = 100
+
 
 class HealthStatus(BaseModel):
     """Service health information."""
@@ -11,3 +16,39 @@ class HealthStatus(BaseModel):
     status: Literal["ok"] = Field(description="Current health state of the API service.")
 
     model_config = ConfigDict(json_schema_extra={"example": {"status": "ok"}})
+
+
+class Page(BaseModel, Generic[ItemT]):
+    """Single page of a keyset-paginated listing."""
+
+    items: list[ItemT]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor of the next page; null on the last page.",
+    )
+
+
+class BatchRequest(BaseModel):
+    """Identifiers to look up in one request."""
+
+    ids: list[int] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Identifiers to look up, at most {MAX_BATCH_SIZE}.",
+    )
+
+
+class Batch(BaseModel, Generic[ItemT]):
+    """Items looked up by id, with the ids that matched nothing."""
+
+    items: dict[int, ItemT] = Field(description="Found items keyed by id, in request order.")
+    missing: list[int] = Field(description="Requested ids that do not exist, in request order.")
+
+    @classmethod
+    def collect(cls, ids: Sequence[int], found: Mapping[int, ItemT]) -> Self:
+        """Return the batch answering ``ids`` from the items found by id."""
+
+        return cls(
+            items={item_id: found[item_id] for item_id in ids if item_id in found},
+            missing=[item_id for item_id in ids if item_id not in found],
+        )
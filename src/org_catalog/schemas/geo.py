@@ -0,0 +1,20 @@
+"""Pydantic schemas for aggregated map data."""
+
+from pydantic import BaseModel, Field
+
+
+class GeoCluster(BaseModel):
+    """Buildings of one grid cell collapsed into their centroid and counts."""
+
+    latitude: float = Field(description="Mean latitude of the buildings in the cell.")
+    longitude: float = Field(description="Mean longitude of the buildings in the cell.")
+    buildings: int
+    organizations: int
+
+
+class GeoClusters(BaseModel):
+    """Clusters of a map viewport at one zoom level."""
+
+    zoom: int
+    cell_degrees: float = Field(description="Side of a grid cell in degrees.")
+    clusters: list[GeoCluster]
@@ -38,3 +38,9 @@ class OrganizationDetailed(OrganizationBase):
     building: Building
     activities: list[ActivityBase]
     phones: list[OrganizationPhone]
+
+
+class OrganizationWithDistance(OrganizationDetailed):
+    """Detailed organization with distance from the requested point."""
+
+    distance_km: float
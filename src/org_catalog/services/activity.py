@@ -1,34 +1,59 @@
 """Domain services for activity operations."""
 
 
-from collections import defaultdict
-from typing import Iterable
+from collections.abc import Iterable, Sequence
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from org_catalog.models.activity import Activity
+from org_catalog.models.activity import MAX_ACTIVITY_DEPTH, Activity, activity_closure
 from org_catalog.schemas.activity import ActivityTree
-
-MAX_ACTIVITY_DEPTH = 3
+from org_catalog.services.activity_cache import ActivityTreeCache, activity_tree_cache
+from org_catalog.services.search import name_matches, name_relevance
 
 
 class ActivityService:
     """Service layer for manipulating activities."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: ActivityTreeCache = activity_tree_cache,
+    ) -> None:
         self._session = session
+        self._cache = cache
 
     async def descendant_ids(self, activity_id: int) -> list[int]:
         """Return ids for the activity and all descendants."""
 
-        base_query: Select[tuple[int]] = select(Activity.id).where(Activity.id == activity_id)
-        cte = base_query.cte(name="activity_tree", recursive=True)
-        cte = cte.union_all(
-            select(Activity.id).where(Activity.parent_id == cte.c.id),
+        hierarchy = await self._cache.get(self._session)
+        return list(hierarchy.descendants.get(activity_id, ()))
+
+    def subtree_ids_query(
+        self,
+        ancestor_ids: Sequence[int] | Select[tuple[int]],
+    ) -> Select[tuple[int]]:
+        """Return statement selecting the activities and all their descendants.
+
+        Resolved through the trigger-maintained ``activity_closure`` table with
+        an indexed lookup, so no recursion is needed on the read path.
+        """
+
+        return select(activity_closure.c.descendant_id).where(
+            activity_closure.c.ancestor_id.in_(ancestor_ids)
+        )
+
+    def subtree_ids_by_name(self, name: str) -> Sequence[int] | Select[tuple[int]]:
+        """Return statement selecting activities matching the name with descendants.
+
+        An empty name matches nothing, so no ids are returned for it.
+        """
+
+        if not name:
+            return []
+        return self.subtree_ids_query(
+            select(Activity.id).where(name_matches(Activity.name, name))
         )
-        ids_result = await self._session.scalars(select(cte.c.id))
-        return list(ids_result)
 
     async def build_tree(
         self,
@@ -37,41 +62,14 @@ class ActivityService:
     ) -> list[ActivityTree]:
         """Return activity tree up to the specified depth."""
 
-        result = await self._session.scalars(select(Activity))
-        activities = list(result)
-        adjacency: dict[int | None, list[Activity]] = defaultdict(list)
-        activity_map: dict[int, Activity] = {}
-
-        for activity in activities:
-            adjacency[activity.parent_id].append(activity)
-            activity_map[activity.id] = activity
-
-        roots: Iterable[Activity]
-        if root_id is None:
-            roots = adjacency[None]
-        else:
-            activity = activity_map.get(root_id)
-            if activity is None:
-                return []
-            roots = [activity]
-
-        def build_node(node: Activity, current_depth: int) -> ActivityTree:
-            if current_depth > max_depth:
-                msg = f"Maximum activity depth of {max_depth} exceeded."
-                raise ValueError(msg)
-            children = [
-                build_node(child, current_depth + 1) for child in adjacency.get(node.id, [])
-            ]
-            return ActivityTree.model_validate(
-                {
-                    "id": node.id,
-                    "name": node.name,
-                    "parent_id": node.parent_id,
-                    "children": children,
-                }
-            )
-
-        return [build_node(root, 1) for root in roots]
+        hierarchy = await self._cache.get(self._session)
+        return hierarchy.tree(root_id, max_depth)
+
+    async def exists(self, activity_id: int) -> bool:
+        """Return whether the activity is present in the hierarchy."""
+
+        hierarchy = await self._cache.get(self._session)
+        return activity_id in hierarchy
 
     async def get(self, activity_id: int) -> Activity | None:
         """Return a single activity by identifier."""
@@ -80,12 +78,22 @@ class ActivityService:
         result = await self._session.scalars(statement)
         return result.first()
 
+    async def get_many(self, activity_ids: Iterable[int]) -> dict[int, Activity]:
+        """Return activities keyed by id, skipping unknown ids."""
+
+        statement = select(Activity).where(Activity.id.in_(set(activity_ids)))
+        result = await self._session.scalars(statement)
+        return {activity.id: activity for activity in result}
+
     async def find_by_name(self, name: str) -> list[Activity]:
-        """Return activities matching name case-insensitively."""
+        """Return activities matching name case-insensitively, best matches first."""
 
         if not name:
             return []
-        pattern = f"%{name.lower()}%"
-        statement = select(Activity).where(func.lower(Activity.name).like(pattern))
+        statement = (
+            select(Activity)
+            .where(name_matches(Activity.name, name))
+            .order_by(*name_relevance(Activity.name, name), Activity.id)
+        )
         result = await self._session.scalars(statement)
         return list(result)
@@ -0,0 +1,119 @@
+"""Process-wide cache of the activity hierarchy."""
+
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.core.metrics import cache_requests
+from org_catalog.db.changes import ChangeTracker, change_tracker
+from org_catalog.models.activity import Activity
+from org_catalog.schemas.activity import ActivityTree
+
+ACTIVITIES_TABLE = Activity.__tablename__
+
+
+class ActivityHierarchy:
+    """Immutable snapshot of the activity tree with precomputed lookups."""
+
+    def __init__(self, version: int, rows: Iterable[tuple[int, str, int | None]]) -> None:
+        self.version = version
+        self.children: dict[int | None, list[int]] = defaultdict(list)
+        names: dict[int, str] = {}
+        parents: dict[int, int | None] = {}
+        for activity_id, name, parent_id in rows:
+            names[activity_id] = name
+            parents[activity_id] = parent_id
+            self.children[parent_id].append(activity_id)
+
+        self.roots: tuple[int, ...] = tuple(self.children.get(None, ()))
+        self.descendants: dict[int, tuple[int, ...]] = {}
+        self.heights: dict[int, int] = {}
+        self.subtrees: dict[int, ActivityTree] = {}
+
+        # Iterative post-order walk so every node is built after its children.
+        stack: list[tuple[int, bool]] = [(root, False) for root in reversed(self.roots)]
+        while stack:
+            node, expanded = stack.pop()
+            child_ids = self.children.get(node, [])
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(child_ids))
+                continue
+            descendants = [node]
+            for child in child_ids:
+                descendants.extend(self.descendants[child])
+            self.descendants[node] = tuple(descendants)
+            self.heights[node] = 1 + max((self.heights[child] for child in child_ids), default=0)
+            self.subtrees[node] = ActivityTree.model_validate(
+                {
+                    "id": node,
+                    "name": names[node],
+                    "parent_id": parents[node],
+                    "children": [self.subtrees[child] for child in child_ids],
+                }
+            )
+
+    def __contains__(self, activity_id: int) -> bool:
+        """Return whether the activity is part of the hierarchy."""
+
+        return activity_id in self.subtrees
+
+    def tree(self, root_id: int | None, max_depth: int) -> list[ActivityTree]:
+        """Return prebuilt subtrees, enforcing the maximum depth."""
+
+        if root_id is None:
+            roots = self.roots
+        elif root_id in self.subtrees:
+            roots = (root_id,)
+        else:
+            return []
+        if any(self.heights[root] > max_depth for root in roots):
+            msg = f"Maximum activity depth of {max_depth} exceeded."
+            raise ValueError(msg)
+        return [self.subtrees[root] for root in roots]
+
+
+class ActivityTreeCache:
+    """Holds the latest hierarchy snapshot and reloads it when activities change.
+
+    A hierarchy read from a replica behind the current version serves the
+    request but is not kept.
+    """
+
+    def __init__(self, tracker: ChangeTracker) -> None:
+        self._tracker = tracker
+        self._snapshot: ActivityHierarchy | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> ActivityHierarchy:
+        """Return the hierarchy snapshot matching the current activities version."""
+
+        version = await self._tracker.version(session, ACTIVITIES_TABLE)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            cache_requests.inc("activity_tree", "hit")
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                cache_requests.inc("activity_tree", "miss")
+                replayed = await self._tracker.replayed(session, [ACTIVITIES_TABLE], version)
+                result = await session.execute(
+                    select(Activity.id, Activity.name, Activity.parent_id).order_by(Activity.id)
+                )
+                snapshot = ActivityHierarchy(version, result.all())
+                if replayed:
+                    self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot."""
+
+        self._snapshot = None
+
+
+activity_tree_cache = ActivityTreeCache(change_tracker)
@@ -0,0 +1,220 @@
+"""Process-wide grid index of building coordinates."""
+
+
+import asyncio
+import math
+from array import array
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.core.config import Settings
+from org_catalog.core.metrics import cache_requests
+from org_catalog.db.changes import ChangeTracker, change_tracker
+from org_catalog.models.building import Building
+from org_catalog.services.geolocation import bounding_box, distances_within_radius_km
+
+BUILDINGS_TABLE = Building.__tablename__
+DEFAULT_CELL_DEGREES = 0.05
+
+Cell = tuple[int, int]
+
+
+class BuildingGrid:
+    """Building coordinates bucketed into cells of a fixed-size degree grid.
+
+    Coordinates and ids live in parallel ``array`` columns indexed by slot;
+    every cell holds the slots of its buildings. Removing a building moves
+    the last slot into the freed one, so the columns stay dense.
+    """
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES) -> None:
+        self.cell_degrees = cell_degrees
+        self._ids = array("q")
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._slots: dict[int, int] = {}
+        self._cells: dict[Cell, array] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed buildings."""
+
+        return len(self._ids)
+
+    def __contains__(self, building_id: int) -> bool:
+        """Return whether the building is indexed."""
+
+        return building_id in self._slots
+
+    def upsert(self, building_id: int, latitude: float, longitude: float) -> None:
+        """Add the building or move it to new coordinates."""
+
+        slot = self._slots.get(building_id)
+        if slot is None:
+            slot = len(self._ids)
+            self._slots[building_id] = slot
+            self._ids.append(building_id)
+            self._latitudes.append(latitude)
+            self._longitudes.append(longitude)
+        else:
+            self._cells[self._cell_of(slot)].remove(slot)
+            self._latitudes[slot] = latitude
+            self._longitudes[slot] = longitude
+        self._cells.setdefault(self._cell_of(slot), array("l")).append(slot)
+
+    def remove(self, building_id: int) -> None:
+        """Drop the building if it is indexed."""
+
+        slot = self._slots.pop(building_id, None)
+        if slot is None:
+            return
+        self._discard_from_cell(slot)
+        last = len(self._ids) - 1
+        if slot != last:
+            self._discard_from_cell(last)
+            moved_id = self._ids[last]
+            self._ids[slot] = moved_id
+            self._latitudes[slot] = self._latitudes[last]
+            self._longitudes[slot] = self._longitudes[last]
+            self._slots[moved_id] = slot
+            self._cells.setdefault(self._cell_of(slot), array("l")).append(slot)
+        del self._ids[last], self._latitudes[last], self._longitudes[last]
+
+    def in_rectangle(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+    ) -> list[int]:
+        """Return ids of buildings inside the box, bounds included."""
+
+        latitudes, longitudes, ids = self._latitudes, self._longitudes, self._ids
+        return [
+            ids[slot]
+            for slot in self._candidates(min_latitude, max_latitude, min_longitude, max_longitude)
+            if min_latitude <= latitudes[slot] <= max_latitude
+            and min_longitude <= longitudes[slot] <= max_longitude
+        ]
+
+    def in_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+    ) -> tuple[list[int], list[float]]:
+        """Return ids of buildings within the radius and their distances in km."""
+
+        slots = list(self._candidates(*bounding_box(latitude, longitude, radius_km)))
+        distances, inside = distances_within_radius_km(
+            latitude,
+            longitude,
+            [self._latitudes[slot] for slot in slots],
+            [self._longitudes[slot] for slot in slots],
+            radius_km,
+        )
+        found = [index for index, matched in enumerate(inside) if matched]
+        return [self._ids[slots[index]] for index in found], [distances[index] for index in found]
+
+    def _candidates(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+    ) -> Iterable[int]:
+        """Yield slots of buildings in cells overlapping the box."""
+
+        low_row, low_column = self._cell(min_latitude, min_longitude)
+        high_row, high_column = self._cell(max_latitude, max_longitude)
+        spanned = (high_row - low_row + 1) * (high_column - low_column + 1)
+        if spanned <= len(self._cells):
+            for row in range(low_row, high_row + 1):
+                for column in range(low_column, high_column + 1):
+                    yield from self._cells.get((row, column), ())
+            return
+        # A box wider than the occupied area is cheaper to answer cell by cell.
+        for (row, column), slots in self._cells.items():
+            if low_row <= row <= high_row and low_column <= column <= high_column:
+                yield from slots
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def _cell_of(self, slot: int) -> Cell:
+        return self._cell(self._latitudes[slot], self._longitudes[slot])
+
+    def _discard_from_cell(self, slot: int) -> None:
+        cell = self._cell_of(slot)
+        slots = self._cells[cell]
+        slots.remove(slot)
+        if not slots:
+            del self._cells[cell]
+
+
+class BuildingIndex:
+    """Keeps a building grid in step with the ``buildings`` table.
+
+    The grid is rebuilt from a single scan of the table whenever the
+    buildings change counter moves. Writes of any kind bump the counter,
+    including raw SQL and ``COPY`` imports, so no change can be missed. A
+    grid read from a replica behind the current version serves the lookup
+    but is not kept.
+    """
+
+    def __init__(
+        self,
+        tracker: ChangeTracker,
+        cell_degrees: float = DEFAULT_CELL_DEGREES,
+    ) -> None:
+        self._tracker = tracker
+        self._cell_degrees = cell_degrees
+        self._grid: BuildingGrid | None = None
+        self._version: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> BuildingGrid:
+        """Return the grid matching the current buildings version."""
+
+        version = await self._tracker.version(session, BUILDINGS_TABLE)
+        grid = self._grid
+        if grid is not None and self._version == version:
+            cache_requests.inc("building_index", "hit")
+            return grid
+        async with self._lock:
+            grid = self._grid
+            if grid is None or self._version != version:
+                cache_requests.inc("building_index", "miss")
+                replayed = await self._tracker.replayed(session, [BUILDINGS_TABLE], version)
+                grid = await self._load(session)
+                if replayed:
+                    self._grid = grid
+                    self._version = version
+        return grid
+
+    def invalidate(self) -> None:
+        """Drop the grid so the next lookup rebuilds it."""
+
+        self._grid = None
+        self._version = None
+
+    async def _load(self, session: AsyncSession) -> BuildingGrid:
+        """Return a grid of every building."""
+
+        grid = BuildingGrid(self._cell_degrees)
+        statement = select(Building.id, Building.latitude, Building.longitude)
+        for building_id, latitude, longitude in await session.execute(statement):
+            grid.upsert(building_id, latitude, longitude)
+        return grid
+
+
+def create_building_index(settings: Settings) -> BuildingIndex | None:
+    """Return building index configured from application settings, if enabled."""
+
+    if not settings.building_index_enabled:
+        return None
+    return BuildingIndex(change_tracker, settings.building_index_cell_degrees)
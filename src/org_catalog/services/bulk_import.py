@@ -0,0 +1,428 @@
+"""Bulk loading of catalog data through ``COPY`` into staging tables and upserts."""
+
+
+import csv
+import json
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class ImportDataset(StrEnum):
+    """Kinds of records accepted by the bulk import."""
+
+    BUILDINGS = "buildings"
+    ORGANIZATIONS = "organizations"
+    PHONES = "phones"
+    ACTIVITY_LINKS = "activity_links"
+
+
+class ImportFormat(StrEnum):
+    """Input formats of the bulk import."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class InvalidImportError(ValueError):
+    """Raised when import input cannot be parsed or violates catalog constraints."""
+
+
+@dataclass(frozen=True)
+class ImportColumn:
+    """Column of an import target and the conversion of its input values."""
+
+    name: str
+    kind: Callable[[Any], Any]
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    """Table receiving a dataset and how incoming rows are merged into it."""
+
+    table: str
+    columns: tuple[ImportColumn, ...]
+    key: tuple[str, ...]
+    #: Whether rows carry explicit ids, so the id sequence must be moved past them.
+    explicit_ids: bool = False
+    #: Whether the table has an ``updated_at`` column to touch on changes.
+    touch: bool = False
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Return names of all imported columns."""
+
+        return tuple(column.name for column in self.columns)
+
+    @property
+    def updated(self) -> tuple[str, ...]:
+        """Return names of columns overwritten when the key already exists."""
+
+        return tuple(name for name in self.names if name not in self.key)
+
+
+def _integer(value: Any) -> int:
+    """Convert an input value to ``int``, rejecting booleans and fractional numbers."""
+
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{value!r} is not an integer")
+    return int(value)
+
+
+def _coordinate(limit: float) -> Callable[[Any], float]:
+    """Return a converter to ``float`` accepting only values within ``±limit``.
+
+    NaN and infinities fall outside every range and are rejected as well.
+    """
+
+    def convert(value: Any) -> float:
+        if isinstance(value, bool):
+            raise ValueError(f"{value!r} is not a number")
+        number = float(value)
+        if not -limit <= number <= limit:
+            raise ValueError(f"{value!r} is not within ±{limit:g}")
+        return number
+
+    return convert
+
+
+TARGETS: dict[ImportDataset, ImportTarget] = {
+    ImportDataset.BUILDINGS: ImportTarget(
+        table="buildings",
+        columns=(
+            ImportColumn("id", _integer),
+            ImportColumn("name", str),
+            ImportColumn("address", str),
+            ImportColumn("latitude", _coordinate(90.0)),
+            ImportColumn("longitude", _coordinate(180.0)),
+        ),
+        key=("id",),
+        explicit_ids=True,
+        touch=True,
+    ),
+    ImportDataset.ORGANIZATIONS: ImportTarget(
+        table="organizations",
+        columns=(
+            ImportColumn("id", _integer),
+            ImportColumn("name", str),
+            ImportColumn("description", str, nullable=True),
+            ImportColumn("building_id", _integer),
+        ),
+        key=("id",),
+        explicit_ids=True,
+        touch=True,
+    ),
+    ImportDataset.PHONES: ImportTarget(
+        table="organization_phones",
+        columns=(
+            ImportColumn("organization_id", _integer),
+            ImportColumn("number", str),
+            ImportColumn("label", str, nullable=True),
+        ),
+        key=("organization_id", "number"),
+    ),
+    ImportDataset.ACTIVITY_LINKS: ImportTarget(
+        table="organization_activities",
+        columns=(
+            ImportColumn("organization_id", _integer),
+            ImportColumn("activity_id", _integer),
+        ),
+        key=("organization_id", "activity_id"),
+    ),
+}
+
+
+@dataclass
+class ImportProgress:
+    """Running totals of an import, updated after every merged batch."""
+
+    dataset: ImportDataset
+    batches: int = 0
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def unchanged(self) -> int:
+        """Return rows that matched existing data or repeated a key of their batch."""
+
+        return self.rows - self.inserted - self.updated
+
+
+def merge_sql(target: ImportTarget, staging: str) -> str:
+    """Return the statement upserting staged rows and counting inserts and updates.
+
+    The last staged row wins when a batch repeats a key. Rows equal to the
+    stored ones are skipped, so re-importing unchanged data writes nothing.
+    """
+
+    columns = ", ".join(target.names)
+    key = ", ".join(target.key)
+    if target.updated:
+        assignments = [f"{name} = EXCLUDED.{name}" for name in target.updated]
+        if target.touch:
+            assignments.append("updated_at = now()")
+        stored = ", ".join(f"target.{name}" for name in target.updated)
+        incoming = ", ".join(f"EXCLUDED.{name}" for name in target.updated)
+        action = (
+            f"DO UPDATE SET {', '.join(assignments)} "
+            f"WHERE ROW({stored}) IS DISTINCT FROM ROW({incoming})"
+        )
+    else:
+        action = "DO NOTHING"
+    # xmax is zero only for freshly inserted row versions.
+    return f"""
+        WITH merged AS (
+            INSERT INTO {target.table} AS target ({columns})
+            SELECT DISTINCT ON ({key}) {columns} FROM {staging}
+            ORDER BY {key}, position DESC
+            ON CONFLICT ({key}) {action}
+            RETURNING xmax = 0 AS inserted
+        )
+        SELECT
+            count(*) FILTER (WHERE inserted) AS inserted,
+            count(*) FILTER (WHERE NOT inserted) AS updated
+        FROM merged
+    """
+
+
+async def _lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[str]]:
+    """Split a byte stream into decoded lines, keeping line endings.
+
+    Lines are yielded per input chunk to keep per-row overhead low.
+    """
+
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        complete, newline, buffer = buffer.rpartition(b"\n")
+        if newline:
+            yield [line + "\n" for line in _decode(complete).split("\n")]
+    if buffer.strip():
+        yield [_decode(buffer)]
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise InvalidImportError("Input must be UTF-8 encoded.") from exc
+
+
+class _LineFeed:
+    """Iterator handing buffered lines to ``csv.reader`` and tracking how far it read."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.consumed = 0
+        #: Set once the reader asked for a line past the buffered ones.
+        self.exhausted = False
+
+    def __iter__(self) -> "_LineFeed":
+        """Return the feed itself."""
+
+        return self
+
+    def __next__(self) -> str:
+        """Return the next buffered line."""
+
+        if self.consumed == len(self.lines):
+            self.exhausted = True
+            raise StopIteration
+        line = self.lines[self.consumed]
+        self.consumed += 1
+        return line
+
+
+async def _csv_records(lines: AsyncIterable[list[str]]) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield CSV records as dicts keyed by the header row.
+
+    A record still open when a chunk's lines run out is parsed again together
+    with the next chunk, so quoted fields may span chunk boundaries.
+    """
+
+    header: list[str] | None = None
+    pending: list[str] = []
+    async for chunk in lines:
+        feed = _LineFeed(pending + chunk)
+        pending = []
+        start = 0
+        parsed = []
+        for values in csv.reader(feed):
+            if feed.exhausted:
+                # The reader ran out of lines inside a quoted field.
+                pending = feed.lines[start:]
+                break
+            start = feed.consumed
+            if not values:
+                continue
+            if header is None:
+                header = values
+                continue
+            if len(values) != len(header):
+                raise InvalidImportError(
+                    f"Expected {len(header)} CSV fields, got {len(values)}: {values!r}."
+                )
+            parsed.append(dict(zip(header, values, strict=True)))
+        yield parsed
+    if pending:
+        raise InvalidImportError("CSV input ends inside a quoted field.")
+
+
+async def _ndjson_records(lines: AsyncIterable[list[str]]) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield JSON objects of non-blank lines."""
+
+    async for chunk in lines:
+        parsed = []
+        for line in chunk:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise InvalidImportError(f"Invalid JSON line: {exc}.") from exc
+            if not isinstance(record, dict):
+                raise InvalidImportError("Every NDJSON line must be an object.")
+            parsed.append(record)
+        yield parsed
+
+
+def _convert(target: ImportTarget, record: dict[str, Any], number: int) -> tuple[Any, ...]:
+    """Return the record as a row of the target's columns."""
+
+    unknown = record.keys() - set(target.names)
+    if unknown:
+        raise InvalidImportError(f"Record {number}: unknown fields {sorted(unknown)}.")
+    row = []
+    for column in target.columns:
+        value = record.get(column.name)
+        if value is None or value == "":
+            if not column.nullable:
+                raise InvalidImportError(f"Record {number}: {column.name} is required.")
+            row.append(None)
+            continue
+        try:
+            row.append(column.kind(value))
+        except (TypeError, ValueError) as exc:
+            raise InvalidImportError(
+                f"Record {number}: invalid {column.name} {value!r}."
+            ) from exc
+    return tuple(row)
+
+
+class ImportService:
+    """Loads large datasets with ``COPY`` and merges them with set-based upserts.
+
+    Rows are parsed in batches and copied into a temporary staging table with
+    the binary ``COPY`` protocol. Each batch is then merged into the target by
+    a single ``INSERT ... ON CONFLICT`` statement. The whole import runs in one
+    transaction, so a failure leaves the catalog untouched.
+    """
+
+    def __init__(self, session: AsyncSession, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self._session = session
+        self._batch_size = batch_size
+
+    async def load(
+        self,
+        dataset: ImportDataset,
+        import_format: ImportFormat,
+        chunks: AsyncIterable[bytes],
+        on_batch: Callable[[ImportProgress], None] | None = None,
+    ) -> ImportProgress:
+        """Import the byte stream and return the totals.
+
+        ``on_batch`` is called with the running totals after every batch.
+        """
+
+        target = TARGETS[dataset]
+        staging = f"import_{dataset}"
+        parse = _csv_records if import_format is ImportFormat.CSV else _ndjson_records
+        progress = ImportProgress(dataset)
+        try:
+            # Merging large batches may take longer than an interactive statement.
+            await self._session.execute(text("SET LOCAL statement_timeout = 0"))
+            await self._session.execute(
+                text(
+                    f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(target.names)} FROM {target.table} WITH NO DATA"
+                )
+            )
+            await self._session.execute(
+                text(
+                    f"ALTER TABLE {staging} "
+                    "ADD COLUMN position bigint GENERATED ALWAYS AS IDENTITY"
+                )
+            )
+            batch: list[tuple[Any, ...]] = []
+            number = 0
+            async for records in parse(_lines(chunks)):
+                for record in records:
+                    number += 1
+                    batch.append(_convert(target, record, number))
+                    if len(batch) >= self._batch_size:
+                        await self._merge(target, staging, batch, progress, on_batch)
+                        batch = []
+            if batch:
+                await self._merge(target, staging, batch, progress, on_batch)
+            if target.explicit_ids:
+                await self._session.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{target.table}', 'id'), "
+                        f"coalesce(max(id), 0) + 1, false) FROM {target.table}"
+                    )
+                )
+            await self._session.commit()
+        except (IntegrityError, DataError) as exc:
+            await self._session.rollback()
+            raise InvalidImportError(str(exc.orig)) from exc
+        except (asyncpg.IntegrityConstraintViolationError, asyncpg.DataError) as exc:
+            await self._session.rollback()
+            raise InvalidImportError(str(exc)) from exc
+        except BaseException:
+            await self._session.rollback()
+            raise
+        return progress
+
+    async def _merge(
+        self,
+        target: ImportTarget,
+        staging: str,
+        rows: list[tuple[Any, ...]],
+        progress: ImportProgress,
+        on_batch: Callable[[ImportProgress], None] | None,
+    ) -> None:
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            staging, records=rows, columns=target.names
+        )
+        merged = (await self._session.execute(text(merge_sql(target, staging)))).one()
+        await self._session.execute(text(f"TRUNCATE {staging}"))
+
+        progress.batches += 1
+        progress.rows += len(rows)
+        progress.inserted += merged.inserted
+        progress.updated += merged.updated
+        logger.info(
+            "Imported batch %d of %s: %d rows, %d inserted, %d updated",
+            progress.batches,
+            progress.dataset,
+            len(rows),
+            merged.inserted,
+            merged.updated,
+        )
+        if on_batch is not None:
+            on_batch(progress)
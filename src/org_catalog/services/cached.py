@@ -0,0 +1,429 @@
+"""Read services returning serialized responses through the shared result cache."""
+
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import astuple, replace
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.models.activity import Activity
+from org_catalog.models.building import Building as BuildingModel
+from org_catalog.models.organization import (
+    Organization,
+    OrganizationPhone,
+    organization_activities,
+)
+from org_catalog.schemas.building import Building
+from org_catalog.schemas.common import Batch, Page
+from org_catalog.schemas.geo import GeoClusters
+from org_catalog.schemas.organization import OrganizationDetailed, OrganizationWithDistance
+from org_catalog.services.activity import ActivityService
+from org_catalog.services.clustering import ClusterService
+from org_catalog.services.conversion import OrganizationConverter
+from org_catalog.services.geolocation import haversine_distances_km
+from org_catalog.services.organization import (
+    BuildingService,
+    GeoOrdering,
+    OrganizationFilters,
+    OrganizationService,
+)
+from org_catalog.services.pagination import KeysetPage, PageRequest
+from org_catalog.services.result_cache import ResultCache
+
+ResultT = TypeVar("ResultT")
+
+BUILDING_TABLES = (BuildingModel.__tablename__,)
+ACTIVITY_TABLES = (Activity.__tablename__,)
+# Clusters count buildings and the organizations located in them.
+GEO_TABLES = (BuildingModel.__tablename__, Organization.__tablename__)
+# Organization payloads embed their building, phones and activities.
+ORGANIZATION_TABLES = (
+    Organization.__tablename__,
+    OrganizationPhone.__tablename__,
+    organization_activities.name,
+    BuildingModel.__tablename__,
+    Activity.__tablename__,
+)
+
+_organization = TypeAdapter(OrganizationDetailed | None)
+_organization_page = TypeAdapter(Page[OrganizationDetailed])
+_organization_batch = TypeAdapter(Batch[OrganizationDetailed])
+_organization_distance_line = TypeAdapter(OrganizationWithDistance)
+_organization_distance_page = TypeAdapter(Page[OrganizationWithDistance])
+_organizations_with_distance = TypeAdapter(list[OrganizationWithDistance])
+# Sparse fieldsets are plain dicts whose values are serialized by type.
+_sparse = TypeAdapter(Any)
+_geo_clusters = TypeAdapter(GeoClusters)
+_building = TypeAdapter(Building | None)
+_buildings = TypeAdapter(list[Building])
+_building_batch = TypeAdapter(Batch[Building])
+
+
+def _page_arguments(page: PageRequest) -> list[Any]:
+    return [page.limit, list(page.after) if page.after is not None else None]
+
+
+def _unless_null(payload: bytes) -> bytes | None:
+    return None if payload == b"null" else payload
+
+
+class CachedOrganizationService:
+    """Organization lookups returning JSON, served from the result cache when possible.
+
+    Results are validated once, when ORM objects are converted to response
+    schemas, and serialized straight to bytes that routes send unchanged.
+    With ``fields``, items are dicts of the selected fields instead and the
+    services are expected to load only those.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: ResultCache,
+        service: OrganizationService,
+        joined_service: OrganizationService,
+        activity_service: ActivityService,
+        fields: frozenset[str] | None = None,
+    ) -> None:
+        self._session = session
+        self._cache = cache
+        self._service = service
+        self._joined_service = joined_service
+        self._activity_service = activity_service
+        self._fields = fields
+
+    async def get(self, organization_id: int) -> bytes | None:
+        """Return organization by id, or ``None`` when it does not exist."""
+
+        async def compute() -> OrganizationDetailed | dict[str, Any] | None:
+            organization = await self._joined_service.get(organization_id)
+            if organization is None:
+                return None
+            return self._converter().convert(organization)
+
+        return _unless_null(await self._fetch("get", [organization_id], _organization, compute))
+
+    async def get_many(self, organization_ids: Sequence[int]) -> bytes:
+        """Return organizations keyed by id, listing the ids that do not exist."""
+
+        ids = list(dict.fromkeys(organization_ids))
+
+        async def compute() -> Batch[Any]:
+            found = await self._service.get_many(ids)
+            converter = self._converter()
+            items = {org_id: converter.convert(org) for org_id, org in found.items()}
+            if self._fields is None:
+                return Batch[OrganizationDetailed].collect(ids, items)
+            return Batch[dict[str, Any]].collect(ids, items)
+
+        return await self._fetch("get_many", ids, _organization_batch, compute)
+
+    async def by_building(self, building_id: int, page: PageRequest = PageRequest()) -> bytes:
+        """Return organizations located in the building."""
+
+        async def compute() -> Page[Any]:
+            return self._convert_page(await self._service.by_building(building_id, page))
+
+        arguments = [building_id, *_page_arguments(page)]
+        return await self._fetch("by_building", arguments, _organization_page, compute)
+
+    async def by_activity(self, activity_id: int, page: PageRequest = PageRequest()) -> bytes:
+        """Return organizations linked to the activity or any of its descendants."""
+
+        async def compute() -> Page[Any]:
+            activity_ids = self._activity_service.subtree_ids_query([activity_id])
+            return self._convert_page(await self._service.by_activity_ids(activity_ids, page))
+
+        arguments = [activity_id, *_page_arguments(page)]
+        return await self._fetch("by_activity", arguments, _organization_page, compute)
+
+    async def by_activity_name(self, name: str, page: PageRequest = PageRequest()) -> bytes:
+        """Return organizations linked to activity subtrees matching the name."""
+
+        async def compute() -> Page[Any]:
+            activity_ids = self._activity_service.subtree_ids_by_name(name)
+            return self._convert_page(await self._service.by_activity_ids(activity_ids, page))
+
+        arguments = [name, *_page_arguments(page)]
+        return await self._fetch("by_activity_name", arguments, _organization_page, compute)
+
+    async def search_by_name(self, query: str, page: PageRequest = PageRequest()) -> bytes:
+        """Return organizations matching the name query, best matches first."""
+
+        async def compute() -> Page[Any]:
+            return self._convert_page(await self._service.search_by_name(query, page))
+
+        arguments = [query, *_page_arguments(page)]
+        return await self._fetch("search_by_name", arguments, _organization_page, compute)
+
+    async def search(
+        self,
+        filters: OrganizationFilters,
+        page: PageRequest = PageRequest(),
+    ) -> bytes:
+        """Return organizations matching all filters.
+
+        Activities listed in ``filters.activity_ids`` match together with
+        their descendants.
+        """
+
+        activity_ids = filters.activity_ids
+        if isinstance(activity_ids, Select):
+            raise ValueError("Cached searches take activity ids, not statements.")
+
+        async def compute() -> Page[Any]:
+            expanded = filters
+            if activity_ids is not None:
+                subtree_ids = self._activity_service.subtree_ids_query(activity_ids)
+                expanded = replace(filters, activity_ids=subtree_ids)
+            return self._convert_page(await self._service.search(expanded, page))
+
+        key = filters
+        if activity_ids is not None:
+            key = replace(filters, activity_ids=sorted(activity_ids))
+        arguments = [*astuple(key), *_page_arguments(page)]
+        return await self._fetch("search", arguments, _organization_page, compute)
+
+    async def in_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        page: PageRequest = PageRequest(),
+        order_by: GeoOrdering = GeoOrdering.DISTANCE,
+    ) -> bytes:
+        """Return organizations within the radius with distances, nearest first by default."""
+
+        async def compute() -> Page[Any]:
+            found = await self._service.in_radius(latitude, longitude, radius_km, page, order_by)
+            converter = self._converter()
+            return self._page(
+                OrganizationWithDistance,
+                [
+                    converter.convert(org, OrganizationWithDistance, distance_km=distance)
+                    for org, distance in found.items
+                ],
+                found.next_cursor,
+            )
+
+        arguments = [latitude, longitude, radius_km, order_by, *_page_arguments(page)]
+        return await self._fetch("in_radius", arguments, _organization_distance_page, compute)
+
+    async def in_rectangle(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        latitude: float,
+        longitude: float,
+        page: PageRequest = PageRequest(),
+        order_by: GeoOrdering = GeoOrdering.ID,
+    ) -> bytes:
+        """Return organizations within the bounding box with distances from the point."""
+
+        bounds = [min_latitude, max_latitude, min_longitude, max_longitude]
+        nearest_to = (latitude, longitude) if order_by is GeoOrdering.DISTANCE else None
+
+        async def compute() -> Page[Any]:
+            found = await self._service.in_rectangle(*bounds, page, nearest_to)
+            items = await self._with_distances(found.items, latitude, longitude)
+            return self._page(OrganizationWithDistance, items, found.next_cursor)
+
+        arguments = [*bounds, latitude, longitude, order_by, *_page_arguments(page)]
+        return await self._fetch("in_rectangle", arguments, _organization_distance_page, compute)
+
+    async def stream_in_rectangle(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        latitude: float,
+        longitude: float,
+        after: tuple[int | float, ...] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield all organizations within the bounding box, with distances, as NDJSON chunks.
+
+        Streams bypass the result cache: they exist for results too large to
+        hold in memory at once.
+        """
+
+        line = _organization_distance_line if self._fields is None else _sparse
+        batches = self._service.stream_in_rectangle(
+            min_latitude, max_latitude, min_longitude, max_longitude, after
+        )
+        async for batch in batches:
+            items = await self._with_distances(batch, latitude, longitude)
+            yield b"".join(line.dump_json(item) + b"\n" for item in items)
+
+    async def nearest(self, latitude: float, longitude: float, limit: int) -> bytes:
+        """Return the closest organizations with distances, nearest first."""
+
+        async def compute() -> list[OrganizationWithDistance | dict[str, Any]]:
+            nearest = await self._service.nearest(latitude, longitude, limit)
+            converter = self._converter()
+            return [
+                converter.convert(org, OrganizationWithDistance, distance_km=distance)
+                for org, distance in nearest
+            ]
+
+        arguments = [latitude, longitude, limit]
+        return await self._fetch("nearest", arguments, _organizations_with_distance, compute)
+
+    def _converter(self) -> OrganizationConverter:
+        return OrganizationConverter(self._fields)
+
+    def _page(
+        self, schema: type[OrganizationDetailed], items: list[Any], cursor: str | None
+    ) -> Page[Any]:
+        """Return the response envelope typed for detailed or sparse items."""
+
+        envelope = Page[schema] if self._fields is None else Page[dict[str, Any]]
+        return envelope(items=items, next_cursor=cursor)
+
+    def _convert_page(self, page: KeysetPage[Organization]) -> Page[Any]:
+        """Convert a page of ORM organizations to the response envelope."""
+
+        converter = self._converter()
+        items = [converter.convert(org) for org in page.items]
+        return self._page(OrganizationDetailed, items, page.next_cursor)
+
+    async def _with_distances(
+        self,
+        organizations: Sequence[Organization],
+        latitude: float,
+        longitude: float,
+    ) -> list[OrganizationWithDistance | dict[str, Any]]:
+        """Convert organizations, adding distances (km) from the point to their buildings.
+
+        Coordinates come from the loaded buildings, or from one extra query
+        when the selected fields leave buildings out.
+        """
+
+        if self._fields is None or "building" in self._fields:
+            coordinates = [(org.building.latitude, org.building.longitude) for org in organizations]
+        else:
+            by_id = await self._service.building_coordinates(
+                org.building_id for org in organizations
+            )
+            coordinates = [by_id[org.building_id] for org in organizations]
+        distances = haversine_distances_km(
+            latitude,
+            longitude,
+            [lat for lat, _ in coordinates],
+            [lon for _, lon in coordinates],
+        )
+        converter = self._converter()
+        return [
+            converter.convert(org, OrganizationWithDistance, distance_km=distance)
+            for org, distance in zip(organizations, distances, strict=True)
+        ]
+
+    async def _fetch(
+        self,
+        method: str,
+        arguments: Sequence[Any],
+        adapter: TypeAdapter[ResultT],
+        compute: Callable[[], Awaitable[ResultT]],
+    ) -> bytes:
+        if self._fields is not None:
+            arguments = [*arguments, sorted(self._fields)]
+            adapter = _sparse
+        return await self._cache.fetch(
+            self._session,
+            f"organizations.{method}",
+            ORGANIZATION_TABLES,
+            arguments,
+            adapter,
+            compute,
+        )
+
+
+class CachedBuildingService:
+    """Building lookups returning JSON, served from the result cache when possible."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: ResultCache,
+        service: BuildingService,
+    ) -> None:
+        self._session = session
+        self._cache = cache
+        self._service = service
+
+    async def list(self) -> bytes:
+        """Return all buildings."""
+
+        async def compute() -> list[Building]:
+            return [Building.model_validate(building) for building in await self._service.list()]
+
+        return await self._cache.fetch(
+            self._session, "buildings.list", BUILDING_TABLES, [], _buildings, compute
+        )
+
+    async def get(self, building_id: int) -> bytes | None:
+        """Return building by id, or ``None`` when it does not exist."""
+
+        async def compute() -> Building | None:
+            building = await self._service.get(building_id)
+            return None if building is None else Building.model_validate(building)
+
+        return _unless_null(
+            await self._cache.fetch(
+                self._session, "buildings.get", BUILDING_TABLES, [building_id], _building, compute
+            )
+        )
+
+    async def get_many(self, building_ids: Sequence[int]) -> bytes:
+        """Return buildings keyed by id, listing the ids that do not exist."""
+
+        ids = list(dict.fromkeys(building_ids))
+
+        async def compute() -> Batch[Building]:
+            found = await self._service.get_many(ids)
+            return Batch[Building].collect(
+                ids,
+                {building_id: Building.model_validate(b) for building_id, b in found.items()},
+            )
+
+        return await self._cache.fetch(
+            self._session, "buildings.get_many", BUILDING_TABLES, ids, _building_batch, compute
+        )
+
+
+class CachedClusterService:
+    """Map clusters returning JSON, served from the result cache when possible."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: ResultCache,
+        service: ClusterService,
+    ) -> None:
+        self._session = session
+        self._cache = cache
+        self._service = service
+
+    async def clusters(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        zoom: int,
+    ) -> bytes:
+        """Return building centroids and counts per grid cell within the bounding box."""
+
+        arguments = [min_latitude, max_latitude, min_longitude, max_longitude, zoom]
+
+        async def compute() -> GeoClusters:
+            return await self._service.clusters(*arguments)
+
+        return await self._cache.fetch(
+            self._session, "geo.clusters", GEO_TABLES, arguments, _geo_clusters, compute
+        )
@@ -0,0 +1,113 @@
+"""Aggregation of buildings into map clusters."""
+
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.models.building import Building
+from org_catalog.models.organization import Organization
+from org_catalog.schemas.geo import GeoCluster, GeoClusters
+from org_catalog.services.geolocation import within_box_sql
+
+MAX_ZOOM = 22
+#: Grid cells along the side of one web map tile.
+CELLS_PER_TILE = 4
+MAX_CELLS = 10_000
+
+
+def cell_degrees(zoom: int) -> float:
+    """Return the side in degrees of a cluster cell at the zoom level."""
+
+    return 360.0 / (2**zoom * CELLS_PER_TILE)
+
+
+def cell_count(
+    min_latitude: float,
+    max_latitude: float,
+    min_longitude: float,
+    max_longitude: float,
+    zoom: int,
+) -> int:
+    """Return the number of grid cells the bounding box may span at the zoom level."""
+
+    cell = cell_degrees(zoom)
+    rows = int(max_latitude // cell - min_latitude // cell) + 1
+    columns = int(max_longitude // cell - min_longitude // cell) + 1
+    return rows * columns
+
+
+class ClusterService:
+    """Service aggregating buildings and organizations into grid cells."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def clusters(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        zoom: int,
+    ) -> GeoClusters:
+        """Return building centroids and counts per grid cell within the bounding box.
+
+        Organizations are counted per building by a correlated subquery, which
+        the ``building_id`` index answers without reading organization rows.
+        """
+
+        if cell_count(min_latitude, max_latitude, min_longitude, max_longitude, zoom) > MAX_CELLS:
+            msg = f"Bounding box spans more than {MAX_CELLS} cells at zoom {zoom}."
+            raise ValueError(msg)
+
+        cell = cell_degrees(zoom)
+        organizations = (
+            select(func.count())
+            .where(Organization.building_id == Building.id)
+            .correlate(Building)
+            .scalar_subquery()
+        )
+        buildings = (
+            select(
+                Building.latitude,
+                Building.longitude,
+                func.floor(Building.latitude / cell).label("row"),
+                func.floor(Building.longitude / cell).label("column"),
+                organizations.label("organizations"),
+            )
+            .where(
+                within_box_sql(
+                    Building.latitude,
+                    Building.longitude,
+                    min_latitude,
+                    max_latitude,
+                    min_longitude,
+                    max_longitude,
+                )
+            )
+            .subquery()
+        )
+        statement = (
+            select(
+                func.avg(buildings.c.latitude),
+                func.avg(buildings.c.longitude),
+                func.count(),
+                func.sum(buildings.c.organizations),
+            )
+            .group_by(buildings.c.row, buildings.c.column)
+            .order_by(buildings.c.row, buildings.c.column)
+        )
+        result = await self._session.execute(statement)
+        return GeoClusters(
+            zoom=zoom,
+            cell_degrees=cell,
+            clusters=[
+                GeoCluster(
+                    latitude=latitude,
+                    longitude=longitude,
+                    buildings=building_count,
+                    organizations=organization_count,
+                )
+                for latitude, longitude, building_count, organization_count in result
+            ],
+        )
@@ -0,0 +1,91 @@
+"""Conversion of ORM organizations to response schemas."""
+
+
+from typing import Any, TypeVar
+
+from org_catalog.models.activity import Activity
+from org_catalog.models.building import Building
+from org_catalog.models.organization import Organization
+from org_catalog.schemas.activity import ActivityBase
+from org_catalog.schemas.building import Building as BuildingSchema
+from org_catalog.schemas.organization import OrganizationDetailed, OrganizationPhone
+from org_catalog.services.loading import ORGANIZATION_FIELDS
+
+DetailedT = TypeVar("DetailedT", bound=OrganizationDetailed)
+
+SHARED_RELATIONS = frozenset({"building", "activities"})
+
+
+class OrganizationConverter:
+    """Builds detailed organization schemas for one result set.
+
+    Organizations in a result typically share buildings and activities, and
+    the session identity map hands out one ORM object per row. Each distinct
+    building and activity is therefore validated once and its schema reused,
+    instead of being re-read attribute by attribute for every organization.
+    With ``fields``, organizations are converted to dicts of those fields.
+    """
+
+    def __init__(self, fields: frozenset[str] | None = None) -> None:
+        self._fields = fields
+        self._buildings: dict[int, BuildingSchema] = {}
+        self._activities: dict[int, ActivityBase] = {}
+
+    def convert(
+        self,
+        organization: Organization,
+        schema: type[DetailedT] = OrganizationDetailed,
+        **extra: Any,
+    ) -> DetailedT | dict[str, Any]:
+        """Return the organization as ``schema``, or as a dict of the selected fields."""
+
+        if self._fields is None:
+            return self.detailed(organization, schema, **extra)
+        return self.sparse(organization, **extra)
+
+    def detailed(
+        self,
+        organization: Organization,
+        schema: type[DetailedT] = OrganizationDetailed,
+        **extra: Any,
+    ) -> DetailedT:
+        """Return the organization as ``schema`` with additional field values."""
+
+        data = {
+            name: getattr(organization, name)
+            for name in schema.model_fields
+            if name not in extra and name not in SHARED_RELATIONS
+        }
+        data["building"] = self._building(organization.building)
+        data["activities"] = [self._activity(activity) for activity in organization.activities]
+        return schema.model_validate({**data, **extra})
+
+    def sparse(self, organization: Organization, **extra: Any) -> dict[str, Any]:
+        """Return the selected fields of the organization with additional values."""
+
+        fields = self._fields if self._fields is not None else ORGANIZATION_FIELDS
+        data: dict[str, Any] = {}
+        for name in ORGANIZATION_FIELDS:
+            if name not in fields:
+                continue
+            if name == "building":
+                data[name] = self._building(organization.building)
+            elif name == "activities":
+                data[name] = [self._activity(activity) for activity in organization.activities]
+            elif name == "phones":
+                data[name] = [OrganizationPhone.model_validate(p) for p in organization.phones]
+            else:
+                data[name] = getattr(organization, name)
+        return {**data, **extra}
+
+    def _building(self, building: Building) -> BuildingSchema:
+        converted = self._buildings.get(building.id)
+        if converted is None:
+            converted = self._buildings[building.id] = BuildingSchema.model_validate(building)
+        return converted
+
+    def _activity(self, activity: Activity) -> ActivityBase:
+        converted = self._activities.get(activity.id)
+        if converted is None:
+            converted = self._activities[activity.id] = ActivityBase.model_validate(activity)
+        return converted
@@ -0,0 +1,334 @@
+"""Bulk export of catalog tables through PostgreSQL ``COPY``."""
+
+
+import asyncio
+import json
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from enum import StrEnum
+from typing import IO, Any
+
+from sqlalchemy import JSON, Select, cast, func, literal, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.models.activity import Activity, activity_closure
+from org_catalog.models.building import Building
+from org_catalog.models.organization import (
+    Organization,
+    OrganizationPhone,
+    organization_activities,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - guard for optional dependency
+    pa = None  # type: ignore[assignment]
+
+#: Chunks buffered between ``COPY`` and the client before reading pauses.
+COPY_QUEUE_SIZE = 16
+#: Bytes of CSV converted into one Parquet row group.
+PARQUET_BLOCK_SIZE = 8 * 1024 * 1024
+#: Bytes read per chunk when sending a finished Parquet file.
+READ_CHUNK_SIZE = 256 * 1024
+
+
+class ExportDataset(StrEnum):
+    """Catalog tables available for export."""
+
+    ORGANIZATIONS = "organizations"
+    BUILDINGS = "buildings"
+    ACTIVITIES = "activities"
+
+
+class ExportFormat(StrEnum):
+    """File formats of an export."""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+# Aggregated columns of the organization export: JSON arrays in CSV, lists in Parquet.
+LIST_COLUMNS = {"phones": "string", "activity_ids": "int64", "activity_names": "string"}
+
+
+def parquet_available() -> bool:
+    """Return whether the optional Parquet dependency is installed."""
+
+    return pa is not None
+
+
+def _aggregated(column: Any, order_by: Any) -> Any:
+    return array_agg(aggregate_order_by(column, order_by))
+
+
+def _json_list(column: Any) -> Any:
+    """Return the array column as a JSON array, empty for organizations without rows."""
+
+    return func.coalesce(func.to_json(column), cast(literal("[]"), JSON))
+
+
+def _organizations_query() -> Select[Any]:
+    """Return organizations with building, phones and activities flattened into columns.
+
+    Phones and activities are aggregated once per table and hash-joined, which
+    beats per-row lookups when every organization is read.
+    """
+
+    phones = (
+        select(
+            OrganizationPhone.organization_id,
+            _aggregated(OrganizationPhone.number, OrganizationPhone.id).label("phones"),
+        )
+        .group_by(OrganizationPhone.organization_id)
+        .subquery()
+    )
+    links = organization_activities.c
+    activities = (
+        select(
+            links.organization_id,
+            _aggregated(Activity.id, Activity.id).label("activity_ids"),
+            _aggregated(Activity.name, Activity.id).label("activity_names"),
+        )
+        .join(Activity, Activity.id == links.activity_id)
+        .group_by(links.organization_id)
+        .subquery()
+    )
+    return (
+        select(
+            Organization.id,
+            Organization.name,
+            Organization.description,
+            Organization.building_id,
+            Building.name.label("building_name"),
+            Building.address.label("building_address"),
+            Building.latitude,
+            Building.longitude,
+            _json_list(phones.c.phones).label("phones"),
+            _json_list(activities.c.activity_ids).label("activity_ids"),
+            _json_list(activities.c.activity_names).label("activity_names"),
+            Organization.created_at,
+            Organization.updated_at,
+        )
+        .join(Building, Building.id == Organization.building_id)
+        .outerjoin(phones, phones.c.organization_id == Organization.id)
+        .outerjoin(activities, activities.c.organization_id == Organization.id)
+        .order_by(Organization.id)
+    )
+
+
+def _buildings_query() -> Select[Any]:
+    return select(
+        Building.id,
+        Building.name,
+        Building.address,
+        Building.latitude,
+        Building.longitude,
+        Building.created_at,
+        Building.updated_at,
+    ).order_by(Building.id)
+
+
+def _activities_query() -> Select[Any]:
+    """Return activities with their level in the tree, roots being level 1."""
+
+    levels = (
+        select(
+            activity_closure.c.descendant_id,
+            (func.max(activity_closure.c.depth) + 1).label("level"),
+        )
+        .group_by(activity_closure.c.descendant_id)
+        .subquery()
+    )
+    return (
+        select(Activity.id, Activity.name, Activity.parent_id, levels.c.level)
+        .join(levels, levels.c.descendant_id == Activity.id)
+        .order_by(Activity.id)
+    )
+
+
+QUERIES: dict[ExportDataset, Callable[[], Select[Any]]] = {
+    ExportDataset.ORGANIZATIONS: _organizations_query,
+    ExportDataset.BUILDINGS: _buildings_query,
+    ExportDataset.ACTIVITIES: _activities_query,
+}
+
+# Arrow column types of every export, by type name to keep pyarrow optional.
+COLUMN_TYPES: dict[ExportDataset, dict[str, str]] = {
+    ExportDataset.ORGANIZATIONS: {
+        "id": "int64",
+        "name": "string",
+        "description": "string",
+        "building_id": "int64",
+        "building_name": "string",
+        "building_address": "string",
+        "latitude": "float64",
+        "longitude": "float64",
+        "phones": "string",
+        "activity_ids": "string",
+        "activity_names": "string",
+        "created_at": "timestamp",
+        "updated_at": "timestamp",
+    },
+    ExportDataset.BUILDINGS: {
+        "id": "int64",
+        "name": "string",
+        "address": "string",
+        "latitude": "float64",
+        "longitude": "float64",
+        "created_at": "timestamp",
+        "updated_at": "timestamp",
+    },
+    ExportDataset.ACTIVITIES: {
+        "id": "int64",
+        "name": "string",
+        "parent_id": "int64",
+        "level": "int64",
+    },
+}
+
+
+def export_sql(dataset: ExportDataset) -> str:
+    """Return the self-contained SQL statement producing the dataset."""
+
+    statement = QUERIES[dataset]()
+    compiled = statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    return str(compiled)
+
+
+def _arrow_type(name: str) -> Any:
+    if name == "timestamp":
+        return pa.timestamp("us", tz="UTC")
+    return getattr(pa, name)()
+
+
+def csv_to_parquet(source: IO[bytes], target: IO[bytes], dataset: ExportDataset) -> None:
+    """Convert ``COPY`` CSV output to Parquet, one row group per block of input.
+
+    Aggregated organization columns become list columns.
+    """
+
+    columns = COLUMN_TYPES[dataset]
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=PARQUET_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: _arrow_type(kind) for name, kind in columns.items()},
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    writer = None
+    try:
+        for batch in reader:
+            table = _with_lists(pa.Table.from_batches([batch]))
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            empty = _with_lists(reader.schema.empty_table())
+            writer = pq.ParquetWriter(target, empty.schema)
+            writer.write_table(empty)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _with_lists(table: Any) -> Any:
+    for name, kind in LIST_COLUMNS.items():
+        if name in table.column_names:
+            table = table.set_column(
+                table.column_names.index(name), name, _parsed(table[name], kind)
+            )
+    return table
+
+
+def _parsed(column: Any, kind: str) -> Any:
+    values = [json.loads(value) for value in column.to_pylist()]
+    return pa.array(values, type=pa.list_(_arrow_type(kind)))
+
+
+class ExportService:
+    """Streams whole catalog tables without loading ORM objects.
+
+    Rows are produced by ``COPY (...) TO STDOUT`` on the session connection,
+    so the database formats them and the application only forwards bytes.
+    The session must stay open until the returned iterators are exhausted.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def csv(self, dataset: ExportDataset) -> AsyncIterator[bytes]:
+        """Yield the dataset as CSV with a header row, as fast as the client reads it."""
+
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=COPY_QUEUE_SIZE)
+
+        async def forward(chunk: bytes) -> None:
+            # asyncpg hands out bytearrays, which responses do not accept.
+            await queue.put(bytes(chunk))
+
+        async def produce() -> None:
+            try:
+                await self._copy(dataset, forward)
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+    async def parquet(self, dataset: ExportDataset) -> AsyncIterator[bytes]:
+        """Yield the dataset as a Parquet file.
+
+        Parquet metadata follows the data, so the CSV output is spooled to a
+        temporary file and converted in a worker thread before sending.
+        """
+
+        if not parquet_available():
+            raise RuntimeError("The pyarrow package is required for Parquet exports.")
+        with tempfile.TemporaryFile() as source, tempfile.TemporaryFile() as target:
+
+            async def spool(chunk: bytes) -> None:
+                source.write(chunk)
+
+            await self._copy(dataset, spool)
+            source.seek(0)
+            await asyncio.to_thread(csv_to_parquet, source, target, dataset)
+            target.seek(0)
+            while chunk := target.read(READ_CHUNK_SIZE):
+                yield chunk
+
+    async def _copy(
+        self,
+        dataset: ExportDataset,
+        output: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        connection = await self._session.connection()
+        # A whole table read at the client's pace may run for minutes; once
+        # the response has started, cancelling it would truncate the file.
+        await connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_from_query(
+            export_sql(dataset),
+            output=output,
+            format="csv",
+            header=True,
+        )
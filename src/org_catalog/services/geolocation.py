@@ -1,7 +1,16 @@
 """Geolocation utilities."""
 
 
+from collections.abc import Sequence
 from math import asin, cos, radians, sin, sqrt
+from typing import Any
+
+from sqlalchemy import ColumnElement, Float, func, literal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - guard for optional dependency
+    np = None  # type: ignore[assignment]
 
 EARTH_RADIUS_KM = 6371.0
 
@@ -23,6 +32,110 @@ def haversine_distance_km(lat_a: float, lon_a: float, lat_b: float, lon_b: float
     return EARTH_RADIUS_KM * c
 
 
+def haversine_distances_km(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+) -> list[float]:
+    """Return Haversine distances (km) from the point to every coordinate pair.
+
+    Distances are computed in one vectorized pass when NumPy is installed and
+    in a plain loop over precomputed terms otherwise.
+    """
+
+    if np is not None:
+        return _haversine_distances_numpy(latitude, longitude, latitudes, longitudes).tolist()
+
+    lat_rad, lon_rad = radians(latitude), radians(longitude)
+    cos_lat = cos(lat_rad)
+    distances = []
+    for lat_b, lon_b in zip(latitudes, longitudes, strict=True):
+        lat_b_rad = radians(lat_b)
+        sin_lat = sin((lat_b_rad - lat_rad) / 2)
+        sin_lon = sin((radians(lon_b) - lon_rad) / 2)
+        a = sin_lat**2 + cos_lat * cos(lat_b_rad) * sin_lon**2
+        distances.append(EARTH_RADIUS_KM * 2 * asin(min(1.0, sqrt(a))))
+    return distances
+
+
+def distances_within_radius_km(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    radius_km: float,
+) -> tuple[list[float], list[bool]]:
+    """Return distances (km) from the point and whether each lies within the radius."""
+
+    if np is not None:
+        distances = _haversine_distances_numpy(latitude, longitude, latitudes, longitudes)
+        return distances.tolist(), (distances <= radius_km).tolist()
+
+    distances = haversine_distances_km(latitude, longitude, latitudes, longitudes)
+    return distances, [distance <= radius_km for distance in distances]
+
+
+def _haversine_distances_numpy(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+) -> Any:
+    """Return an array of Haversine distances (km) computed with NumPy."""
+
+    lat_rad, lon_rad = radians(latitude), radians(longitude)
+    lat_b = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon_b = np.radians(np.asarray(longitudes, dtype=np.float64))
+    a = np.sin((lat_b - lat_rad) / 2) ** 2 + cos(lat_rad) * np.cos(lat_b) * np.sin(
+        (lon_b - lon_rad) / 2
+    ) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def haversine_distance_sql(
+    latitude: float,
+    longitude: float,
+    latitude_column: ColumnElement[Any],
+    longitude_column: ColumnElement[Any],
+) -> ColumnElement[float]:
+    """Return SQL expression computing Haversine distance (km) from the point."""
+
+    d_lat = func.radians(latitude_column) - radians(latitude)
+    d_lon = func.radians(longitude_column) - radians(longitude)
+    a = func.power(func.sin(d_lat / 2), 2) + cos(radians(latitude)) * func.cos(
+        func.radians(latitude_column)
+    ) * func.power(func.sin(d_lon / 2), 2)
+    # Rounding may push the argument marginally above 1, which asin rejects.
+    return 2 * EARTH_RADIUS_KM * func.asin(
+        func.least(literal(1.0), func.sqrt(a)),
+        type_=Float,
+    )
+
+
+def location_point_sql(
+    latitude_column: ColumnElement[Any],
+    longitude_column: ColumnElement[Any],
+) -> ColumnElement[Any]:
+    """Return ``point(longitude, latitude)`` served by the buildings GiST index."""
+
+    return func.point(longitude_column, latitude_column)
+
+
+def within_box_sql(
+    latitude_column: ColumnElement[Any],
+    longitude_column: ColumnElement[Any],
+    min_latitude: float,
+    max_latitude: float,
+    min_longitude: float,
+    max_longitude: float,
+) -> ColumnElement[bool]:
+    """Return index-friendly predicate checking that coordinates lie in the box."""
+
+    box = func.box(func.point(min_longitude, min_latitude), func.point(max_longitude, max_latitude))
+    return location_point_sql(latitude_column, longitude_column).op("<@", is_comparison=True)(box)
+
+
 def bounding_box(
     latitude: float,
     longitude: float,
@@ -0,0 +1,107 @@
+"""Relationship loading strategies for organization queries."""
+
+
+from collections.abc import Iterable
+from enum import StrEnum
+
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from org_catalog.models.organization import Organization
+from org_catalog.schemas.organization import OrganizationDetailed, OrganizationSummary
+
+ORGANIZATION_COLUMNS = ("id", "name", "description", "building_id")
+ORGANIZATION_RELATIONS = ("building", "activities", "phones")
+#: Fields that may be requested with a sparse fieldset, in response order.
+ORGANIZATION_FIELDS = ORGANIZATION_COLUMNS + ORGANIZATION_RELATIONS
+DETAILED_FIELDS = frozenset(OrganizationDetailed.model_fields)
+SUMMARY_FIELDS = frozenset(OrganizationSummary.model_fields)
+
+
+class OrganizationLoading(StrEnum):
+    """How organization relations are fetched alongside the organizations."""
+
+    #: Single statement joining building, phones and activities. Collections
+    #: multiply each other, so an organization with 5 phones and 10 activities
+    #: is returned as 50 rows.
+    JOINED = "joined"
+    #: Building is joined, each collection is fetched with one batched
+    #: ``IN`` query over the organization ids of the page.
+    SELECTIN = "selectin"
+    #: Building and each collection are fetched with one batched ``IN`` query
+    #: over the organization ids. Suits lookups of arbitrary ids, for which
+    #: joining buildings tends to hash the whole buildings table.
+    BATCHED = "batched"
+
+
+class OrganizationView(StrEnum):
+    """Predefined set of organization fields returned by the API."""
+
+    SUMMARY = "summary"
+    DETAILED = "detailed"
+
+
+def organization_fields(
+    view: OrganizationView,
+    fields: Iterable[str] | None = None,
+) -> frozenset[str] | None:
+    """Return the organization fields to load, or ``None`` for the detailed representation.
+
+    Explicit ``fields`` take precedence over the view; the id is always
+    included, since organizations are keyed and paginated by it.
+    """
+
+    if fields is not None:
+        selected = frozenset(fields) | {"id"}
+        unknown = selected - frozenset(ORGANIZATION_FIELDS)
+        if unknown:
+            msg = f"Unknown organization fields: {', '.join(sorted(unknown))}."
+            raise ValueError(msg)
+    elif view is OrganizationView.SUMMARY:
+        selected = SUMMARY_FIELDS
+    else:
+        selected = DETAILED_FIELDS
+    return None if selected == DETAILED_FIELDS else selected
+
+
+def organization_load_options(
+    loading: OrganizationLoading,
+    fields: frozenset[str] | None = None,
+) -> tuple[ORMOption, ...]:
+    """Return loader options implementing the strategy for the selected fields.
+
+    Without ``fields`` every column and relation is loaded. Otherwise only
+    the selected columns, plus the id and building id, are read and
+    relations that were not selected raise instead of loading lazily.
+    """
+
+    if fields is not None:
+        columns = [
+            getattr(Organization, name)
+            for name in ORGANIZATION_COLUMNS
+            if name in fields and name not in {"id", "building_id"}
+        ]
+        building, phones, activities = organization_load_options(loading)
+        relations = {"building": building, "phones": phones, "activities": activities}
+        return (
+            load_only(Organization.id, Organization.building_id, *columns),
+            *(option for name, option in relations.items() if name in fields),
+            raiseload("*"),
+        )
+    if loading is OrganizationLoading.JOINED:
+        return (
+            joinedload(Organization.building),
+            joinedload(Organization.phones),
+            joinedload(Organization.activities),
+        )
+    if loading is OrganizationLoading.BATCHED:
+        return (
+            selectinload(Organization.building),
+            selectinload(Organization.phones),
+            selectinload(Organization.activities),
+        )
+    return (
+        joinedload(Organization.building, innerjoin=True),
+        selectinload(Organization.phones),
+        selectinload(Organization.activities),
+    )
@@ -1,22 +1,106 @@
 """Domain services for organization related operations."""
 
 
-from typing import Sequence
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Sequence
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Float,
+    Integer,
+    Select,
+    exists,
+    func,
+    literal,
+    select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from org_catalog.models.building import Building
 from org_catalog.models.organization import Organization, organization_activities
-from org_catalog.services.geolocation import bounding_box, haversine_distance_km
+from org_catalog.services.building_index import BuildingIndex
+from org_catalog.services.geolocation import (
+    bounding_box,
+    haversine_distance_sql,
+    location_point_sql,
+    within_box_sql,
+)
+from org_catalog.services.loading import OrganizationLoading, organization_load_options
+from org_catalog.services.pagination import (
+    KeysetPage,
+    PageRequest,
+    build_page,
+    paginate,
+    seek,
+)
+from org_catalog.services.search import name_matches, name_relevance
+
+STREAM_BATCH_SIZE = 500
+
+ActivityIds = Sequence[int] | Select[tuple[int]]
+
+
+class GeoOrdering(StrEnum):
+    """Order of organizations found by a geographic lookup."""
+
+    ID = "id"
+    DISTANCE = "distance"
+
+
+@dataclass(frozen=True)
+class OrganizationFilters:
+    """Criteria of a combined organization search; unset criteria are not applied.
+
+    A radius needs ``latitude`` and ``longitude``; a bounding box is given by
+    all four ``min_``/``max_`` bounds.
+    """
+
+    building_id: int | None = None
+    activity_ids: ActivityIds | None = None
+    name: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    radius_km: float | None = None
+    min_latitude: float | None = None
+    max_latitude: float | None = None
+    min_longitude: float | None = None
+    max_longitude: float | None = None
+
+    @property
+    def has_box(self) -> bool:
+        """Return whether a bounding box is set."""
+
+        return None not in (
+            self.min_latitude,
+            self.max_latitude,
+            self.min_longitude,
+            self.max_longitude,
+        )
 
 
 class OrganizationService:
-    """Service class encapsulating organization queries."""
+    """Service class encapsulating organization queries.
 
-    def __init__(self, session: AsyncSession) -> None:
+    With a building index, radius and rectangle lookups find matching
+    buildings in memory and query organizations by building id. With
+    ``fields``, organizations carry only those columns and relations.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        loading: OrganizationLoading = OrganizationLoading.SELECTIN,
+        building_index: BuildingIndex | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> None:
         self._session = session
+        self._loading = loading
+        self._building_index = building_index
+        self._fields = fields
+        self._load_options = organization_load_options(loading, fields)
 
     async def get(self, organization_id: int) -> Organization | None:
         """Return organization by id with related data."""
@@ -24,86 +108,214 @@ class OrganizationService:
         statement = (
             select(Organization)
             .where(Organization.id == organization_id)
-            .options(
-                joinedload(Organization.building),
-                joinedload(Organization.activities),
-                joinedload(Organization.phones),
-            )
+            .options(*self._load_options)
         )
         result = await self._session.execute(statement)
         return result.unique().scalars().first()
 
-    async def by_building(self, building_id: int) -> list[Organization]:
+    async def get_many(self, organization_ids: Iterable[int]) -> dict[int, Organization]:
+        """Return organizations with related data keyed by id, skipping unknown ids.
+
+        Relations are always loaded in batches, whatever the configured
+        strategy, so the ids are looked up by primary key in every table.
+        """
+
+        statement = (
+            select(Organization)
+            .where(Organization.id.in_(set(organization_ids)))
+            .options(*organization_load_options(OrganizationLoading.BATCHED, self._fields))
+        )
+        result = await self._session.execute(statement)
+        return {org.id: org for org in result.unique().scalars()}
+
+    async def by_building(
+        self,
+        building_id: int,
+        page: PageRequest = PageRequest(),
+    ) -> KeysetPage[Organization]:
         """Return organizations located in the specified building."""
 
         statement = (
             select(Organization)
             .where(Organization.building_id == building_id)
-            .options(
-                joinedload(Organization.building),
-                joinedload(Organization.phones),
-                joinedload(Organization.activities),
-            )
+            .options(*self._load_options)
         )
-        result = await self._session.execute(statement)
-        return result.unique().scalars().all()
+        return await self._page_by_id(statement, page)
+
+    async def by_activity_ids(
+        self,
+        activity_ids: ActivityIds,
+        page: PageRequest = PageRequest(),
+    ) -> KeysetPage[Organization]:
+        """Return organizations linked to any of the provided activities.
 
-    async def by_activity_ids(self, activity_ids: Sequence[int]) -> list[Organization]:
-        """Return organizations linked to any of the provided activities."""
+        Activity ids may be given as a statement, which is embedded as a
+        subquery so the lookup stays a single round trip.
+        """
 
-        if not activity_ids:
-            return []
+        if not isinstance(activity_ids, Select) and not activity_ids:
+            return KeysetPage(items=[])
         statement = (
             select(Organization)
-            .join(organization_activities)
-            .where(organization_activities.c.activity_id.in_(activity_ids))
-            .options(
-                joinedload(Organization.building),
-                joinedload(Organization.phones),
-                joinedload(Organization.activities),
+            .where(_linked_to_activities(activity_ids))
+            .options(*self._load_options)
+        )
+        return await self._page_by_id(statement, page)
+
+    async def search(
+        self,
+        filters: OrganizationFilters,
+        page: PageRequest = PageRequest(),
+    ) -> KeysetPage[Organization]:
+        """Return organizations matching all filters, intersected in a single statement.
+
+        Results come nearest first when a radius is given, best name matches
+        first when only a name is, and in id order otherwise.
+        """
+
+        if filters.name == "" or (
+            filters.activity_ids is not None
+            and not isinstance(filters.activity_ids, Select)
+            and not filters.activity_ids
+        ):
+            return KeysetPage(items=[])
+
+        conditions: list[ColumnElement[bool]] = []
+        sort_keys: list[ColumnElement[Any]] = []
+        if filters.building_id is not None:
+            conditions.append(Organization.building_id == filters.building_id)
+        if filters.activity_ids is not None:
+            conditions.append(_linked_to_activities(filters.activity_ids))
+        if filters.name is not None:
+            conditions.append(name_matches(Organization.name, filters.name))
+            sort_keys = name_relevance(Organization.name, filters.name)
+        if filters.has_box:
+            conditions.append(
+                within_box_sql(
+                    Building.latitude,
+                    Building.longitude,
+                    filters.min_latitude,
+                    filters.max_latitude,
+                    filters.min_longitude,
+                    filters.max_longitude,
+                )
+            )
+        if filters.radius_km is not None:
+            if filters.latitude is None or filters.longitude is None:
+                raise ValueError("A radius requires latitude and longitude.")
+            distance, radius_conditions = _within_radius(
+                filters.latitude, filters.longitude, filters.radius_km
             )
-            .distinct()
+            conditions.extend(radius_conditions)
+            sort_keys = [distance]
+
+        statement = select(Organization, *sort_keys).where(*conditions)
+        if filters.has_box or filters.radius_km is not None:
+            statement = statement.join(Building)
+        statement = paginate(
+            statement.options(*self._load_options), [*sort_keys, Organization.id], page
         )
         result = await self._session.execute(statement)
-        return result.unique().scalars().all()
+        return build_page(
+            result.unique().all(),
+            page,
+            item=lambda row: row[0],
+            key=lambda row: (*row[1:], row[0].id),
+        )
 
-    async def search_by_name(self, query: str) -> list[Organization]:
-        """Perform a case-insensitive search by organization name."""
+    async def search_by_name(
+        self,
+        query: str,
+        page: PageRequest = PageRequest(),
+    ) -> KeysetPage[Organization]:
+        """Perform a case-insensitive search by organization name, best matches first."""
 
         if not query:
-            return []
+            return KeysetPage(items=[])
 
-        pattern = f"%{query.lower()}%"
+        relevance = name_relevance(Organization.name, query)
         statement = (
-            select(Organization)
-            .where(func.lower(Organization.name).like(pattern))
-            .options(
-                joinedload(Organization.building),
-                joinedload(Organization.phones),
-                joinedload(Organization.activities),
-            )
+            select(Organization, *relevance)
+            .where(name_matches(Organization.name, query))
+            .options(*self._load_options)
         )
+        statement = paginate(statement, [*relevance, Organization.id], page)
         result = await self._session.execute(statement)
-        return result.unique().scalars().all()
-
-    async def in_radius(self, latitude: float, longitude: float, radius_km: float) -> list[Organization]:
-        """Return organizations within the given radius (km) from the point."""
-
-        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
-        candidates = await self.in_rectangle(min_lat, max_lat, min_lon, max_lon)
-
-        return [
-            org
-            for org in candidates
-            if org.building
-            and haversine_distance_km(
-                latitude,
-                longitude,
-                org.building.latitude,
-                org.building.longitude,
+        return build_page(
+            result.unique().all(),
+            page,
+            item=lambda row: row[0],
+            key=lambda row: (*row[1:], row[0].id),
+        )
+
+    async def in_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        page: PageRequest = PageRequest(),
+        order_by: GeoOrdering = GeoOrdering.DISTANCE,
+    ) -> KeysetPage[tuple[Organization, float]]:
+        """Return organizations with distances (km) within the radius, nearest first by default."""
+
+        if self._building_index is None:
+            distance, conditions = _within_radius(latitude, longitude, radius_km)
+            statement = select(Organization, distance).join(Building).where(*conditions)
+        else:
+            grid = await self._building_index.get(self._session)
+            building_ids, distances = grid.in_radius(latitude, longitude, radius_km)
+            if not building_ids:
+                return KeysetPage(items=[])
+            nearby = func.unnest(
+                literal(building_ids, ARRAY(Integer)), literal(distances, ARRAY(Float))
+            ).table_valued("building_id", "distance").render_derived(with_types=False)
+            distance = nearby.c.distance
+            statement = select(Organization, distance).join(
+                nearby, Organization.building_id == nearby.c.building_id
             )
-            <= radius_km
-        ]
+        statement = statement.options(*self._load_options)
+        if order_by is GeoOrdering.ID:
+            sort_keys, key = [Organization.id], lambda row: (row[0].id,)
+        else:
+            sort_keys, key = [distance, Organization.id], lambda row: (row[1], row[0].id)
+        result = await self._session.execute(paginate(statement, sort_keys, page))
+        return build_page(
+            result.unique().all(),
+            page,
+            item=lambda row: (row[0], row[1]),
+            key=key,
+        )
+
+    async def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+    ) -> list[tuple[Organization, float]]:
+        """Return the closest organizations with distances (km), nearest first."""
+
+        # KNN over the GiST index orders buildings by planar degree distance,
+        # which only approximates great-circle order. Buildings hosting
+        # organizations are picked this way to bound the search radius: the
+        # true nearest organizations are never further than the furthest of
+        # them, so an exact radius query over that bound is complete.
+        location = location_point_sql(Building.latitude, Building.longitude)
+        candidates = (
+            select(
+                haversine_distance_sql(
+                    latitude, longitude, Building.latitude, Building.longitude
+                ).label("distance")
+            )
+            .where(exists().where(Organization.building_id == Building.id))
+            .order_by(location.op("<->", return_type=Float)(func.point(longitude, latitude)))
+            .limit(limit)
+            .subquery()
+        )
+        radius_km = await self._session.scalar(select(func.max(candidates.c.distance)))
+        if radius_km is None:
+            return []
+        page = await self.in_radius(latitude, longitude, radius_km, PageRequest(limit=limit))
+        return page.items
 
     async def in_rectangle(
         self,
@@ -111,28 +323,163 @@ class OrganizationService:
         max_latitude: float,
         min_longitude: float,
         max_longitude: float,
-    ) -> list[Organization]:
-        """Return organizations within the bounding box defined by coordinates."""
+        page: PageRequest = PageRequest(),
+        nearest_to: tuple[float, float] | None = None,
+    ) -> KeysetPage[Organization]:
+        """Return organizations within the bounding box defined by coordinates.
 
-        statement = (
+        Organizations come in id order, or nearest first to the
+        ``(latitude, longitude)`` point given as ``nearest_to``.
+        """
+
+        if self._building_index is None:
+            statement = self._in_rectangle_statement(
+                min_latitude, max_latitude, min_longitude, max_longitude
+            )
+        else:
+            grid = await self._building_index.get(self._session)
+            building_ids = grid.in_rectangle(
+                min_latitude, max_latitude, min_longitude, max_longitude
+            )
+            if not building_ids:
+                return KeysetPage(items=[])
+            matching = func.unnest(literal(building_ids, ARRAY(Integer))).table_valued(
+                "building_id"
+            )
+            matching = matching.render_derived(with_types=False)
+            statement = (
+                select(Organization)
+                .join(matching, Organization.building_id == matching.c.building_id)
+                .options(*self._load_options)
+            )
+        if nearest_to is None:
+            return await self._page_by_id(statement, page)
+        if self._building_index is not None:
+            statement = statement.join(Building)
+
+        distance = haversine_distance_sql(*nearest_to, Building.latitude, Building.longitude)
+        statement = paginate(statement.add_columns(distance), [distance, Organization.id], page)
+        result = await self._session.execute(statement)
+        return build_page(
+            result.unique().all(),
+            page,
+            item=lambda row: row[0],
+            key=lambda row: (row[1], row[0].id),
+        )
+
+    async def stream_in_rectangle(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        after: tuple[int | float, ...] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[list[Organization]]:
+        """Yield all organizations within the bounding box in id order, batch by batch.
+
+        Rows are read through a server-side cursor and relations are loaded
+        per batch. Organizations of a batch, with their phones, are expunged
+        before the next batch is read, so memory use does not grow with the
+        size of the result. Only buildings and activities, shared between
+        batches, stay in the session.
+        """
+
+        if self._loading is OrganizationLoading.JOINED:
+            raise ValueError("Streaming requires relations loaded with selectinload.")
+        statement = self._in_rectangle_statement(
+            min_latitude, max_latitude, min_longitude, max_longitude
+        )
+        statement = seek(statement, [Organization.id], after)
+        result = await self._session.stream(statement.execution_options(yield_per=batch_size))
+        try:
+            async for batch in result.scalars().partitions():
+                yield batch
+                for organization in batch:
+                    self._session.expunge(organization)
+        finally:
+            await result.close()
+
+    def _in_rectangle_statement(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+    ) -> Select[tuple[Organization]]:
+        """Return statement selecting organizations within the bounding box."""
+
+        return (
             select(Organization)
             .join(Building)
             .where(
-                and_(
-                    Building.latitude >= min_latitude,
-                    Building.latitude <= max_latitude,
-                    Building.longitude >= min_longitude,
-                    Building.longitude <= max_longitude,
+                within_box_sql(
+                    Building.latitude,
+                    Building.longitude,
+                    min_latitude,
+                    max_latitude,
+                    min_longitude,
+                    max_longitude,
                 )
             )
-            .options(
-                joinedload(Organization.building),
-                joinedload(Organization.phones),
-                joinedload(Organization.activities),
-            )
+            .options(*self._load_options)
+        )
+
+    async def building_coordinates(
+        self,
+        building_ids: Iterable[int],
+    ) -> dict[int, tuple[float, float]]:
+        """Return ``(latitude, longitude)`` of the buildings by id."""
+
+        statement = select(Building.id, Building.latitude, Building.longitude).where(
+            Building.id.in_(set(building_ids))
         )
         result = await self._session.execute(statement)
-        return result.unique().scalars().all()
+        return {building_id: (latitude, longitude) for building_id, latitude, longitude in result}
+
+    async def _page_by_id(
+        self,
+        statement: Select[tuple[Organization]],
+        page: PageRequest,
+    ) -> KeysetPage[Organization]:
+        """Execute statement as a page keyed by organization id."""
+
+        statement = paginate(statement, [Organization.id], page)
+        result = await self._session.execute(statement)
+        return build_page(
+            result.unique().scalars().all(),
+            page,
+            item=lambda org: org,
+            key=lambda org: (org.id,),
+        )
+
+
+def _linked_to_activities(activity_ids: ActivityIds) -> ColumnElement[bool]:
+    """Return predicate selecting organizations linked to any of the activities."""
+
+    linked_ids = select(organization_activities.c.organization_id).where(
+        organization_activities.c.activity_id.in_(activity_ids)
+    )
+    return Organization.id.in_(linked_ids)
+
+
+def _within_radius(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+) -> tuple[ColumnElement[float], list[ColumnElement[bool]]]:
+    """Return building distance (km) from the point and predicates bounding it by the radius.
+
+    The bounding box predicate lets the GiST index narrow candidates before
+    exact distances are computed.
+    """
+
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    distance = haversine_distance_sql(latitude, longitude, Building.latitude, Building.longitude)
+    return distance, [
+        within_box_sql(Building.latitude, Building.longitude, min_lat, max_lat, min_lon, max_lon),
+        distance <= radius_km,
+    ]
 
 
 class BuildingService:
@@ -154,3 +501,10 @@ class BuildingService:
         statement = select(Building).where(Building.id == building_id)
         result = await self._session.scalars(statement)
         return result.first()
+
+    async def get_many(self, building_ids: Iterable[int]) -> dict[int, Building]:
+        """Return buildings keyed by id, skipping unknown ids."""
+
+        statement = select(Building).where(Building.id.in_(set(building_ids)))
+        result = await self._session.scalars(statement)
+        return {building.id: building for building in result}
@@ -0,0 +1,105 @@
+"""Keyset pagination helpers shared by service queries."""
+
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import ColumnElement, Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+ItemT = TypeVar("ItemT")
+RowT = TypeVar("RowT")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(key: Sequence[int | float]) -> str:
+    """Return an opaque cursor for the keyset values."""
+
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int | float, ...]:
+    """Return keyset values encoded in the cursor."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor.") from exc
+    if (
+        not isinstance(key, list)
+        or not key
+        or not all(isinstance(value, int | float) and not isinstance(value, bool) for value in key)
+    ):
+        raise InvalidCursorError("Malformed pagination cursor.")
+    return tuple(key)
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """Requested page size and the keyset of the last item already seen."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    after: tuple[int | float, ...] | None = None
+
+
+@dataclass(frozen=True)
+class KeysetPage(Generic[ItemT]):
+    """Items of a single page and the keyset to continue from."""
+
+    items: list[ItemT]
+    next_key: tuple[int | float, ...] | None = None
+
+    @property
+    def next_cursor(self) -> str | None:
+        """Return opaque cursor of the next page, if any."""
+
+        return encode_cursor(self.next_key) if self.next_key is not None else None
+
+
+def seek(
+    statement: Select[Any],
+    order_by: Sequence[ColumnElement[Any]],
+    after: tuple[int | float, ...] | None,
+) -> Select[Any]:
+    """Apply keyset ordering and the predicate continuing after the given key."""
+
+    if after is not None:
+        if len(after) != len(order_by):
+            raise InvalidCursorError("Pagination cursor does not match this listing.")
+        statement = statement.where(tuple_(*order_by) > tuple_(*after))
+    return statement.order_by(*order_by)
+
+
+def paginate(
+    statement: Select[Any],
+    order_by: Sequence[ColumnElement[Any]],
+    page: PageRequest,
+) -> Select[Any]:
+    """Apply keyset ordering, the continuation predicate and the page limit."""
+
+    return seek(statement, order_by, page.after).limit(page.limit + 1)
+
+
+def build_page(
+    rows: Sequence[RowT],
+    page: PageRequest,
+    item: Callable[[RowT], ItemT],
+    key: Callable[[RowT], tuple[int | float, ...]],
+) -> KeysetPage[ItemT]:
+    """Trim the look-ahead row and compute the keyset of the next page."""
+
+    has_more = len(rows) > page.limit
+    rows = rows[: page.limit]
+    next_key = key(rows[-1]) if has_more else None
+    return KeysetPage(items=[item(row) for row in rows], next_key=next_key)
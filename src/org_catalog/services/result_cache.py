@@ -0,0 +1,204 @@
+"""Shared cache of serialized query results."""
+
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Protocol, TypeVar
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from org_catalog.core.config import Settings
+from org_catalog.core.metrics import cache_requests
+from org_catalog.db.changes import ChangeTracker, change_tracker
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - guard for optional dependency
+    redis = None  # type: ignore[assignment]
+
+ResultT = TypeVar("ResultT")
+
+
+class CacheBackend(Protocol):
+    """Storage for serialized cache entries."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the stored value or ``None`` when missing or expired."""
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store the value for ``ttl`` seconds."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, expired ones included."""
+
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the stored value or ``None`` when missing or expired."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store the value for ``ttl`` seconds, evicting least recently used entries."""
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        """Drop all entries."""
+
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Store shared by all workers on a server speaking the Redis protocol."""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        """Return backend connected to the server at the URL."""
+
+        if redis is None:
+            raise RuntimeError("The redis package is required for a Redis result cache.")
+        return cls(redis.Redis.from_url(url))
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the stored value or ``None`` when missing or expired."""
+
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store the value with a server-side expiry of ``ttl`` seconds."""
+
+        await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def close(self) -> None:
+        """Close the client connection pool."""
+
+        await self._client.aclose()
+
+
+class ResultCache:
+    """Caches JSON-serialized results in namespaces versioned by catalog changes.
+
+    Every key embeds the combined change counter of the tables the result was
+    read from. Any write to those tables moves the whole namespace to a new
+    version, so stale entries are never read again and simply age out of the
+    backend. Results read from a replica that has not replayed that version
+    yet are returned but not stored. Concurrent misses for the same key
+    within a process share a single computation.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None,
+        ttl: float = 30.0,
+        tracker: ChangeTracker = change_tracker,
+        prefix: str = "org_catalog",
+    ) -> None:
+        self.backend = backend
+        self._ttl = ttl
+        self._tracker = tracker
+        self._prefix = prefix
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    async def fetch(
+        self,
+        session: AsyncSession,
+        namespace: str,
+        tables: Sequence[str],
+        arguments: Sequence[Any],
+        adapter: TypeAdapter[ResultT],
+        compute: Callable[[], Awaitable[ResultT]],
+    ) -> bytes:
+        """Return the result for the arguments as JSON, computing it on a miss.
+
+        Hits are returned exactly as stored, without being parsed.
+        """
+
+        if self.backend is None:
+            return adapter.dump_json(await compute())
+
+        snapshot = await self._tracker.snapshot(session, tables)
+        key = self._key(namespace, snapshot.version, arguments)
+        while True:
+            cached = await self.backend.get(key)
+            if cached is not None:
+                cache_requests.inc("result", "hit")
+                return cached
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # A failed or cancelled leader leaves the key to the next caller.
+            await asyncio.wait([pending])
+            if not pending.cancelled():
+                cache_requests.inc("result", "shared")
+                return pending.result()
+
+        cache_requests.inc("result", "miss")
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            replayed = await self._tracker.replayed(session, tables, snapshot.version)
+            payload = adapter.dump_json(await compute())
+            if replayed:
+                await self.backend.set(key, payload, self._ttl)
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(payload)
+        finally:
+            del self._inflight[key]
+        return payload
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+        if self.backend is not None:
+            await self.backend.close()
+
+    def _key(self, namespace: str, version: int, arguments: Sequence[Any]) -> str:
+        encoded = json.dumps(list(arguments), separators=(",", ":"), default=str)
+        return f"{self._prefix}:{namespace}:{version}:{encoded}"
+
+
+def create_result_cache(settings: Settings) -> ResultCache:
+    """Return result cache configured from application settings."""
+
+    backend: CacheBackend | None
+    if not settings.result_cache_enabled:
+        backend = None
+    elif settings.result_cache_url:
+        backend = RedisCacheBackend.from_url(settings.result_cache_url)
+    else:
+        backend = MemoryCacheBackend(settings.result_cache_max_entries)
+    return ResultCache(backend, ttl=settings.result_cache_ttl)
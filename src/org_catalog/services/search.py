@@ -0,0 +1,44 @@
+"""Name search predicates and relevance ordering."""
+
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, case, func
+
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(query: str) -> str:
+    """Return ``ILIKE`` pattern matching the query literally anywhere in a value."""
+
+    escaped = (
+        query.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", f"{LIKE_ESCAPE}%")
+        .replace("_", f"{LIKE_ESCAPE}_")
+    )
+    return f"%{escaped}%"
+
+
+def name_matches(column: ColumnElement[str], query: str) -> ColumnElement[bool]:
+    """Return case-insensitive substring predicate served by trigram GIN indexes."""
+
+    return column.ilike(contains_pattern(query), escape=LIKE_ESCAPE)
+
+
+def name_relevance(column: ColumnElement[str], query: str) -> list[ColumnElement[Any]]:
+    """Return ascending sort keys ranking the best name matches first.
+
+    Exact matches come before prefix matches, which come before other
+    substring matches. Ties are broken by how early the query occurs and then
+    by shorter names. All keys are integers, so they can take part in a
+    keyset pagination cursor.
+    """
+
+    lowered = func.lower(column)
+    needle = query.lower()
+    match_kind = case(
+        (lowered == needle, 0),
+        (func.starts_with(lowered, needle), 1),
+        else_=2,
+    )
+    return [match_kind, func.strpos(lowered, needle), func.length(column)]
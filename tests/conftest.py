@@ -4,7 +4,8 @@ import asyncio
 import os
 import uuid
 from dataclasses import dataclass
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 
 import asyncpg
@@ -12,14 +13,21 @@ import pytest
 from alembic import command
 from alembic.config import Config
 from asgi_lifespan import LifespanManager
+from fastapi import Request
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.engine import URL
 from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
-from org_catalog.api.deps import get_db_session
-from org_catalog.main import create_app
+# Tests override the session dependency, so a change listener started by the
+# app lifespan would watch the configured (non-test) database instead.
+os.environ.setdefault("ORG_CATALOG_LISTEN_FOR_CHANGES", "false")
+
+from org_catalog.api.deps import get_db_session, is_read_request  # noqa: E402
+from org_catalog.db.instrumentation import QueryStats, instrument_engine, track_queries  # noqa: E402
+from org_catalog.db.session import read_only_sessionmaker  # noqa: E402
+from org_catalog.main import create_app  # noqa: E402
 
 try:
     from testcontainers.postgres import PostgresContainer
@@ -170,6 +178,7 @@ async def async_engine(test_database_url: str) -> AsyncGenerator[AsyncEngine, No
     """Provide an async SQLAlchemy engine for tests."""
 
     engine = create_async_engine(test_database_url, poolclass=NullPool)
+    instrument_engine(engine)
     try:
         yield engine
     finally:
@@ -184,13 +193,15 @@ def session_factory(async_engine: AsyncEngine) -> async_sessionmaker[AsyncSessio
 
 
 @pytest.fixture
-def app(session_factory: async_sessionmaker[AsyncSession]):
+def app(async_engine: AsyncEngine, session_factory: async_sessionmaker[AsyncSession]):
     """Create a FastAPI application with overridden DB dependency."""
 
     app = create_app()
+    read_only_factory = read_only_sessionmaker(async_engine)
 
-    async def _get_session() -> AsyncGenerator[AsyncSession, None]:
-        async with session_factory() as session:
+    async def _get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+        factory = read_only_factory if is_read_request(request) else session_factory
+        async with factory() as session:
             yield session
 
     app.dependency_overrides[get_db_session] = _get_session
@@ -205,3 +216,21 @@ async def api_client(app) -> AsyncGenerator[AsyncClient, None]:
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as client:
             yield client
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """Return a context manager failing the test when too many statements run inside it."""
+
+    @contextmanager
+    def budget(max_statements: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        if stats.statements > max_statements:
+            executed = "\n\n".join(statement for statement, _ in stats.executed)
+            pytest.fail(
+                f"Expected at most {max_statements} SQL statements, "
+                f"got {stats.statements}:\n{executed}"
+            )
+
+    return budget
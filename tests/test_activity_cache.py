@@ -0,0 +1,83 @@
+"""Tests for the cached activity hierarchy."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from org_catalog.models.activity import Activity
+from org_catalog.services.activity_cache import ActivityHierarchy
+
+ROWS = [
+    (1, "Еда", None),
+    (2, "Мясная продукция", 1),
+    (3, "Молочная продукция", 1),
+    (4, "Автомобили", None),
+    (6, "Легковые автомобили", 4),
+    (7, "Запчасти", 6),
+]
+
+
+def test_hierarchy_precomputes_descendants() -> None:
+    """Snapshot exposes descendants and heights for every node."""
+
+    hierarchy = ActivityHierarchy(1, ROWS)
+
+    assert hierarchy.roots == (1, 4)
+    assert hierarchy.descendants[4] == (4, 6, 7)
+    assert hierarchy.descendants[2] == (2,)
+    assert hierarchy.heights[4] == 3
+    assert 7 in hierarchy
+    assert 5 not in hierarchy
+
+
+def test_hierarchy_tree_enforces_depth() -> None:
+    """Subtrees deeper than the requested depth are rejected."""
+
+    hierarchy = ActivityHierarchy(1, ROWS)
+
+    [food] = hierarchy.tree(1, max_depth=2)
+    assert [child.name for child in food.children] == ["Мясная продукция", "Молочная продукция"]
+    assert hierarchy.tree(99, max_depth=3) == []
+    with pytest.raises(ValueError):
+        hierarchy.tree(None, max_depth=2)
+
+
+async def test_activity_subtree(api_client: AsyncClient, api_key_header: dict[str, str]) -> None:
+    """Subtree endpoint returns the node with its children or 404."""
+
+    response = await api_client.get("/api/v1/activities/6/tree", headers=api_key_header)
+    assert response.status_code == 200
+    [cars] = response.json()
+    assert {child["name"] for child in cars["children"]} == {"Запчасти", "Аксессуары"}
+
+    response = await api_client.get("/api/v1/activities/999/tree", headers=api_key_header)
+    assert response.status_code == 404
+
+
+async def test_activity_cache_reloads_after_change(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Writing to activities bumps the change counter and refreshes the cache."""
+
+    await api_client.get("/api/v1/activities/tree", headers=api_key_header)
+    async with session_factory() as session:
+        await session.execute(
+            insert(Activity).values(id=100, name="Шины", parent_id=5)
+        )
+        await session.commit()
+    try:
+        response = await api_client.get("/api/v1/activities/5/tree", headers=api_key_header)
+        [trucks] = response.json()
+        assert [child["name"] for child in trucks["children"]] == ["Шины"]
+    finally:
+        async with session_factory() as session:
+            await session.execute(delete(Activity).where(Activity.id == 100))
+            await session.commit()
+
+    response = await api_client.get("/api/v1/activities/5/tree", headers=api_key_header)
+    assert response.json()[0]["children"] == []
@@ -0,0 +1,62 @@
+"""Tests for the trigger-maintained activity closure table."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import Executable, delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from org_catalog.models.activity import Activity
+from org_catalog.services.activity import ActivityService
+
+
+async def test_closure_follows_inserts_and_moves(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Closure rows track inserts in any order, subtree moves and deletes."""
+
+    async with session_factory() as session:
+        service = ActivityService(session)
+
+        async def subtree(activity_id: int) -> set[int]:
+            return set(await session.scalars(service.subtree_ids_query([activity_id])))
+
+        # Child listed before its parent within one statement.
+        await session.execute(
+            insert(Activity).values(
+                [
+                    {"id": 102, "name": "Летние шины", "parent_id": 101},
+                    {"id": 101, "name": "Шины", "parent_id": 4},
+                ]
+            )
+        )
+        assert await subtree(4) == {4, 5, 6, 7, 8, 101, 102}
+
+        await session.execute(update(Activity).where(Activity.id == 101).values(parent_id=1))
+        assert await subtree(4) == {4, 5, 6, 7, 8}
+        assert await subtree(1) == {1, 2, 3, 101, 102}
+
+        await session.execute(delete(Activity).where(Activity.id == 101))
+        assert await subtree(1) == {1, 2, 3}
+        await session.rollback()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        insert(Activity).values(id=101, name="Шины", parent_id=7),
+        update(Activity).where(Activity.id == 6).values(parent_id=5),
+    ],
+    ids=["insert", "move"],
+)
+async def test_activities_deeper_than_the_limit_are_rejected(
+    session_factory: async_sessionmaker[AsyncSession],
+    statement: Executable,
+) -> None:
+    """Inserts and moves nesting an activity below the third level fail."""
+
+    async with session_factory() as session:
+        with pytest.raises(IntegrityError, match="ck_activity_closure_depth"):
+            await session.execute(statement)
+        await session.rollback()
@@ -38,7 +38,7 @@ async def test_organizations_by_activity(
         headers=api_key_header,
     )
     assert response.status_code == 200
-    names = {item["name"] for item in response.json()}
+    names = {item["name"] for item in response.json()["items"]}
     assert names == {
         "ООО «Рога и Копыта»",
         "ООО «Молочная ферма»",
@@ -46,6 +46,27 @@ async def test_organizations_by_activity(
     }
 
 
+async def test_search_organizations_by_activity_name(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Activity name search covers every matching subtree once."""
+
+    response = await api_client.get(
+        "/api/v1/organizations/search/by-activity",
+        params={"name": "автомобили"},
+        headers=api_key_header,
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [4, 5]
+
+    empty = await api_client.get(
+        "/api/v1/organizations/search/by-activity",
+        params={"name": ""},
+        headers=api_key_header,
+    )
+    assert empty.status_code == 422
+
+
 async def test_search_organization_by_name(
     api_client: AsyncClient, api_key_header: dict[str, str]
 ) -> None:
@@ -57,11 +78,31 @@ async def test_search_organization_by_name(
         headers=api_key_header,
     )
     assert response.status_code == 200
-    payload = response.json()
+    payload = response.json()["items"]
     assert len(payload) == 1
     assert payload[0]["name"] == "ООО «Рога и Копыта»"
 
 
+async def test_search_organization_by_name_ranked(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Search ranks closer matches first and treats wildcards literally."""
+
+    response = await api_client.get(
+        "/api/v1/organizations/search/by-name",
+        params={"query": "ооо «м"},
+        headers=api_key_header,
+    )
+    assert [item["id"] for item in response.json()["items"]] == [3, 2]
+
+    response = await api_client.get(
+        "/api/v1/organizations/search/by-name",
+        params={"query": "%%"},
+        headers=api_key_header,
+    )
+    assert response.json()["items"] == []
+
+
 async def test_activity_tree(api_client: AsyncClient, api_key_header: dict[str, str]) -> None:
     """Activity tree endpoint returns expected hierarchy depth."""
 
@@ -74,3 +115,252 @@ async def test_activity_tree(api_client: AsyncClient, api_key_header: dict[str,
     assert len(payload) == 2  # Еда, Автомобили
     food = next(item for item in payload if item["name"] == "Еда")
     assert len(food["children"]) == 2
+
+
+async def test_organizations_keyset_pagination(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Paging through a listing returns every organization exactly once."""
+
+    seen: list[int] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = await api_client.get(
+            "/api/v1/organizations/by-activity/1",
+            params=params,
+            headers=api_key_header,
+        )
+        assert response.status_code == 200
+        payload = response.json()
+        assert len(payload["items"]) <= 2
+        seen.extend(item["id"] for item in payload["items"])
+        if payload["next_cursor"] is None:
+            break
+        params["cursor"] = payload["next_cursor"]
+    assert seen == [1, 2, 3]
+
+    response = await api_client.get(
+        "/api/v1/organizations/by-activity/1",
+        params={"cursor": "not-a-cursor"},
+        headers=api_key_header,
+    )
+    assert response.status_code == 422
+
+
+async def test_organizations_in_radius_nearest_first(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Radius search pages by distance from the center point."""
+
+    params = {"latitude": 59.93, "longitude": 30.36, "radius_km": 1000, "limit": 1}
+    response = await api_client.get(
+        "/api/v1/organizations/geo", params=params, headers=api_key_header
+    )
+    assert response.status_code == 200
+    first = response.json()
+    assert [item["id"] for item in first["items"]] == [4]
+
+    response = await api_client.get(
+        "/api/v1/organizations/geo",
+        params={**params, "limit": 10, "cursor": first["next_cursor"]},
+        headers=api_key_header,
+    )
+    payload = response.json()
+    assert [item["id"] for item in payload["items"]] == [5, 2, 3]
+    assert payload["next_cursor"] is None
+
+
+async def test_geo_results_carry_distances_and_ordering(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Geo results include distances from the center and honour ``order_by``."""
+
+    async def geo(**params: object) -> list[tuple[int, float]]:
+        response = await api_client.get(
+            "/api/v1/organizations/geo", params=params, headers=api_key_header
+        )
+        assert response.status_code == 200
+        return [(item["id"], item["distance_km"]) for item in response.json()["items"]]
+
+    center = {"latitude": 59.93, "longitude": 30.36}
+    by_distance = await geo(**center, radius_km=1000)
+    assert [org_id for org_id, _ in by_distance] == [4, 5, 2, 3]
+    assert await geo(**center, radius_km=1000, order_by="id") == sorted(by_distance)
+
+    box = {"min_latitude": 50, "max_latitude": 60, "min_longitude": 30, "max_longitude": 40}
+    by_id = await geo(**center, **box)
+    nearest_first = await geo(**center, **box, order_by="distance")
+    assert [org_id for org_id, _ in by_id] == sorted(org_id for org_id, _ in by_id)
+    assert sorted(nearest_first) == by_id
+    assert [km for _, km in nearest_first] == sorted(km for _, km in by_id)
+    assert dict(by_id) == pytest.approx(dict(by_distance))
+
+    response = await api_client.get(
+        "/api/v1/organizations/geo",
+        params={**center, **box, "order_by": "distance"},
+        headers={**api_key_header, "Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 422
+
+
+async def test_map_clusters(api_client: AsyncClient, api_key_header: dict[str, str]) -> None:
+    """Clusters merge nearby buildings at low zoom and split them when zoomed in."""
+
+    async def clusters(zoom: int) -> list[dict[str, float]]:
+        response = await api_client.get(
+            "/api/v1/geo/clusters",
+            params={
+                "min_latitude": 50,
+                "max_latitude": 65,
+                "min_longitude": 25,
+                "max_longitude": 90,
+                "zoom": zoom,
+            },
+            headers=api_key_header,
+        )
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["zoom"] == zoom
+        return payload["clusters"]
+
+    wide, close = await clusters(1), await clusters(5)
+    # Moscow and Saint Petersburg share a cell at zoom 1; Novosibirsk does not.
+    assert [cluster["buildings"] for cluster in wide] == [2, 1]
+    assert [cluster["buildings"] for cluster in close] == [1, 1, 1]
+    assert wide[0]["latitude"] == pytest.approx((55.7522 + 59.9316) / 2)
+    assert sum(cluster["organizations"] for cluster in wide) == sum(
+        cluster["organizations"] for cluster in close
+    )
+
+    response = await api_client.get(
+        "/api/v1/geo/clusters",
+        params={
+            "min_latitude": -90,
+            "max_latitude": 90,
+            "min_longitude": -180,
+            "max_longitude": 180,
+            "zoom": 12,
+        },
+        headers=api_key_header,
+    )
+    assert response.status_code == 422
+
+
+async def test_sparse_organization_fields(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Summary views and field lists return only the requested organization fields."""
+
+    async def items(path: str, **params: object) -> list[dict[str, object]]:
+        response = await api_client.get(path, params=params, headers=api_key_header)
+        assert response.status_code == 200
+        payload = response.json()
+        return payload["items"] if "items" in payload else [payload]
+
+    full = await items("/api/v1/organizations/by-building/1")
+    summary = await items("/api/v1/organizations/by-building/1", view="summary")
+    assert [set(item) for item in summary] == [{"id", "name", "description", "building_id"}] * 2
+    assert [item["name"] for item in summary] == [item["name"] for item in full]
+
+    [detailed] = await items("/api/v1/organizations/1")
+    [phones] = await items("/api/v1/organizations/1", fields="name,phones")
+    assert phones == {"id": 1, "name": detailed["name"], "phones": detailed["phones"]}
+
+    geo = await items(
+        "/api/v1/organizations/geo",
+        latitude=55.75,
+        longitude=37.61,
+        min_latitude=50,
+        max_latitude=60,
+        min_longitude=30,
+        max_longitude=40,
+        fields="name",
+    )
+    assert {frozenset(item) for item in geo} == {frozenset({"id", "name", "distance_km"})}
+
+    response = await api_client.get(
+        "/api/v1/organizations/1", params={"fields": "name,secret"}, headers=api_key_header
+    )
+    assert response.status_code == 422
+
+
+async def test_batch_lookups_by_ids(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Batch endpoints key found items by id in request order and list the misses."""
+
+    async def batch(path: str, ids: list[int], **params: object) -> dict[str, object]:
+        response = await api_client.post(
+            path, json={"ids": ids}, params=params, headers=api_key_header
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    organizations = await batch("/api/v1/organizations/batch", [3, 999, 1, 3])
+    assert list(organizations["items"]) == ["3", "1"]
+    assert organizations["missing"] == [999]
+    single = await api_client.get("/api/v1/organizations/1", headers=api_key_header)
+    assert organizations["items"]["1"] == single.json()
+
+    summary = await batch("/api/v1/organizations/batch", [2], view="summary")
+    assert set(summary["items"]["2"]) == {"id", "name", "description", "building_id"}
+
+    buildings = await batch("/api/v1/buildings/batch", [2, 998])
+    assert buildings["items"]["2"]["name"] == "БЦ Аврора"
+    assert buildings["missing"] == [998]
+
+    activities = await batch("/api/v1/activities/batch", [997, 1])
+    assert activities["items"]["1"]["parent_id"] is None
+    assert activities["missing"] == [997]
+
+    for ids in ([], list(range(1, 102))):
+        response = await api_client.post(
+            "/api/v1/buildings/batch", json={"ids": ids}, headers=api_key_header
+        )
+        assert response.status_code == 422
+
+
+async def test_nearest_organizations(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Nearest endpoint returns k organizations ordered by distance."""
+
+    response = await api_client.get(
+        "/api/v1/organizations/nearest",
+        params={"latitude": 55.75, "longitude": 37.61, "k": 3},
+        headers=api_key_header,
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [item["id"] for item in payload] == [2, 3, 4]
+    distances = [item["distance_km"] for item in payload]
+    assert distances == sorted(distances)
+    assert distances[0] < 1
+    assert 600 < distances[2] < 700
+
+
+async def test_combined_search_intersects_filters(
+    api_client: AsyncClient, api_key_header: dict[str, str]
+) -> None:
+    """Combined search returns organizations matching every filter at once."""
+
+    async def search(**params: object) -> list[int]:
+        response = await api_client.get(
+            "/api/v1/organizations/search", params=params, headers=api_key_header
+        )
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()["items"]]
+
+    moscow = {"latitude": 55.75, "longitude": 37.61, "radius_km": 5}
+    assert await search(activity_id=1, **moscow) == [2, 3]
+    assert await search(activity_id=1, name="мяс", **moscow) == [3]
+    assert await search(building_id=2, activity_id=7) == [4, 5]
+    assert await search(building_id=2, activity_id=1) == []
+    assert await search(
+        activity_id=4, min_latitude=59, max_latitude=60, min_longitude=30, max_longitude=31
+    ) == [4, 5]
+
+    response = await api_client.get(
+        "/api/v1/organizations/search", params={"radius_km": 5}, headers=api_key_header
+    )
+    assert response.status_code == 422
@@ -0,0 +1,122 @@
+"""Tests for the in-process building grid index."""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from org_catalog.db.changes import ChangeTracker
+from org_catalog.models.building import Building
+from org_catalog.services.building_index import BuildingGrid, BuildingIndex
+from org_catalog.services.geolocation import haversine_distance_km
+from org_catalog.services.organization import OrganizationService
+from org_catalog.services.pagination import PageRequest
+
+
+def test_grid_matches_brute_force() -> None:
+    """Rectangle and radius lookups agree with scanning every point, across moves and removals."""
+
+    rng = random.Random(7)
+    points = {i: (rng.uniform(55.0, 56.0), rng.uniform(37.0, 38.0)) for i in range(1, 500)}
+    grid = BuildingGrid(cell_degrees=0.1)
+    for building_id, (latitude, longitude) in points.items():
+        grid.upsert(building_id, latitude, longitude)
+    for building_id in range(1, 500, 3):
+        del points[building_id]
+        grid.remove(building_id)
+    for building_id in range(2, 500, 5):
+        if building_id in points:
+            points[building_id] = (rng.uniform(55.0, 56.0), rng.uniform(37.0, 38.0))
+            grid.upsert(building_id, *points[building_id])
+
+    assert len(grid) == len(points)
+    box = (55.2, 55.6, 37.3, 37.9)
+    assert sorted(grid.in_rectangle(*box)) == sorted(
+        building_id
+        for building_id, (latitude, longitude) in points.items()
+        if box[0] <= latitude <= box[1] and box[2] <= longitude <= box[3]
+    )
+    assert sorted(grid.in_rectangle(-90, 90, -180, 180)) == sorted(points)
+
+    ids, distances = grid.in_radius(55.5, 37.5, 20)
+    expected = {
+        building_id: haversine_distance_km(55.5, 37.5, latitude, longitude)
+        for building_id, (latitude, longitude) in points.items()
+    }
+    assert dict(zip(ids, distances, strict=True)) == pytest.approx(
+        {building_id: distance for building_id, distance in expected.items() if distance <= 20}
+    )
+
+
+async def test_index_follows_building_changes(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Moved, added and deleted buildings are picked up on the next lookup.
+
+    Changes are found through the change counter alone, whatever the rows'
+    ``updated_at`` says.
+    """
+
+    index = BuildingIndex(ChangeTracker())
+    async with session_factory() as session:
+        try:
+            grid = await index.get(session)
+            assert 1 in grid
+            assert await index.get(session) is grid
+
+            await session.execute(
+                update(Building)
+                .where(Building.id == 1)
+                .values(
+                    latitude=-45.0,
+                    longitude=170.0,
+                    updated_at=datetime(2000, 1, 1, tzinfo=UTC),
+                )
+            )
+            grid = await index.get(session)
+            assert grid.in_rectangle(-46, -44, 169, 171) == [1]
+            new_id = await session.scalar(
+                insert(Building)
+                .values(name="Новое", address="Адрес", latitude=-45.1, longitude=170.1)
+                .returning(Building.id)
+            )
+            grid = await index.get(session)
+            assert sorted(grid.in_rectangle(-46, -44, 169, 171)) == sorted([1, new_id])
+
+            await session.execute(delete(Building).where(Building.id == new_id))
+            grid = await index.get(session)
+            assert new_id not in grid
+            assert grid.in_rectangle(-46, -44, 169, 171) == [1]
+        finally:
+            await session.rollback()
+
+
+async def test_indexed_lookups_match_sql(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Radius and rectangle lookups return the same pages with and without the index."""
+
+    async with session_factory() as session:
+        plain = OrganizationService(session)
+        indexed = OrganizationService(session, building_index=BuildingIndex(ChangeTracker()))
+
+        def ids(page) -> list[int]:
+            return [item.id for item in page.items]
+
+        page = PageRequest(limit=2)
+        expected = await plain.in_rectangle(55.0, 60.0, 30.0, 38.0, page)
+        actual = await indexed.in_rectangle(55.0, 60.0, 30.0, 38.0, page)
+        assert ids(actual) == ids(expected)
+        assert actual.next_cursor == expected.next_cursor
+        assert (await indexed.in_rectangle(0.0, 1.0, 0.0, 1.0)).items == []
+
+        expected = await plain.in_radius(59.93, 30.36, 1000)
+        actual = await indexed.in_radius(59.93, 30.36, 1000)
+        assert [(org.id, round(km, 6)) for org, km in actual.items] == [
+            (org.id, round(km, 6)) for org, km in expected.items
+        ]
+        assert [org.id for org, _ in await indexed.nearest(55.75, 37.61, 3)] == [2, 3, 4]
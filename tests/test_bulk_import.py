@@ -0,0 +1,234 @@
+"""Tests for the bulk import API."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from org_catalog.core.config import Settings
+from org_catalog.db.session import engine_options
+from org_catalog.services import bulk_import
+from org_catalog.services.bulk_import import ImportDataset, ImportFormat, ImportService
+
+BUILDINGS_CSV = """id,name,address,latitude,longitude
+9001,Склад,"г. Москва,
+ул. Импортная, 1",55.1,37.1
+9002,Офис,г. Москва,55.2,37.2
+"""
+
+
+@pytest.fixture
+async def imported_ids(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[None, None]:
+    """Remove rows created by the import tests."""
+
+    yield
+    async with session_factory() as session:
+        await session.execute(text("DELETE FROM organizations WHERE id >= 9001"))
+        await session.execute(text("DELETE FROM buildings WHERE id >= 9001"))
+        await session.commit()
+
+
+def _ndjson(*records: dict) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+async def _post(
+    client: AsyncClient, headers: dict[str, str], dataset: str, body: str, media_type: str
+):
+    return await client.post(
+        f"/api/v1/import/{dataset}",
+        content=body.encode(),
+        headers={**headers, "Content-Type": media_type},
+    )
+
+
+@pytest.mark.usefixtures("imported_ids")
+async def test_import_upserts_catalog_records(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """CSV and NDJSON records are inserted, then updated only where they changed."""
+
+    buildings = await _post(api_client, api_key_header, "buildings", BUILDINGS_CSV, "text/csv")
+    organizations = await _post(
+        api_client,
+        api_key_header,
+        "organizations",
+        _ndjson(
+            {"id": 9001, "name": "Импорт", "building_id": 9001},
+            {"id": 9002, "name": "Дубль", "building_id": 9001},
+            {"id": 9002, "name": "Импорт 2", "building_id": 9002},
+        ),
+        "application/x-ndjson",
+    )
+    phones = await _post(
+        api_client,
+        api_key_header,
+        "phones",
+        "organization_id,number,label\n9001,+7-900-000-00-01,\n9001,+7-900-000-00-02,Факс\n",
+        "text/csv",
+    )
+    links = await _post(
+        api_client,
+        api_key_header,
+        "activity_links",
+        _ndjson({"organization_id": 9001, "activity_id": 1}),
+        "application/x-ndjson",
+    )
+
+    assert buildings.json() == {
+        "dataset": "buildings",
+        "batches": 1,
+        "rows": 2,
+        "inserted": 2,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    assert organizations.json()["inserted"] == 2
+    assert organizations.json()["unchanged"] == 1
+    assert phones.json()["inserted"] == 2
+    assert links.json()["inserted"] == 1
+
+    detail = (await api_client.get("/api/v1/organizations/9001", headers=api_key_header)).json()
+    assert detail["building"]["address"] == "г. Москва,\nул. Импортная, 1"
+    assert sorted(phone["number"] for phone in detail["phones"]) == [
+        "+7-900-000-00-01",
+        "+7-900-000-00-02",
+    ]
+    assert [activity["id"] for activity in detail["activities"]] == [1]
+    second = (await api_client.get("/api/v1/organizations/9002", headers=api_key_header)).json()
+    assert second["name"] == "Импорт 2"
+
+    again = await _post(
+        api_client,
+        api_key_header,
+        "buildings",
+        BUILDINGS_CSV.replace("Офис", "Офис 2"),
+        "text/csv",
+    )
+    assert (again.json()["inserted"], again.json()["updated"], again.json()["unchanged"]) == (
+        0,
+        1,
+        1,
+    )
+
+
+@pytest.mark.usefixtures("imported_ids")
+async def test_import_rejects_invalid_input_atomically(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """Broken records fail the whole import with 422 and change nothing."""
+
+    missing_building = await _post(
+        api_client,
+        api_key_header,
+        "organizations",
+        _ndjson(
+            {"id": 9001, "name": "Есть здание", "building_id": 1},
+            {"id": 9002, "name": "Нет здания", "building_id": 99999},
+        ),
+        "application/x-ndjson",
+    )
+    bad_value = await _post(
+        api_client, api_key_header, "buildings", "id,name\n9001,\n", "text/csv"
+    )
+    bad_coordinates = [
+        await _post(
+            api_client,
+            api_key_header,
+            "buildings",
+            f"id,name,address,latitude,longitude\n9001,Склад,г. Москва,{latitude},{longitude}\n",
+            "text/csv",
+        )
+        for latitude, longitude in [("123", "37.1"), ("55.1", "-inf"), ("nan", "37.1")]
+    ]
+    fractional_id = await _post(
+        api_client,
+        api_key_header,
+        "organizations",
+        _ndjson({"id": 9001.9, "name": "Дробный", "building_id": 1}),
+        "application/x-ndjson",
+    )
+    wrong_type = await _post(api_client, api_key_header, "buildings", "{}", "application/json")
+
+    assert missing_building.status_code == 422
+    assert bad_value.status_code == 422
+    assert "name is required" in bad_value.json()["detail"]
+    assert fractional_id.status_code == 422
+    assert [response.status_code for response in bad_coordinates] == [422, 422, 422]
+    assert "invalid latitude '123'" in bad_coordinates[0].json()["detail"]
+    assert "invalid id 9001.9" in fractional_id.json()["detail"]
+    assert wrong_type.status_code == 415
+    missing = await api_client.get("/api/v1/organizations/9001", headers=api_key_header)
+    assert missing.status_code == 404
+
+
+@pytest.mark.usefixtures("imported_ids")
+async def test_csv_import_splits_records_across_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Quoted fields span chunk boundaries and literal quotes in plain fields stay intact."""
+
+    data = (
+        "id,name,address,latitude,longitude\n"
+        '9001,Труба 2",г. Москва,55.1,37.1\n'
+        '9002,Склад,"г. Москва,\n'
+        'ул. ""Импортная"",\n'
+        '1",55.2,37.2\n'
+    ).encode()
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    async with session_factory() as session:
+        progress = await ImportService(session).load(
+            ImportDataset.BUILDINGS, ImportFormat.CSV, body()
+        )
+        rows = (
+            await session.execute(
+                text("SELECT name, address FROM buildings WHERE id >= 9001 ORDER BY id")
+            )
+        ).all()
+
+    assert progress.rows == 2
+    assert [tuple(row) for row in rows] == [
+        ('Труба 2"', "г. Москва"),
+        ("Склад", 'г. Москва,\nул. "Импортная",\n1'),
+    ]
+
+
+async def test_import_outlives_statement_timeout(
+    test_database_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Merges running longer than the statement timeout complete the import."""
+
+    monkeypatch.setattr(
+        bulk_import,
+        "merge_sql",
+        lambda target, staging: "SELECT 0 AS inserted, 0 AS updated FROM pg_sleep(0.3)",
+    )
+    settings = Settings(db_statement_timeout_ms=100)
+    engine = create_async_engine(test_database_url, **engine_options(settings))
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        yield b"organization_id,number\n1,+7-000-000\n"
+
+    try:
+        async with async_sessionmaker(engine)() as session:
+            progress = await ImportService(session).load(
+                ImportDataset.PHONES, ImportFormat.CSV, body()
+            )
+    finally:
+        await engine.dispose()
+
+    assert progress.rows == 1
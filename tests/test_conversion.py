@@ -0,0 +1,29 @@
+"""Tests for ORM to schema conversion."""
+
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from org_catalog.schemas.organization import OrganizationDetailed, OrganizationWithDistance
+from org_catalog.services.conversion import OrganizationConverter
+from org_catalog.services.organization import OrganizationService
+from org_catalog.services.pagination import PageRequest
+
+
+async def test_converter_matches_plain_validation(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Reusing shared relations yields the same schemas as validating each organization."""
+
+    async with session_factory() as session:
+        page = await OrganizationService(session).in_rectangle(
+            -90.0, 90.0, -180.0, 180.0, PageRequest(limit=100)
+        )
+        converter = OrganizationConverter()
+        converted = [converter.detailed(org) for org in page.items]
+        expected = [OrganizationDetailed.model_validate(org) for org in page.items]
+        with_distance = converter.detailed(page.items[0], OrganizationWithDistance, distance_km=1.5)
+
+    assert converted == expected
+    assert with_distance.distance_km == 1.5
+    assert with_distance.building == expected[0].building
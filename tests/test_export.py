@@ -0,0 +1,105 @@
+"""Tests for bulk catalog exports."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from org_catalog.core.config import Settings
+from org_catalog.db.session import engine_options
+from org_catalog.services import export
+from org_catalog.services.export import ExportDataset, ExportService
+
+
+async def _organizations(api_client: AsyncClient, headers: dict[str, str]) -> list[dict]:
+    response = await api_client.get(
+        "/api/v1/organizations/geo",
+        params={
+            "latitude": 0,
+            "longitude": 0,
+            "min_latitude": -90,
+            "max_latitude": 90,
+            "min_longitude": -180,
+            "max_longitude": 180,
+            "limit": 500,
+        },
+        headers=headers,
+    )
+    return response.json()["items"]
+
+
+async def test_organizations_csv_export_is_denormalized(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """CSV rows carry the building, phones and activities of every organization."""
+
+    response = await api_client.get("/api/v1/export/organizations", headers=api_key_header)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="organizations.csv"' in response.headers["content-disposition"]
+    assert "etag" in response.headers
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    expected = await _organizations(api_client, api_key_header)
+    assert [int(row["id"]) for row in rows] == [org["id"] for org in expected]
+    for row, org in zip(rows, expected, strict=True):
+        assert row["building_address"] == org["building"]["address"]
+        assert set(json.loads(row["phones"])) == {phone["number"] for phone in org["phones"]}
+        assert json.loads(row["activity_ids"]) == sorted(
+            activity["id"] for activity in org["activities"]
+        )
+        assert len(json.loads(row["activity_names"])) == len(org["activities"])
+
+
+async def test_activities_parquet_export(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """Parquet exports are typed, with aggregated columns turned into lists."""
+
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    activities = await api_client.get(
+        "/api/v1/export/activities", params={"format": "parquet"}, headers=api_key_header
+    )
+    organizations = await api_client.get(
+        "/api/v1/export/organizations", params={"format": "parquet"}, headers=api_key_header
+    )
+
+    assert activities.status_code == 200
+    assert activities.headers["content-type"] == "application/vnd.apache.parquet"
+    tree = pq.read_table(io.BytesIO(activities.content)).to_pylist()
+    assert all(row["level"] == 1 for row in tree if row["parent_id"] is None)
+    assert all(1 <= row["level"] <= 3 for row in tree)
+    table = pq.read_table(io.BytesIO(organizations.content))
+    expected = await _organizations(api_client, api_key_header)
+    assert table.num_rows == len(expected)
+    for row, org in zip(table.to_pylist(), expected, strict=True):
+        assert set(row["phones"]) == {phone["number"] for phone in org["phones"]}
+        assert row["activity_ids"] == sorted(a["id"] for a in org["activities"])
+
+
+async def test_export_outlives_statement_timeout(
+    test_database_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A ``COPY`` running longer than the statement timeout is streamed to the end."""
+
+    monkeypatch.setattr(
+        export, "export_sql", lambda dataset: "SELECT 1 AS slept FROM pg_sleep(0.3)"
+    )
+    settings = Settings(db_statement_timeout_ms=100)
+    engine = create_async_engine(test_database_url, **engine_options(settings))
+    try:
+        async with async_sessionmaker(engine)() as session:
+            chunks = [chunk async for chunk in ExportService(session).csv(ExportDataset.BUILDINGS)]
+    finally:
+        await engine.dispose()
+
+    assert b"".join(chunks) == b"slept\n1\n"
@@ -0,0 +1,39 @@
+"""Tests for geolocation helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from org_catalog.services import geolocation
+from org_catalog.services.geolocation import (
+    distances_within_radius_km,
+    haversine_distance_km,
+    haversine_distances_km,
+)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_batch_distances_match_scalar_formula(
+    backend: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batch distances and radius masks agree with the scalar Haversine distance.
+
+    Both the pure Python loop and the NumPy path are checked; the latter is
+    skipped when NumPy is not installed.
+    """
+
+    numpy = pytest.importorskip("numpy") if backend == "numpy" else None
+    monkeypatch.setattr(geolocation, "np", numpy)
+    latitudes = [55.75, 59.93, -33.86, 55.75]
+    longitudes = [37.61, 30.36, 151.21, 37.61]
+    expected = [
+        haversine_distance_km(55.75, 37.61, lat, lon)
+        for lat, lon in zip(latitudes, longitudes, strict=True)
+    ]
+
+    assert haversine_distances_km(55.75, 37.61, latitudes, longitudes) == pytest.approx(expected)
+    distances, inside = distances_within_radius_km(55.75, 37.61, latitudes, longitudes, 700)
+    assert distances == pytest.approx(expected)
+    assert inside == [True, True, False, True]
+    assert haversine_distances_km(0, 0, [], []) == []
@@ -0,0 +1,159 @@
+"""Tests for conditional GET handling."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from httpx import AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from org_catalog.db.changes import ChangeListener, ChangeTracker
+
+
+async def test_matching_etag_is_answered_without_loading_data(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    async_engine: AsyncEngine,
+) -> None:
+    """A current ETag yields 304 after a single counter lookup."""
+
+    first = await api_client.get("/api/v1/organizations/by-building/1", headers=api_key_header)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "max-age=0, must-revalidate"
+    assert first.headers["vary"] == "X-API-Key, Accept"
+    assert "last-modified" in first.headers
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        second = await api_client.get(
+            "/api/v1/organizations/by-building/1",
+            headers={**api_key_header, "If-None-Match": etag},
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert len(statements) == 1
+    assert "catalog_versions" in statements[0]
+
+
+async def test_negotiated_representations_have_distinct_etags(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """JSON and NDJSON responses of one URL are validated separately."""
+
+    path = "/api/v1/organizations/geo"
+    params = {
+        "latitude": 55,
+        "longitude": 37,
+        "min_latitude": 50,
+        "max_latitude": 60,
+        "min_longitude": 30,
+        "max_longitude": 40,
+    }
+    ndjson = {**api_key_header, "Accept": "application/x-ndjson"}
+    json_response = await api_client.get(path, params=params, headers=api_key_header)
+    ndjson_response = await api_client.get(path, params=params, headers=ndjson)
+    json_tag, ndjson_tag = json_response.headers["etag"], ndjson_response.headers["etag"]
+    assert json_tag != ndjson_tag
+    assert ndjson_response.headers["vary"] == "X-API-Key, Accept"
+
+    stale_format = await api_client.get(
+        path, params=params, headers={**ndjson, "If-None-Match": json_tag}
+    )
+    assert stale_format.status_code == 200
+    assert stale_format.headers["content-type"] == "application/x-ndjson"
+    current = await api_client.get(
+        path, params=params, headers={**ndjson, "If-None-Match": ndjson_tag}
+    )
+    assert current.status_code == 304
+
+
+async def test_etag_changes_after_write(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Writes to a watched table invalidate previously issued validators."""
+
+    buildings = await api_client.get("/api/v1/buildings", headers=api_key_header)
+    activities = await api_client.get("/api/v1/activities/tree", headers=api_key_header)
+
+    async with session_factory() as session:
+        await session.execute(text("UPDATE buildings SET name = name WHERE id = 1"))
+        await session.commit()
+
+    stale = await api_client.get(
+        "/api/v1/buildings",
+        headers={**api_key_header, "If-None-Match": buildings.headers["etag"]},
+    )
+    assert stale.status_code == 200
+    assert stale.headers["etag"] != buildings.headers["etag"]
+
+    unaffected = await api_client.get(
+        "/api/v1/activities/tree",
+        headers={**api_key_header, "If-None-Match": activities.headers["etag"]},
+    )
+    assert unaffected.status_code == 304
+
+
+async def test_if_modified_since(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """If-Modified-Since is honoured when no entity tag is sent."""
+
+    response = await api_client.get("/api/v1/buildings/1", headers=api_key_header)
+    last_modified = response.headers["last-modified"]
+
+    fresh = await api_client.get(
+        "/api/v1/buildings/1",
+        headers={**api_key_header, "If-Modified-Since": last_modified},
+    )
+    assert fresh.status_code == 304
+
+    outdated = await api_client.get(
+        "/api/v1/buildings/1",
+        headers={
+            **api_key_header,
+            "If-Modified-Since": last_modified,
+            "If-None-Match": 'W/"0"',
+        },
+    )
+    assert outdated.status_code == 200
+
+
+async def test_listening_tracker_serves_snapshot_from_memory(
+    async_engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Notifications update counters and change times without queries."""
+
+    tracker = ChangeTracker()
+    listener = ChangeListener(tracker, async_engine.url)
+    async with session_factory() as session:
+        initial = await tracker.snapshot(session, ["buildings", "activities"])
+        tracker.listening = True
+        listener._on_notification(None, 0, "catalog_changes", "buildings:1000:1700000000.25")
+
+        async def fail(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("snapshot queried the database")
+
+        session.execute = fail  # type: ignore[method-assign]
+        updated = await tracker.snapshot(session, ["buildings", "activities"])
+        buildings = await tracker.snapshot(session, ["buildings"])
+
+    assert updated.version > initial.version
+    assert buildings.version == 1000
+    assert buildings.changed_at == datetime.fromtimestamp(1700000000.25, UTC)
@@ -0,0 +1,77 @@
+"""Tests for the Prometheus metrics endpoint and cross-worker aggregation."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from org_catalog.core.metrics import MetricsRegistry, WorkerMetricsStore
+
+
+def _sample(text: str, prefix: str) -> float:
+    """Return the value of the first line starting with the prefix."""
+
+    line = next(line for line in text.splitlines() if line.startswith(prefix))
+    return float(line.rsplit(" ", 1)[1])
+
+
+async def test_metrics_report_requests_by_route(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """Requests are counted per route and status, with latency histograms."""
+
+    await api_client.get("/api/v1/buildings/1", headers=api_key_header)
+    await api_client.get("/api/v1/buildings/999999", headers=api_key_header)
+    await api_client.get("/api/v1/activities/tree", headers=api_key_header)
+
+    response = await api_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    route = 'method="GET",route="get_building"'
+    assert _sample(body, f"org_catalog_http_requests_total{{{route},status=\"200\"}}") >= 1
+    assert _sample(body, f"org_catalog_http_requests_total{{{route},status=\"404\"}}") >= 1
+    latency = f'org_catalog_http_request_duration_seconds_bucket{{{route},le="+Inf"}}'
+    assert _sample(body, latency) >= 2
+    assert "# TYPE org_catalog_db_pool_checked_out gauge" in body
+    assert "# TYPE org_catalog_db_pool_wait_seconds histogram" in body
+    assert 0 <= _sample(body, 'org_catalog_cache_hit_ratio{cache="activity_tree"}') <= 1
+
+
+def test_worker_samples_are_merged(tmp_path: Path) -> None:
+    """Counters and histograms add up across workers; gauges of exited workers are dropped."""
+
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("cache", "result"))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge("connections", "Connections.", (), lambda: {(): 3.0})
+    registry.hit_ratio("hit_ratio", "Hit ratio.", requests, "hit")
+
+    requests.inc("result", "hit", amount=3)
+    latency.observe(0.05)
+    running = {"requests_total": [[["result", "hit"], 1.0]], "connections": [[[], 4.0]]}
+    exited = {
+        "requests_total": [[["result", "miss"], 4.0]],
+        "latency_seconds": [[[], [[0, 1, 0], 0.5]]],
+        "connections": [[[], 100.0]],
+    }
+    store = WorkerMetricsStore(tmp_path)
+    # The test process's parent stands in for a running worker.
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(running))
+    (tmp_path / "retired-1-0.json").write_text(json.dumps(exited))
+    store.publish(registry.snapshot())
+
+    body = registry.render(registry.snapshot(), store.others())
+
+    assert 'requests_total{cache="result",result="hit"} 4' in body
+    assert 'requests_total{cache="result",result="miss"} 4' in body
+    assert 'latency_seconds_bucket{le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{le="1"} 2' in body
+    assert "latency_seconds_count 2" in body
+    assert "connections 7" in body
+    assert 'hit_ratio{cache="result"} 0.5' in body
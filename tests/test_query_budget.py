@@ -0,0 +1,121 @@
+"""Tests bounding the SQL statements issued per request."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from org_catalog.api.deps import get_result_cache
+from org_catalog.core.config import get_settings
+from org_catalog.db.instrumentation import QueryStats
+from org_catalog.main import create_app
+from org_catalog.services.result_cache import ResultCache
+
+# Every request also reads the catalog change counters for its ETag.
+BUDGETS = [
+    ("/api/v1/organizations/1", 2),
+    ("/api/v1/organizations/by-building/1", 5),
+    ("/api/v1/organizations/by-building/1?view=summary", 3),
+    ("/api/v1/organizations/by-activity/1", 5),
+    ("/api/v1/organizations/search/by-activity?name=Еда", 4),
+    ("/api/v1/organizations/search/by-name?query=Рога", 4),
+    (
+        "/api/v1/organizations/search?activity_id=1&name=мяс"
+        "&latitude=55.75&longitude=37.6&radius_km=5",
+        4,
+    ),
+    ("/api/v1/organizations/geo?latitude=55.75&longitude=37.6&radius_km=5", 4),
+    (
+        "/api/v1/organizations/geo?latitude=55&longitude=37"
+        "&min_latitude=50&max_latitude=60&min_longitude=30&max_longitude=40",
+        4,
+    ),
+    ("/api/v1/organizations/nearest?latitude=55.75&longitude=37.6&k=3", 5),
+    (
+        "/api/v1/geo/clusters?zoom=4"
+        "&min_latitude=40&max_latitude=70&min_longitude=20&max_longitude=60",
+        2,
+    ),
+    ("/api/v1/buildings", 2),
+    ("/api/v1/buildings/1", 2),
+    ("/api/v1/activities/tree", 2),
+    ("/api/v1/activities/1/tree", 3),
+]
+
+
+@pytest.mark.parametrize(("path", "budget"), BUDGETS)
+async def test_endpoint_statement_budget(
+    app,
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    query_budget: Callable[[int], AbstractContextManager[QueryStats]],
+    path: str,
+    budget: int,
+) -> None:
+    """Uncached requests stay within their statement budget, whatever the result size."""
+
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache(None)
+    # Process-wide caches such as the activity hierarchy are warmed first.
+    await api_client.get(path, headers=api_key_header)
+
+    with query_budget(budget):
+        response = await api_client.get(path, headers=api_key_header)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    ("path", "budget"),
+    [
+        ("/api/v1/organizations/batch", 4),
+        ("/api/v1/organizations/batch?view=summary", 1),
+        ("/api/v1/buildings/batch", 1),
+        ("/api/v1/activities/batch", 1),
+    ],
+)
+async def test_batch_statement_budget(
+    app,
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    query_budget: Callable[[int], AbstractContextManager[QueryStats]],
+    path: str,
+    budget: int,
+) -> None:
+    """Batch lookups resolve every id with the same statements, however many are asked."""
+
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache(None)
+    for ids in ([1], list(range(1, 101))):
+        with query_budget(budget):
+            response = await api_client.post(path, json={"ids": ids}, headers=api_key_header)
+        assert response.status_code == 200
+
+
+async def test_debug_mode_reports_statements_in_headers(
+    monkeypatch: pytest.MonkeyPatch,
+    api_key_header: dict[str, str],
+    app,
+) -> None:
+    """Debug responses carry statement count and database time."""
+
+    monkeypatch.setenv("ORG_CATALOG_DEBUG", "true")
+    get_settings.cache_clear()
+    try:
+        debug_app = create_app()
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+    debug_app.dependency_overrides = app.dependency_overrides
+
+    transport = ASGITransport(app=debug_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/buildings/1", headers=api_key_header)
+        health = await client.get("/health")
+
+    assert int(response.headers["x-db-statements"]) >= 1
+    assert float(response.headers["x-db-time-ms"]) > 0
+    assert float(response.headers["x-db-slowest-ms"]) <= float(response.headers["x-db-time-ms"])
+    assert health.headers["x-db-statements"] == "0"
+    assert "x-db-slowest-ms" not in health.headers
@@ -0,0 +1,191 @@
+"""Query plan regression tests for service statements.
+
+Each test seeds a catalog large enough for the planner to prefer indexes
+wherever one can serve the query, refreshes statistics, captures every
+statement a service method issues and explains it. Everything runs in a
+transaction that is rolled back, so seeded rows and statistics are discarded.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from org_catalog.services.activity import ActivityService
+from org_catalog.services.clustering import ClusterService
+from org_catalog.services.loading import OrganizationLoading
+from org_catalog.services.organization import (
+    BuildingService,
+    OrganizationFilters,
+    OrganizationService,
+)
+from org_catalog.services.pagination import PageRequest
+
+LARGE_TABLES = (
+    "organizations",
+    "organization_phones",
+    "organization_activities",
+    "buildings",
+    "activity_closure",
+)
+
+SEED_STATEMENTS = (
+    """
+    INSERT INTO activities (id, name, parent_id)
+    SELECT 1000 + i, 'Деятельность ' || i,
+           CASE
+               WHEN i <= 50 THEN NULL
+               WHEN i <= 1000 THEN 1000 + (i - 51) % 50 + 1
+               ELSE 1000 + 51 + (i - 1001) % 950
+           END
+    FROM generate_series(1, 2000) AS i
+    """,
+    """
+    INSERT INTO buildings (id, name, address, latitude, longitude)
+    SELECT 1000 + i, 'Здание ' || i, 'Адрес ' || i,
+           40 + (i * 7919 % 3000) / 100.0, 20 + (i * 104729 % 10000) / 100.0
+    FROM generate_series(1, 2000) AS i
+    """,
+    """
+    INSERT INTO organizations (id, name, building_id)
+    SELECT 1000 + i, 'Организация ' || i, 1000 + i % 2000 + 1
+    FROM generate_series(1, 8000) AS i
+    """,
+    """
+    INSERT INTO organization_phones (organization_id, number)
+    SELECT 1000 + i, '+7-' || i || '-' || n
+    FROM generate_series(1, 8000) AS i, generate_series(1, 2) AS n
+    """,
+    """
+    INSERT INTO organization_activities (organization_id, activity_id)
+    SELECT 1000 + i, 1000 + (i * n) % 2000 + 1
+    FROM generate_series(1, 8000) AS i, generate_series(1, 2) AS n
+    ON CONFLICT DO NOTHING
+    """,
+    "ANALYZE",
+)
+
+ServiceCall = Callable[[AsyncSession], Awaitable[Any]]
+
+CASES: dict[str, ServiceCall] = {
+    "organization-get-joined": lambda s: OrganizationService(
+        s, loading=OrganizationLoading.JOINED
+    ).get(1),
+    "organization-get-selectin": lambda s: OrganizationService(s).get(1),
+    "by-building": lambda s: OrganizationService(s).by_building(1),
+    "by-building-next-page": lambda s: OrganizationService(s).by_building(
+        1, PageRequest(limit=1, after=(2,))
+    ),
+    "by-activity": lambda s: OrganizationService(s).by_activity_ids(
+        ActivityService(s).subtree_ids_query([1])
+    ),
+    "in-radius": lambda s: OrganizationService(s).in_radius(55.75, 37.61, 5),
+    "in-rectangle": lambda s: OrganizationService(s).in_rectangle(55.0, 56.0, 37.0, 38.0),
+    "nearest": lambda s: OrganizationService(s).nearest(55.75, 37.61, 3),
+    "search-building-activity": lambda s: OrganizationService(s).search(
+        OrganizationFilters(building_id=1, activity_ids=ActivityService(s).subtree_ids_query([1]))
+    ),
+    "search-radius-activity": lambda s: OrganizationService(s).search(
+        OrganizationFilters(
+            activity_ids=ActivityService(s).subtree_ids_query([1]),
+            latitude=55.75,
+            longitude=37.61,
+            radius_km=5,
+        )
+    ),
+    "map-clusters": lambda s: ClusterService(s).clusters(55.5, 56.0, 37.2, 38.0, 11),
+    "organization-get-many": lambda s: OrganizationService(s).get_many(range(1000, 1100)),
+    "activity-get-many": lambda s: ActivityService(s).get_many(range(1000, 1100)),
+    "building-get": lambda s: BuildingService(s).get(1),
+    "building-get-many": lambda s: BuildingService(s).get_many(range(1000, 1100)),
+}
+
+
+def _full_scans(plan: dict[str, Any]) -> list[str]:
+    """Return descriptions of plan nodes reading a large table end to end.
+
+    Besides sequential scans this flags index scans without an index
+    condition that filter rows, i.e. an index walked only for its order
+    while the predicate is checked row by row.
+    """
+
+    found = []
+    table = plan.get("Relation Name")
+    if table in LARGE_TABLES:
+        node = plan["Node Type"]
+        if node == "Seq Scan" or (
+            node in {"Index Scan", "Index Only Scan"}
+            and "Index Cond" not in plan
+            and "Filter" in plan
+        ):
+            found.append(f"{node} on {table} ({plan.get('Index Name', 'heap')})")
+    for child in plan.get("Plans", []):
+        found.extend(_full_scans(child))
+    return found
+
+
+async def _full_table_scans(
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+    call: ServiceCall,
+) -> list[str]:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with session_factory() as session:
+            for statement in SEED_STATEMENTS:
+                await session.execute(text(statement))
+            captured.clear()
+            await call(session)
+            connection = await session.connection()
+            scans = []
+            for statement, parameters in captured:
+                explained = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                )
+                [document] = explained.scalar_one()
+                scans.extend(_full_scans(document["Plan"]))
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    assert captured, "service call issued no statements"
+    return scans
+
+
+@pytest.mark.parametrize("case", CASES)
+async def test_service_statements_use_indexes(
+    case: str,
+    async_engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Service statements must not read large tables end to end."""
+
+    assert await _full_table_scans(async_engine, session_factory, CASES[case]) == []
+
+
+async def test_name_search_uses_trigram_index(
+    async_engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Name search is served by the trigram index where pg_trgm is installed."""
+
+    async with session_factory() as session:
+        installed = await session.scalar(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = 'ix_organizations_name_trgm'")
+        )
+    if not installed:
+        pytest.skip("pg_trgm is not available on the test server")
+
+    async def call(session: AsyncSession) -> Any:
+        return await OrganizationService(session).search_by_name("рога")
+
+    assert await _full_table_scans(async_engine, session_factory, call) == []
@@ -0,0 +1,119 @@
+"""Tests for routing reads to replicas, using a second local database as a stand-in."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import asyncpg
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from org_catalog.api import deps
+from org_catalog.db.replicas import Replica, ReplicaRouter
+from org_catalog.db.session import read_only_sessionmaker
+
+
+@pytest.fixture
+async def replica_database_url(postgres_service, test_database_url: str) -> AsyncGenerator[str]:
+    """Create an empty database standing in for a replica."""
+
+    url = make_url(test_database_url)
+    name = f"{url.database}_replica"
+    conn = await asyncpg.connect(postgres_service.admin_url)
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{name}"')
+        await conn.execute(f'CREATE DATABASE "{name}" TEMPLATE template0')
+        yield url.set(database=name).render_as_string(hide_password=False)
+        await conn.execute(f'DROP DATABASE "{name}" WITH (FORCE)')
+    finally:
+        await conn.close()
+
+
+def _replica(url: str) -> Replica:
+    """Return a replica with its own engine."""
+
+    engine = create_async_engine(url)
+    return Replica(engine, read_only_sessionmaker(engine))
+
+
+async def test_router_rotates_over_healthy_fresh_replicas(
+    test_database_url: str, replica_database_url: str
+) -> None:
+    """Reads alternate between replicas, skipping unreachable or lagging ones."""
+
+    missing_url = make_url(replica_database_url).set(database="org_catalog_missing")
+    first, second = _replica(test_database_url), _replica(replica_database_url)
+    missing = _replica(missing_url.render_as_string(hide_password=False))
+    router = ReplicaRouter([first, missing, second], max_lag=1.0)
+    try:
+        assert router.choose() is None
+        await router.check()
+
+        assert (first.healthy, missing.healthy, second.healthy) == (True, False, True)
+        assert [router.choose() for _ in range(4)] == [first.sessions, second.sessions] * 2
+
+        second.lag = 30.0
+        assert [router.choose() for _ in range(2)] == [first.sessions] * 2
+    finally:
+        await router.stop()
+
+
+async def test_reads_go_to_replica_unless_strong_consistency_is_requested(
+    monkeypatch: pytest.MonkeyPatch,
+    async_engine: AsyncEngine,
+    replica_database_url: str,
+) -> None:
+    """Reads use the replica; the consistency header and writes pin the primary.
+
+    Writes pin only the writing client's reads. POST endpoints marked
+    read-only are served like GET requests.
+    """
+
+    replica = _replica(replica_database_url)
+    router = ReplicaRouter([replica])
+    await router.check()
+    monkeypatch.setattr(deps, "replica_router", router)
+    monkeypatch.setattr(deps, "ReadOnlySessionLocal", read_only_sessionmaker(async_engine))
+    monkeypatch.setattr(deps, "SessionLocal", async_sessionmaker(async_engine))
+
+    app = FastAPI()
+
+    @app.api_route("/database", methods=["GET", "POST"])
+    async def database(db: AsyncSession = Depends(deps.get_db_session)) -> str:
+        return await db.scalar(text("SELECT current_database()"))
+
+    @app.post("/lookup")
+    @deps.read_only
+    async def lookup(db: AsyncSession = Depends(deps.get_db_session)) -> str:
+        assert await db.scalar(text("SHOW transaction_read_only")) == "on"
+        return await db.scalar(text("SELECT current_database()"))
+
+    primary = async_engine.url.database
+    replica_name = make_url(replica_database_url).database
+    try:
+        transport = ASGITransport(app=app)
+        async with (
+            AsyncClient(transport=transport, base_url="http://test") as client,
+            AsyncClient(transport=transport, base_url="http://test") as other,
+        ):
+            assert (await client.get("/database")).json() == replica_name
+            strong = await client.get(
+                "/database", headers={deps.READ_CONSISTENCY_HEADER: "strong"}
+            )
+            assert strong.json() == primary
+            assert (await client.post("/lookup")).json() == replica_name
+            assert (await client.get("/database")).json() == replica_name
+            assert (await client.post("/database")).json() == primary
+            assert (await client.get("/database")).json() == primary
+            assert (await other.get("/database")).json() == replica_name
+    finally:
+        await router.stop()
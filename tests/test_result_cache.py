@@ -0,0 +1,192 @@
+"""Tests for the shared result cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from org_catalog.db.changes import ChangeTracker
+from org_catalog.db.session import read_only_sessionmaker
+from org_catalog.services.result_cache import MemoryCacheBackend, RedisCacheBackend, ResultCache
+
+TABLES = ("organizations",)
+INTS = TypeAdapter(list[int])
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the Redis client the backend uses."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self.values.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, px: int) -> None:
+        self.values[key] = (time.monotonic() + px / 1000, value)
+
+    async def aclose(self) -> None:
+        self.values.clear()
+
+
+@pytest.fixture
+def tracker() -> ChangeTracker:
+    """Return a tracker answering from memory, as with an attached listener."""
+
+    tracker = ChangeTracker()
+    tracker.listening = True
+    tracker.apply("organizations", 1)
+    return tracker
+
+
+class Counter:
+    """Computation recording how often it ran."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> list[int]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [self.calls]
+
+
+async def test_memory_backend_evicts_least_recently_used_and_expired() -> None:
+    """Entries beyond capacity and past their TTL are dropped."""
+
+    backend = MemoryCacheBackend(max_entries=2)
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3", ttl=60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+    await backend.set("d", b"4", ttl=0)
+    assert await backend.get("d") is None
+    assert len(backend) == 1
+
+
+async def test_concurrent_misses_compute_once(tracker: ChangeTracker) -> None:
+    """Concurrent misses for one key share a single computation."""
+
+    cache = ResultCache(MemoryCacheBackend(), tracker=tracker)
+    compute = Counter(delay=0.05)
+
+    results = await asyncio.gather(
+        *(cache.fetch(None, "ns", TABLES, [1], INTS, compute) for _ in range(20))
+    )
+
+    assert compute.calls == 1
+    assert results == [b"[1]"] * 20
+
+
+async def test_failed_computation_is_retried_by_waiters(tracker: ChangeTracker) -> None:
+    """A failing leader does not propagate its error to waiting callers."""
+
+    cache = ResultCache(MemoryCacheBackend(), tracker=tracker)
+    attempts = 0
+
+    async def flaky() -> list[int]:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise RuntimeError("database went away")
+        return [attempts]
+
+    first, second = await asyncio.gather(
+        cache.fetch(None, "ns", TABLES, [1], INTS, flaky),
+        cache.fetch(None, "ns", TABLES, [1], INTS, flaky),
+        return_exceptions=True,
+    )
+
+    assert isinstance(first, RuntimeError)
+    assert second == b"[2]"
+
+
+async def test_writes_move_namespace_to_new_version(tracker: ChangeTracker) -> None:
+    """A new catalog version invalidates every key of the namespace."""
+
+    cache = ResultCache(MemoryCacheBackend(), tracker=tracker)
+    compute = Counter()
+
+    assert await cache.fetch(None, "ns", TABLES, [1], INTS, compute) == b"[1]"
+    assert await cache.fetch(None, "ns", TABLES, [1], INTS, compute) == b"[1]"
+    tracker.apply("organizations", 2)
+    assert await cache.fetch(None, "ns", TABLES, [1], INTS, compute) == b"[2]"
+    assert await cache.fetch(None, "ns", TABLES, [2], INTS, compute) == b"[3]"
+
+
+async def test_results_of_lagging_replica_are_not_stored(async_engine: AsyncEngine) -> None:
+    """A replica that has not replayed the known version serves reads that are not cached."""
+
+    tracker = ChangeTracker()
+    tracker.listening = True
+    cache = ResultCache(MemoryCacheBackend(), tracker=tracker)
+    compute = Counter()
+
+    async with read_only_sessionmaker(async_engine, replica=True)() as replica:
+        current = await tracker.version(replica, "organizations")
+        assert await cache.fetch(replica, "ns", TABLES, [1], INTS, compute) == b"[1]"
+        assert await cache.fetch(replica, "ns", TABLES, [1], INTS, compute) == b"[1]"
+
+        # The primary announced a change this replica has not replayed yet.
+        tracker.apply("organizations", current + 1)
+        assert await cache.fetch(replica, "ns", TABLES, [1], INTS, compute) == b"[2]"
+        assert await cache.fetch(replica, "ns", TABLES, [1], INTS, compute) == b"[3]"
+
+    async with read_only_sessionmaker(async_engine)() as primary:
+        assert await cache.fetch(primary, "ns", TABLES, [1], INTS, compute) == b"[4]"
+        assert await cache.fetch(primary, "ns", TABLES, [1], INTS, compute) == b"[4]"
+
+
+async def test_redis_backend_is_shared_between_workers(tracker: ChangeTracker) -> None:
+    """Entries stored by one worker are served to another."""
+
+    server = FakeRedis()
+    workers = [
+        ResultCache(RedisCacheBackend(server), tracker=tracker),
+        ResultCache(RedisCacheBackend(server), tracker=tracker),
+    ]
+    compute = Counter()
+
+    assert await workers[0].fetch(None, "ns", TABLES, [1], INTS, compute) == b"[1]"
+    assert await workers[1].fetch(None, "ns", TABLES, [1], INTS, compute) == b"[1]"
+    assert compute.calls == 1
+
+
+async def test_repeated_request_is_served_from_cache(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+    async_engine: AsyncEngine,
+) -> None:
+    """A repeated request only looks up change counters."""
+
+    url = "/api/v1/organizations/by-building/1"
+    first = await api_client.get(url, headers=api_key_header)
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        second = await api_client.get(url, headers=api_key_header)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert second.json() == first.json()
+    assert statements
+    assert all("catalog_versions" in statement for statement in statements)
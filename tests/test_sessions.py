@@ -0,0 +1,62 @@
+"""Tests for database session configuration."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from fastapi import Depends
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from org_catalog.api.deps import get_db_session
+from org_catalog.core.config import Settings
+from org_catalog.db.session import engine_options, read_only_sessionmaker
+from org_catalog.main import create_app
+
+
+async def test_read_only_sessions_reject_writes(async_engine: AsyncEngine) -> None:
+    """Read sessions run READ ONLY transactions without autoflush."""
+
+    async with read_only_sessionmaker(async_engine)() as session:
+        assert session.autoflush is False
+        assert await session.scalar(text("SHOW transaction_read_only")) == "on"
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await session.execute(text("UPDATE buildings SET name = name"))
+
+    async with async_sessionmaker(async_engine)() as session:
+        assert await session.scalar(text("SHOW transaction_read_only")) == "off"
+
+
+async def test_statement_timeout_returns_service_unavailable(test_database_url: str) -> None:
+    """Statements exceeding the configured timeout are cancelled and reported as 503."""
+
+    settings = Settings(db_statement_timeout_ms=50, db_pool_size=1, db_max_overflow=0)
+    engine = create_async_engine(test_database_url, **engine_options(settings))
+    app = create_app()
+
+    async def _get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with async_sessionmaker(engine)() as session:
+            yield session
+
+    @app.get("/slow")
+    async def slow(db: AsyncSession = Depends(get_db_session)) -> None:
+        await db.execute(text("SELECT pg_sleep(1)"))
+
+    app.dependency_overrides[get_db_session] = _get_session
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/slow")
+    finally:
+        await engine.dispose()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,82 @@
+"""Tests for streamed organization listings."""
+
+from __future__ import annotations
+
+import json
+
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from org_catalog.services.organization import OrganizationService
+
+WORLD = {
+    "latitude": 0,
+    "longitude": 0,
+    "min_latitude": -90,
+    "max_latitude": 90,
+    "min_longitude": -180,
+    "max_longitude": 180,
+}
+
+
+async def test_rectangle_streams_ndjson(
+    api_client: AsyncClient,
+    api_key_header: dict[str, str],
+) -> None:
+    """NDJSON clients receive every organization, one per line, in id order."""
+
+    paged = await api_client.get(
+        "/api/v1/organizations/geo",
+        params={**WORLD, "limit": 500},
+        headers=api_key_header,
+    )
+    streamed = await api_client.get(
+        "/api/v1/organizations/geo",
+        params={**WORLD, "limit": 1},
+        headers={**api_key_header, "Accept": "application/x-ndjson"},
+    )
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert "etag" in streamed.headers
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert lines == paged.json()["items"]
+
+
+async def test_stream_loads_relations_per_batch_and_releases_them(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Each batch is complete, and earlier batches are dropped from the session."""
+
+    async with session_factory() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO organizations (id, name, building_id)
+                SELECT 1000 + i, 'Поток ' || i, 1 FROM generate_series(1, 40) AS i
+                """
+            )
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO organization_phones (organization_id, number)
+                SELECT 1000 + i, '+7-000-' || i FROM generate_series(1, 40) AS i
+                """
+            )
+        )
+        service = OrganizationService(session)
+        sizes, seen, held = [], [], []
+        async for batch in service.stream_in_rectangle(
+            -90.0, 90.0, -180.0, 180.0, after=(1000,), batch_size=15
+        ):
+            sizes.append(len(batch))
+            seen.extend(org.id for org in batch)
+            assert all(len(org.phones) == 1 for org in batch)
+            held.append(len(session.identity_map))
+        await session.rollback()
+
+    assert sizes == [15, 15, 10]
+    assert seen == list(range(1001, 1041))
+    assert max(held) < 15 * 3